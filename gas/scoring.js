@@ -556,15 +556,42 @@ function debugScoring(propertyNo = 1) {
   }
 }
 
+// Cloud Runの採点処理を呼び出す（物件数が多くてもGASの実行時間制限にかからない）
+function callScoringApi(mode, targetNos = "") {
+  const options = {
+    method: "post",
+    contentType: "application/json",
+    payload: JSON.stringify({
+      action: "score",
+      mode: mode,
+      target_nos: targetNos,
+    }),
+    muteHttpExceptions: true,
+  };
+
+  const response = UrlFetchApp.fetch(CLOUD_RUN_URL, options);
+  const statusCode = response.getResponseCode();
+  if (statusCode !== 200) {
+    console.error(`採点APIのエラーレスポンス: ${response.getContentText()}`);
+    throw new Error(`採点APIエラー（ステータスコード: ${statusCode}）`);
+  }
+
+  const result = JSON.parse(response.getContentText());
+  if (result.status === "error") {
+    throw new Error(result.error_message || "採点処理中にエラーが発生しました");
+  }
+  return result;
+}
+
 // HTML UIから呼び出すためのラッパー関数
 function runScoringAll() {
   try {
-    const result = main("all");
+    const result = callScoringApi("all");
     return {
       status: "success",
       message: "全物件の採点が完了しました",
-      scored_properties: result.processedCount,
-      target_properties: result.targetProperties,
+      scored_properties: result.scored_properties,
+      target_properties: result.target_properties,
       timestamp: new Date().toLocaleString("ja-JP"),
     };
   } catch (error) {
@@ -579,12 +606,12 @@ function runScoringAll() {
 // HTML UIから呼び出すためのラッパー関数（指定物件）
 function runScoringSelected(propertyNumbers) {
   try {
-    const result = main("selected", propertyNumbers);
+    const result = callScoringApi("selected", propertyNumbers);
     return {
       status: "success",
       message: `物件番号 ${propertyNumbers} の採点が完了しました`,
-      scored_properties: result.processedCount,
-      target_properties: result.targetProperties,
+      scored_properties: result.scored_properties,
+      target_properties: result.target_properties,
       timestamp: new Date().toLocaleString("ja-JP"),
     };
   } catch (error) {
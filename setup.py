@@ -12,6 +12,7 @@ setup(
     install_requires=[
         "requests==2.32.3",
         "beautifulsoup4==4.13.4",
+        "lxml==5.4.0",
         "gspread==6.2.1",
         "google-auth==2.40.1",
         "functions-framework==3.8.3",
@@ -3,6 +3,17 @@ import functions_framework
 from flask import jsonify
 from src.suumo_scraper.main import update_suumo_sheet
 from src.suumo_scraper import config
+from src.suumo_scraper.coordinator import resolve_shard_count, run_sharded_update
+from src.suumo_scraper.jobs import get_job_manager
+from src.suumo_scraper.scoring.engine import (
+    SCORING_MODE_ALL,
+    SCORING_MODE_SELECTED,
+    run_scoring,
+)
+from src.suumo_scraper.scraper.session import get_session_manager
+
+# 全体更新の処理範囲を指定するパラメータ
+RANGE_KEYS = ["shard_index", "shard_count", "start_row", "end_row"]
 
 
 @functions_framework.http
@@ -28,6 +39,10 @@ def suumo_scraper(request):
     if request.method != "POST":
         return (jsonify({"error": "Method not allowed"}), 405, headers)
 
+    # ウォームインスタンスでは前回のリクエストのHTTPセッションを引き継ぐ
+    # 長時間アイドルだった場合は切断済みの接続を持ち越さないよう破棄しておく
+    get_session_manager().evict_if_idle()
+
     try:
         # リクエストのJSONデータを取得
         request_json = request.get_json(silent=True)
@@ -35,6 +50,30 @@ def suumo_scraper(request):
         if not request_json:
             return (jsonify({"error": "No JSON data provided"}), 400, headers)
 
+        # 非同期ジョブの状態確認
+        if request_json.get("action") == "status":
+            job = get_job_manager().get(request_json.get("job_id"))
+            if job is None:
+                return (jsonify({"error": "Job not found"}), 404, headers)
+            return (jsonify(job), 200, headers)
+
+        # 採点: 評価基準マスタで物件を採点し、採点シートに書き込む
+        if request_json.get("action") == "score":
+            scoring_mode = request_json.get("mode", SCORING_MODE_ALL)
+            if scoring_mode not in [SCORING_MODE_ALL, SCORING_MODE_SELECTED]:
+                return (
+                    jsonify({"error": f"Invalid scoring mode: {scoring_mode}"}),
+                    400,
+                    headers,
+                )
+            # changed_cellsを指定した場合は、変更されたセルを使う評価項目だけを採点し直す
+            result = run_scoring(
+                scoring_mode,
+                request_json.get("target_nos", ""),
+                request_json.get("changed_cells"),
+            )
+            return (jsonify(result), 200, headers)
+
         # パラメータの取得
         mode = request_json.get("mode", config.MODE_NEW_ONLY)
         url = request_json.get("url", None)
@@ -48,50 +87,77 @@ def suumo_scraper(request):
         if mode not in [config.MODE_NEW_ONLY, config.MODE_FULL_UPDATE]:
             return (jsonify({"error": f"Invalid mode: {mode}"}), 400, headers)
 
-        # 結果を格納するための辞書
-        result = {
-            "status": "success",
-            "processed_urls": 0,
-            "success_count": 0,
-            "error_count": 0,
-            "errors": [],
-            "duplicate_urls": [],
-            "invalid_urls": [],
-        }
-
-        # 複数URLモードと単一URLモードの処理分岐
-        if urls and mode == config.MODE_NEW_ONLY:
-            # URLごとに処理して結果をマージ
-            for input_url in urls:
-                if not input_url:
-                    continue
-
-                # URLの形式チェック
-                if not is_valid_suumo_url(input_url):
-                    result["invalid_urls"].append(input_url)
-                    continue
-
-                # 個別のURLを処理
-                url_result = update_suumo_sheet(update_mode=mode, new_url=input_url)
-
-                # 結果をマージ
-                result["processed_urls"] += url_result.get("processed_urls", 0)
-                result["success_count"] += url_result.get("success_count", 0)
-                result["error_count"] += url_result.get("error_count", 0)
-
-                if url_result.get("status") == "error":
-                    result["status"] = "partial_error"
-                    result["errors"].append(
-                        {
-                            "url": input_url,
-                            "error_message": url_result.get(
-                                "error_message", "不明なエラー"
-                            ),
-                        }
-                    )
+        if request_json.get("action") == "coordinate":
+            # コーディネーター: 全体更新をシャードに分けて各ワーカーに依頼し、結果をまとめる
+            if mode != config.MODE_FULL_UPDATE:
+                return (
+                    jsonify({"error": "coordinate is only available for full_update"}),
+                    400,
+                    headers,
+                )
+            # 任意のホストにリクエストを送らせないよう、ワーカーのURLは設定値だけを使う
+            if not config.SHARD_WORKER_URL:
+                return (
+                    jsonify({"error": "SHARD_WORKER_URL is not configured"}),
+                    500,
+                    headers,
+                )
+            try:
+                shard_count = resolve_shard_count(request_json.get("shard_count"))
+            except ValueError as e:
+                return (jsonify({"error": str(e)}), 400, headers)
+            # 認証付きで呼び出された場合は、同じ認証情報でワーカーを呼び出す
+            forward_headers = {}
+            if request.headers.get("Authorization"):
+                forward_headers["Authorization"] = request.headers["Authorization"]
+            kind = "coordinate"
+            target = run_sharded_update
+            params = {
+                "worker_url": config.SHARD_WORKER_URL,
+                "shard_count": shard_count,
+                "headers": forward_headers,
+            }
+            dedupe_key = (kind,)
         else:
-            # 従来通りの処理（単一URLまたは全件更新）
-            result = update_suumo_sheet(update_mode=mode, new_url=url)
+            kind = mode
+            target = process_request
+            params = {
+                "mode": mode,
+                "url": url,
+                "urls": urls,
+                "request_json": request_json,
+            }
+            # 同じ範囲の全体更新が実行中であれば、二重に登録せずそのジョブを返す
+            dedupe_key = None
+            if mode == config.MODE_FULL_UPDATE:
+                dedupe_key = (mode,) + tuple(
+                    request_json.get(key) for key in RANGE_KEYS
+                )
+
+        # 非同期実行: ジョブとして登録してすぐに返し、呼び出し側はstatusで進捗を確認する
+        # ジョブはこのインスタンスのメモリ上で実行・管理されるため、レスポンス後も
+        # CPUが割り当てられ、状態確認も同じインスタンスに届く設定の場合だけ使用する
+        if request_json.get("async") and config.ASYNC_JOBS_ENABLED:
+            job = get_job_manager().submit(kind, target, params, dedupe_key)
+            if job is None:
+                return (
+                    jsonify({"error": "Job queue is full, please retry later"}),
+                    503,
+                    headers,
+                )
+            return (
+                jsonify(
+                    {
+                        "status": "accepted",
+                        "job_id": job["job_id"],
+                        "job_status": job["status"],
+                    }
+                ),
+                202,
+                headers,
+            )
+
+        result = target(**params)
 
         # 結果を返す
         return (jsonify(result), 200, headers)
@@ -102,6 +168,84 @@ def suumo_scraper(request):
         return (jsonify(error_response), 500, headers)
 
 
+def process_request(mode, url, urls, request_json, progress_callback=None):
+    """
+    リクエストの内容に従って物件情報を更新する
+
+    Args:
+        mode: 更新モード
+        url: 単一URL
+        urls: 複数URLのリスト（単一URLを含む）
+        request_json: リクエストのJSON（シャード・行範囲の指定を参照する）
+        progress_callback: 進捗の辞書を受け取るコールバック
+
+    Returns:
+        処理結果の辞書
+    """
+    # 結果を格納するための辞書
+    result = {
+        "status": "success",
+        "processed_urls": 0,
+        "success_count": 0,
+        "error_count": 0,
+        "errors": [],
+        "duplicate_urls": [],
+        "invalid_urls": [],
+    }
+
+    # 複数URLモードと単一URLモードの処理分岐
+    if urls and mode == config.MODE_NEW_ONLY:
+        # URLの形式チェック
+        valid_urls = []
+        for input_url in urls:
+            if not input_url:
+                continue
+            if not is_valid_suumo_url(input_url):
+                result["invalid_urls"].append(input_url)
+                continue
+            valid_urls.append(input_url)
+
+        if valid_urls:
+            # 接続・既存URLの読み込み・書き込みを1回にまとめて処理する
+            url_result = update_suumo_sheet(
+                update_mode=mode,
+                new_urls=valid_urls,
+                progress_callback=progress_callback,
+            )
+
+            # 結果をマージ
+            result["processed_urls"] = url_result.get("processed_urls", 0)
+            result["success_count"] = url_result.get("success_count", 0)
+            result["error_count"] = url_result.get("error_count", 0)
+            result["errors"] = url_result.get("errors", [])
+            result["duplicate_urls"] = url_result.get("duplicate_urls", [])
+            if "changed_cells" in url_result:
+                result["changed_cells"] = url_result["changed_cells"]
+            if "scoring" in url_result:
+                result["scoring"] = url_result["scoring"]
+
+            if url_result.get("status") == "error":
+                result["status"] = "error"
+                result["error_message"] = url_result.get(
+                    "error_message", "不明なエラー"
+                )
+            elif url_result.get("status") != "success":
+                result["status"] = url_result.get("status")
+    else:
+        # 従来通りの処理（単一URLまたは全件更新）
+        # 全体更新ではシャードまたは行範囲を指定して一部の行だけを処理できる
+        result = update_suumo_sheet(
+            update_mode=mode,
+            new_url=url,
+            **{key: request_json.get(key) for key in RANGE_KEYS},
+            progress_callback=progress_callback,
+            # シャードの採点はコーディネーターが全シャードの変更をまとめて行う
+            rescore=not request_json.get("skip_scoring"),
+        )
+
+    return result
+
+
 def is_valid_suumo_url(url):
     """
     SUUMOのURLが有効かどうかを検証する関数
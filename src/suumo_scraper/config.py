@@ -2,9 +2,22 @@
 SUUMOスクレイピングの設定ファイル
 """
 
+import os
+
 # スプレッドシートの設定
 SPREADSHEET_ID = "1iAdgFDYd7Tl441za4Afm3ybSCZk0vsIiia59Z77SeOE"
 PROPERTY_SHEET_NAME = "物件情報"
+SCORING_MASTER_SHEET_NAME = "評価基準マスタ"  # 採点の評価基準
+SCORE_SHEET_NAMES = {
+    "husband": "物件採点_husband",
+    "wife": "物件採点_wife",
+}  # 人物ごとの採点結果シート
+SCORING_AFTER_UPDATE = True  # 全体更新の後、変更された物件・項目だけを採点し直す
+SCORING_AFTER_NEW_ONLY = False  # 新規物件の追加後も採点する（登録のたびに採点シートを読み込むため既定では無効）
+SCORING_RULE_CACHE_SIZE = 4  # 索引を保持する評価基準マスタの版の数
+SCORING_STATE_FILE = (
+    "cache/scoring_state.json"  # 前回全物件を採点した評価基準マスタ・重みの版の保存先
+)
 
 # 認証関連の設定
 CREDS_FILE_PATH = "suumo-scraper-460206-6734b711c3fa.json"
@@ -15,10 +28,14 @@ SCOPES = [
 ]
 
 # スクレイピング設定
-SCRAPING_WAIT_MIN = 3  # 最小待機時間（秒）
-SCRAPING_WAIT_MAX = 5  # 最大待機時間（秒）
+SCRAPING_MAX_WORKERS = 4  # 並行スクレイピングのワーカー数
+SCRAPING_RATE_PER_HOST = 0.5  # ホストごとの最大リクエスト数（件/秒）
+SCRAPING_BURST_PER_HOST = 1  # ホストごとに連続で許容するリクエスト数
 REQUEST_TIMEOUT = 60  # リクエストタイムアウト（秒）- タイムアウトを60秒に延長
 MAX_RETRIES = 3  # 最大リトライ回数
+HTTP_POOL_SIZE = 10  # ホストごとに保持するHTTP接続数（並行ワーカー数以上にする）
+HTTP_SESSION_IDLE_TIMEOUT = 300  # この秒数以上使われなかったHTTPセッションは作り直す
+HTTP_SESSION_MAX_FAILURES = 3  # 接続エラーがこの回数続いたらHTTPセッションを作り直す
 REQUEST_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -29,11 +46,62 @@ REQUEST_HEADERS = {
     "Referer": "https://suumo.jp/",  # リファラーを追加
 }
 
+# HTML解析設定
+HTML_PARSER = "lxml"  # パーサーバックエンド（lxml, html5lib, html.parser）、未インストール時はhtml.parser
+PARTIAL_PARSE_ENABLED = True  # 受信しながら物件情報の領域だけを解析する（lxmlが必要）
+PARTIAL_PARSE_CHUNK_SIZE = 16384  # 部分解析で一度に読み込むサイズ（バイト）
+
+PATTERNS_RELOAD_INTERVAL = 60  # patterns.jsonの変更を確認する間隔（秒）
+
+# HTTPキャッシュ設定（全体更新時の条件付きGET）
+HTTP_CACHE_ENABLED = True  # ETag/Last-Modifiedによる再検証を行う
+HTTP_CACHE_DIR = "cache/http"  # 検証子の保存先ディレクトリ
+CHANGE_DETECTION_ENABLED = True  # 内容ハッシュが前回と同じ物件は書き込みを省略する
+FINGERPRINT_FILE = "cache/fingerprints.json"  # 物件IDごとの内容ハッシュの保存先
+
+# チェックポイント設定（中断された全体更新の再開）
+CHECKPOINT_ENABLED = (
+    True  # 全体更新の進捗を記録し、中断された場合は次回続きから再開する
+)
+# 進捗の保存先（Cloud Runのファイルシステムはメモリ上にあり、インスタンスごとに別で
+# 終了すると消えるため、インスタンスをまたいで再開するにはボリュームをマウントしたパスを指定）
+CHECKPOINT_DB_PATH = os.environ.get("CHECKPOINT_DB_PATH", "cache/checkpoint.sqlite3")
+CHECKPOINT_MAX_AGE_HOURS = 24  # これより古い未完了の実行は再開せずにやり直す
+
+# シャード実行設定（全体更新を複数のCloud Functionインスタンスで分担）
+SHARD_COUNT = 4  # coordinateでshard_countが指定されない場合のシャード数
+SHARD_MAX_COUNT = 16  # coordinateで指定できるシャード数の上限（同時に送るリクエスト数）
+# ワーカーのURL（coordinateに必須）。Cloud Runはhttpのリクエストをhttpsにリダイレクトし、
+# その際にPOSTがGETに変わってしまうため、httpsのURLを指定する
+SHARD_WORKER_URL = os.environ.get("SHARD_WORKER_URL", "")
+SHARD_REQUEST_TIMEOUT = 3600  # 1シャードの処理を待つ最大時間（秒）
+
+# 非同期ジョブ設定（async指定のリクエストをバックグラウンドで実行）
+# ジョブの状態は1つのインスタンスのメモリ上にしかないため、Cloud Runを
+# --no-cpu-throttling・--max-instances=1でデプロイした場合だけ有効にする
+# （無効の場合、async指定のリクエストも同期的に処理して結果を返す）
+ASYNC_JOBS_ENABLED = os.environ.get("ASYNC_JOBS_ENABLED", "").lower() in ("1", "true")
+JOB_QUEUE_SIZE = 10  # 実行待ちとして受け付ける最大ジョブ数
+JOB_RETENTION_SECONDS = 24 * 3600  # 終了したジョブの状態を保持する秒数
+
 # Google Sheets API制限対策
-API_WRITE_INTERVAL = (
-    5  # APIリクエスト間の通常待機時間（秒）- 連続リクエストを避けるために長めに設定
+SHEETS_WRITE_QUOTA_PER_MINUTE = (
+    60  # 1分あたりの書き込みリクエスト数（ユーザーごとのクォータ）
+)
+SHEETS_READ_QUOTA_PER_MINUTE = (
+    60  # 1分あたりの読み込みリクエスト数（ユーザーごとのクォータ）
 )
-API_RATE_LIMIT_WAIT = 45  # レート制限エラー発生時の初期待機時間（秒）
+SHEETS_QUOTA_BURST = 5  # 連続で送信できるリクエスト数
+SHEETS_MAX_CELLS_PER_REQUEST = 10000  # 1回のbatch_updateで書き込む最大セル数
+SHEETS_MAX_PAYLOAD_BYTES = (
+    2000000  # 1回のbatch_updateの最大リクエストサイズ（推奨上限2MB）
+)
+SHEETS_WRITER_BATCH_SIZE = 50  # 全体更新時にまとめて書き込む件数
+SHEETS_WRITER_FLUSH_INTERVAL = 30  # 件数に達しなくても書き込むまでの秒数
+SHEETS_WRITER_QUEUE_SIZE = 200  # 書き込み待ちとして保持する最大件数
+SHEETS_BACKOFF_MAX = 64  # Retry-Afterがない場合の最大待機時間（秒）
+SHEETS_CONNECTION_TTL = 3600  # 接続（クライアント・ワークシート）を使い回す最大秒数
+SHEETS_TOKEN_REFRESH_MARGIN = 300  # アクセストークンの期限の何秒前に更新するか
 API_RETRY_COUNT = 5  # エラー発生時の最大再試行回数 - レート制限が厳しい場合のために増加
 ESSENTIAL_COLUMNS = [
     "property_id",
@@ -77,6 +145,31 @@ COLUMNS = {
     "surrounding": 21,  # 周辺情報
     "update_date": 22,  # 情報更新日
     "update_time": 23,  # update_time
+    # 取得時に表記から求めた数値の項目（絞り込み・採点用）
+    "rent_yen": 24,  # 家賃（円）
+    "management_fee_yen": 25,  # 管理費・共益費（円）
+    "deposit_yen": 26,  # 敷金（円）
+    "key_money_yen": 27,  # 礼金（円）
+    "area_m2": 28,  # 専有面積（m²）
+    "walk_minutes": 29,  # 最寄り駅までの徒歩分数
+    "floor_number": 30,  # 所在階（地下は負の数）
+    "total_floors": 31,  # 地上階数
+    "built_year": 32,  # 建築年
+    "walk_minutes_by_station": 33,  # 駅ごとの徒歩分数（アクセスの行と同じ順序）
+}
+
+# 数値の項目のヘッダー名（シートにない場合は書き込む。評価基準マスタの入力項目に指定する名前）
+TYPED_COLUMN_HEADERS = {
+    "rent_yen": "家賃（円）",
+    "management_fee_yen": "管理費・共益費（円）",
+    "deposit_yen": "敷金（円）",
+    "key_money_yen": "礼金（円）",
+    "area_m2": "専有面積（m²）",
+    "walk_minutes": "徒歩分数",
+    "floor_number": "所在階",
+    "total_floors": "地上階数",
+    "built_year": "建築年",
+    "walk_minutes_by_station": "駅ごとの徒歩分数",
 }
 
 # 各モードの設定
@@ -0,0 +1,183 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from src.suumo_scraper import config
+from src.suumo_scraper.scoring.engine import run_scoring
+
+# シャードの結果で合計する件数の項目
+COUNT_KEYS = ["processed_urls", "success_count", "error_count", "unchanged_count"]
+
+
+def request_shard(worker_url, payload, headers=None, timeout=None):
+    """
+    1つのシャードの全体更新をワーカーに依頼する
+
+    Args:
+        worker_url: ワーカー（Cloud Function）のURL
+        payload: リクエストのJSON
+        headers: 追加のリクエストヘッダー（認証情報など）
+        timeout: タイムアウト（秒、Noneの場合は設定値）
+
+    Returns:
+        ワーカーの処理結果の辞書
+    """
+    try:
+        response = requests.post(
+            worker_url,
+            json=payload,
+            headers=headers or {},
+            timeout=timeout or config.SHARD_REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logging.error(f"シャード{payload.get('shard_index')}の処理に失敗: {e}")
+        return {
+            "status": "error",
+            "error_message": str(e),
+            "error_count": 1,
+            "processed_urls": 0,
+        }
+
+
+def merge_shard_results(shard_results):
+    """
+    シャードごとの処理結果を1つにまとめる
+
+    Args:
+        shard_results: シャード番号順の処理結果のリスト
+
+    Returns:
+        まとめた処理結果の辞書（シャードごとの結果は"shards"に格納）
+    """
+    merged = {
+        "status": "success",
+        "update_mode": config.MODE_FULL_UPDATE,
+        "errors": [],
+        "shards": [],
+        "changed_cells": {},
+    }
+    for key in COUNT_KEYS:
+        merged[key] = 0
+
+    for shard_index, shard_result in enumerate(shard_results):
+        for key in COUNT_KEYS:
+            merged[key] += shard_result.get(key, 0) or 0
+        merged["errors"].extend(shard_result.get("errors", []))
+        # シートの行は重ならないため、シャードの変更セットはそのまま合わせられる
+        merged["changed_cells"].update(shard_result.get("changed_cells", {}))
+
+        status = shard_result.get("status", "error")
+        if status == "error":
+            merged["errors"].append(
+                {
+                    "url": f"shard_{shard_index}",
+                    "error_message": shard_result.get("error_message", "不明なエラー"),
+                }
+            )
+        if status != "success" and merged["status"] == "success":
+            merged["status"] = "partial_error"
+
+        merged["shards"].append(
+            {
+                "shard_index": shard_index,
+                "status": status,
+                "row_range": shard_result.get("row_range"),
+                "processed_urls": shard_result.get("processed_urls", 0),
+            }
+        )
+
+    # すべてのシャードが失敗した場合は全体をエラーとする
+    if shard_results and all(r.get("status") == "error" for r in shard_results):
+        merged["status"] = "error"
+        merged["error_message"] = "すべてのシャードの処理に失敗しました"
+    return merged
+
+
+def resolve_shard_count(shard_count=None):
+    """
+    シャード数を検証する
+
+    Args:
+        shard_count: 指定されたシャード数（Noneの場合は設定値）
+
+    Returns:
+        シャード数
+
+    Raises:
+        ValueError: 整数でない、または1～SHARD_MAX_COUNTの範囲外の場合
+    """
+    if shard_count is None:
+        return config.SHARD_COUNT
+    try:
+        shard_count = int(shard_count)
+    except (TypeError, ValueError):
+        raise ValueError(f"シャード数は整数である必要があります: {shard_count}")
+    if not 1 <= shard_count <= config.SHARD_MAX_COUNT:
+        raise ValueError(
+            f"シャード数は1～{config.SHARD_MAX_COUNT}である必要があります: {shard_count}"
+        )
+    return shard_count
+
+
+def run_sharded_update(
+    worker_url, shard_count=None, headers=None, timeout=None, progress_callback=None
+):
+    """
+    全体更新をシャードに分けて複数のワーカーで並行実行し、結果をまとめる
+
+    Args:
+        worker_url: ワーカー（Cloud Function）のURL
+        shard_count: シャード数（Noneの場合は設定値）
+        headers: ワーカーへのリクエストに付けるヘッダー（認証情報など）
+        timeout: 1シャードあたりのタイムアウト（秒、Noneの場合は設定値）
+        progress_callback: シャードが終わるたびに、終わったシャードの件数の合計を
+            受け取るコールバック
+
+    Returns:
+        まとめた処理結果の辞書
+    """
+    shard_count = resolve_shard_count(shard_count)
+    logging.info(f"シャード実行開始: {shard_count}シャード, ワーカー={worker_url}")
+
+    payloads = [
+        {
+            "mode": config.MODE_FULL_UPDATE,
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+            # 採点は全シャードの変更をまとめて1回だけ行う
+            "skip_scoring": True,
+        }
+        for shard_index in range(shard_count)
+    ]
+    shard_results = [None] * shard_count
+    with ThreadPoolExecutor(max_workers=shard_count) as executor:
+        futures = {
+            executor.submit(request_shard, worker_url, payload, headers, timeout): index
+            for index, payload in enumerate(payloads)
+        }
+        for future in as_completed(futures):
+            shard_results[futures[future]] = future.result()
+            if progress_callback:
+                finished = [r for r in shard_results if r is not None]
+                progress_callback(
+                    {
+                        key: sum(r.get(key, 0) or 0 for r in finished)
+                        for key in ("processed_urls", "success_count", "error_count")
+                    }
+                )
+
+    merged = merge_shard_results(shard_results)
+    logging.info(
+        f"シャード実行完了: 処理={merged['processed_urls']}件, "
+        f"成功={merged['success_count']}件, エラー={merged['error_count']}件"
+    )
+
+    # 変更されたセルを使う評価項目だけを、全シャード分まとめて採点し直す
+    if config.SCORING_AFTER_UPDATE and merged["changed_cells"]:
+        try:
+            merged["scoring"] = run_scoring(changed_cells=merged["changed_cells"])
+        except Exception as e:
+            logging.warning(f"変更された物件の採点に失敗しました: {e}")
+            merged["scoring"] = {"status": "error", "error_message": str(e)}
+    return merged
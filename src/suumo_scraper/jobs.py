@@ -0,0 +1,217 @@
+import logging
+import queue
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from src.suumo_scraper import config
+
+# ジョブの状態
+JOB_QUEUED = "queued"  # 実行待ち
+JOB_RUNNING = "running"  # 実行中
+JOB_COMPLETED = "completed"  # 終了（処理結果はresultに格納）
+JOB_FAILED = "failed"  # 予期しない例外で終了
+
+FINISHED_STATUSES = {JOB_COMPLETED, JOB_FAILED}
+
+
+def format_time(timestamp):
+    """
+    UNIX時刻をISO形式の文字列に変換する
+
+    Args:
+        timestamp: UNIX時刻（Noneの場合はNoneを返す）
+
+    Returns:
+        ISO形式の文字列
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+class JobManager:
+    """
+    時間のかかる処理をバックグラウンドで実行するジョブ管理
+    プロセス内のワーカースレッドがキューから順に1件ずつ実行し、
+    呼び出し側はジョブIDで状態と進捗を問い合わせる
+    """
+
+    def __init__(self, queue_size=None, retention=None):
+        """
+        Args:
+            queue_size: 実行待ちとして受け付ける最大ジョブ数（Noneの場合は設定値）
+            retention: 終了したジョブの状態を保持する秒数（Noneの場合は設定値）
+        """
+        self.queue = queue.Queue(maxsize=queue_size or config.JOB_QUEUE_SIZE)
+        self.retention = (
+            retention if retention is not None else config.JOB_RETENTION_SECONDS
+        )
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def _ensure_worker(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(
+                target=self._run, name="job-worker", daemon=True
+            )
+            self.thread.start()
+
+    def _prune(self):
+        # 保持期間を過ぎた終了済みのジョブを削除する
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job["status"] in FINISHED_STATUSES
+            and now - job["finished_at"] > self.retention
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def submit(self, kind, target, params=None, dedupe_key=None):
+        """
+        ジョブを登録する
+
+        Args:
+            kind: ジョブの種類（更新モードなど、状態の表示に使う）
+            target: 実行する関数（progress_callbackキーワード引数を受け取る）
+            params: 関数に渡すキーワード引数の辞書
+            dedupe_key: 同じキーの未終了ジョブがあれば、新しく登録せずにそれを返す
+
+        Returns:
+            ジョブの状態の辞書、キューが一杯で登録できない場合はNone
+        """
+        with self.lock:
+            self._prune()
+            if dedupe_key is not None:
+                for job in self.jobs.values():
+                    if (
+                        job["dedupe_key"] == dedupe_key
+                        and job["status"] not in FINISHED_STATUSES
+                    ):
+                        logging.info(f"実行中の同じジョブを返します: {job['job_id']}")
+                        return self._public(job)
+
+            job = {
+                "job_id": uuid.uuid4().hex,
+                "kind": kind,
+                "status": JOB_QUEUED,
+                "dedupe_key": dedupe_key,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "progress": {
+                    "total": None,
+                    "processed_urls": 0,
+                    "success_count": 0,
+                    "error_count": 0,
+                },
+                "result": None,
+                "error_message": None,
+            }
+            try:
+                self.queue.put_nowait((job["job_id"], target, params or {}))
+            except queue.Full:
+                logging.warning(f"ジョブのキューが一杯のため登録できません: {kind}")
+                return None
+            self.jobs[job["job_id"]] = job
+            self._ensure_worker()
+            logging.info(f"ジョブを登録しました: {job['job_id']} ({kind})")
+            return self._public(job)
+
+    def get(self, job_id):
+        """
+        ジョブの状態を取得する
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブの状態の辞書、存在しない場合はNone
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return self._public(job) if job else None
+
+    @staticmethod
+    def _public(job):
+        public = {
+            "job_id": job["job_id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "created_at": format_time(job["created_at"]),
+            "started_at": format_time(job["started_at"]),
+            "finished_at": format_time(job["finished_at"]),
+            "progress": dict(job["progress"]),
+        }
+        if job["result"] is not None:
+            public["result"] = job["result"]
+        if job["error_message"]:
+            public["error_message"] = job["error_message"]
+        return public
+
+    def _update_progress(self, job_id, progress):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job:
+                job["progress"].update(progress)
+
+    def _finish(self, job_id, status, result=None, error_message=None):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job["status"] = status
+            job["result"] = result
+            job["error_message"] = error_message
+            job["finished_at"] = time.time()
+            if result:
+                for key in ("processed_urls", "success_count", "error_count"):
+                    if key in result:
+                        job["progress"][key] = result[key]
+
+    def _run(self):
+        while True:
+            job_id, target, params = self.queue.get()
+            with self.lock:
+                job = self.jobs.get(job_id)
+                if job is None:
+                    continue
+                job["status"] = JOB_RUNNING
+                job["started_at"] = time.time()
+            logging.info(f"ジョブ開始: {job_id}")
+
+            try:
+                result = target(
+                    progress_callback=lambda progress: self._update_progress(
+                        job_id, progress
+                    ),
+                    **params,
+                )
+                self._finish(job_id, JOB_COMPLETED, result=result)
+                logging.info(f"ジョブ終了: {job_id}")
+            except Exception as e:
+                logging.error(f"ジョブでエラー発生: {job_id} - {e}")
+                logging.error(traceback.format_exc())
+                self._finish(job_id, JOB_FAILED, error_message=str(e))
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """
+    プロセス全体で共有するジョブ管理を取得する
+
+    Returns:
+        JobManagerオブジェクト
+    """
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
@@ -2,41 +2,121 @@ import json
 import argparse
 import sys
 import traceback
-import random
-import time
 import os
 from typing import Dict, List, Any
 from datetime import datetime
 
 # 内部モジュールのインポート
 from src.suumo_scraper import config
+from src.suumo_scraper.utils.checkpoint import get_checkpoint_journal, make_run_key
 from src.suumo_scraper.utils.logger import setup_logger
-from src.suumo_scraper.sheets.connection import (
-    setup_sheet_connection,
-)
+from src.suumo_scraper.sheets.connection import get_sheet_connection_cache
+from src.suumo_scraper.sheets.snapshot import SheetSnapshot
+from src.suumo_scraper.sheets.writer import BatchingSheetWriter
 from src.suumo_scraper.sheets.update import (
     process_url,
     update_property_data,
     batch_update_properties,
     batch_add_new_properties,
+    ensure_typed_headers,
 )
 from src.suumo_scraper.scraper.core import scrape_suumo_property_info
+from src.suumo_scraper.scraper.scheduler import scrape_many
 from src.suumo_scraper.scraper.debug import debug_scrape_url
+from src.suumo_scraper.scoring.engine import (
+    SCORING_MODE_ALL,
+    SCORING_MODE_SELECTED,
+    run_scoring,
+)
 
 # ロガーの設定
 logger = setup_logger()
 
 
-def update_suumo_sheet(update_mode="new_only", new_url=None):
+def resolve_shard_rows(
+    url_count, shard_index=None, shard_count=None, start_row=None, end_row=None
+):
+    """
+    全体更新で処理する行範囲を決定する
+
+    シャード指定の場合は、データ行を連続したブロックにほぼ均等に分割する
+    （例: 10件を3分割 → 2～5行目、6～8行目、9～11行目）
+
+    Args:
+        url_count: 既存のURL数（データ行数）
+        shard_index: シャード番号（0始まり）
+        shard_count: シャード数
+        start_row: 開始行（2行目以降、行範囲で指定する場合）
+        end_row: 終了行（この行を含む、省略時は最終行）
+
+    Returns:
+        (開始行, 終了行)、範囲の指定がない場合はNone
+
+    Raises:
+        ValueError: 指定が不正な場合
+    """
+    if shard_count is not None or shard_index is not None:
+        if shard_count is None or shard_index is None:
+            raise ValueError("shard_indexとshard_countは両方指定してください")
+        shard_index = int(shard_index)
+        shard_count = int(shard_count)
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(
+                f"シャードの指定が不正です: shard_index={shard_index}, shard_count={shard_count}"
+            )
+        base, remainder = divmod(url_count, shard_count)
+        start = shard_index * base + min(shard_index, remainder)
+        size = base + (1 if shard_index < remainder else 0)
+        return start + 2, start + size + 1
+
+    if start_row is not None or end_row is not None:
+        start_row = int(start_row) if start_row is not None else 2
+        end_row = int(end_row) if end_row is not None else url_count + 1
+        if start_row < 2 or end_row < start_row:
+            raise ValueError(
+                f"行範囲の指定が不正です: start_row={start_row}, end_row={end_row}"
+            )
+        return start_row, end_row
+
+    return None
+
+
+def update_suumo_sheet(
+    update_mode="new_only",
+    new_url=None,
+    new_urls=None,
+    shard_index=None,
+    shard_count=None,
+    start_row=None,
+    end_row=None,
+    progress_callback=None,
+    rescore=True,
+):
     """
     物件情報更新処理のメイン関数
+
+    Args:
+        update_mode: 更新モード（new_only, full_update）
+        new_url: 新規追加するURL（new_onlyモード）
+        new_urls: 新規追加するURLのリスト（new_onlyモード、まとめて取得・追加する）
+        shard_index: 全体更新で担当するシャード番号（0始まり）
+        shard_count: 全体更新のシャード数
+        start_row: 全体更新で処理する開始行（シャードの代わりに行範囲で指定する場合）
+        end_row: 全体更新で処理する終了行（この行を含む）
+        progress_callback: 進捗の辞書（total, processed_urls, success_count, error_count）を受け取るコールバック
+        rescore: 更新後に変更された物件を採点し直すか（シャードとして実行する場合は、
+            コーディネーターがまとめて採点するためFalseを指定する）
+
+    Returns:
+        処理結果の辞書
     """
     try:
         logger.debug(f"更新処理開始: モード={update_mode}, URL={new_url}")
 
-        # Google Sheetsへの接続
+        # Google Sheetsへの接続（ウォームな実行では前回の接続を使い回す）
+        connection = get_sheet_connection_cache()
         try:
-            client = setup_sheet_connection()
+            connection.get_client()
         except RuntimeError as e:
             logger.error(f"Google Sheets接続に失敗しました: {e}")
             return {
@@ -48,7 +128,7 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
 
         # スプレッドシートを開く
         try:
-            spreadsheet = client.open_by_key(config.SPREADSHEET_ID)
+            spreadsheet = connection.get_spreadsheet(config.SPREADSHEET_ID)
             logger.debug(f"スプレッドシート接続成功: {spreadsheet.title}")
         except Exception as e:
             logger.error(f"スプレッドシートのオープンに失敗しました: {e}")
@@ -61,7 +141,9 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
 
         # 物件情報シートを取得
         try:
-            property_sheet = spreadsheet.worksheet(config.PROPERTY_SHEET_NAME)
+            property_sheet = connection.get_worksheet(
+                config.PROPERTY_SHEET_NAME, config.SPREADSHEET_ID
+            )
             logger.debug(f"物件情報シート取得成功")
         except Exception as e:
             logger.error(f"物件情報シートの取得に失敗しました: {e}")
@@ -72,14 +154,15 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
                 "processed_urls": 0,
             }
 
-        # 既存のURLを取得 (B列2行目から)
+        # シート全体を一括で読み込み、以降の処理はスナップショットを参照する
         try:
-            existing_urls = property_sheet.col_values(config.COLUMNS["url"])[
-                1:
-            ]  # ヘッダー行を除く
+            snapshot = SheetSnapshot.load(property_sheet)
+            existing_urls = snapshot.urls  # B列2行目から
             logger.debug(f"既存URL数: {len(existing_urls)}")
         except Exception as e:
             logger.error(f"既存URLの取得に失敗しました: {e}")
+            # キャッシュした接続が使えなくなっている可能性があるため、次回は接続し直す
+            connection.invalidate()
             return {
                 "status": "error",
                 "error_message": f"スプレッドシートからURLを取得できません: {str(e)}",
@@ -87,6 +170,9 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
                 "processed_urls": 0,
             }
 
+        # 数値の項目のヘッダーがなければ書き込む（採点はヘッダー名で列を探す）
+        ensure_typed_headers(property_sheet, snapshot)
+
         # 結果を格納する辞書
         result = {
             "status": "success",
@@ -97,59 +183,68 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
             "errors": [],
         }
 
+        def report_progress(total, processed_count):
+            if progress_callback:
+                progress_callback(
+                    {
+                        "total": total,
+                        "processed_urls": processed_count,
+                        "success_count": result["success_count"],
+                        "error_count": result["error_count"],
+                    }
+                )
+
         # 新規URL追加モード
         if update_mode == config.MODE_NEW_ONLY:
             urls_to_process = []
-
-            if new_url:  # コマンドラインまたはHTMLフォームから指定されたURL
-                urls_to_process.append(new_url)
-                logger.debug(f"指定されたURL: {new_url}")
-
-            # 重複するURLをフィルタリング
-            urls_to_process = [
-                url for url in urls_to_process if url and url not in existing_urls
-            ]
+            duplicate_urls = []
+
+            # コマンドラインまたはHTMLフォームから指定されたURL
+            candidates = ([new_url] if new_url else []) + list(new_urls or [])
+            logger.debug(f"指定されたURL: {candidates}")
+
+            # 登録済みのURLと、同じリクエスト内で重複するURLを除外する
+            seen_urls = set()
+            for url in candidates:
+                if not url:
+                    continue
+                if snapshot.row_for_url(url) is not None or url in seen_urls:
+                    duplicate_urls.append(url)
+                    continue
+                seen_urls.add(url)
+                urls_to_process.append(url)
+            result["duplicate_urls"] = duplicate_urls
 
             if not urls_to_process:
                 logger.info("処理対象のURLがありません")
                 return result
 
-            # 一括処理: すべてのURLからデータを取得
-            new_properties = []
-
-            for i, url in enumerate(urls_to_process):
-                try:
-                    logger.debug(
-                        f"URL({i+1}/{len(urls_to_process)})スクレイピング開始: {url}"
+            # 一括処理: すべてのURLから並行してデータを取得
+            new_properties = [None] * len(urls_to_process)
+            report_progress(len(urls_to_process), 0)
+
+            for scraped_count, (i, url, property_info) in enumerate(
+                scrape_many(urls_to_process), 1
+            ):
+                property_info["url"] = url  # URLも含めておく
+                if "error" in property_info:
+                    logger.error(
+                        f"スクレイピングエラー: {url} - {property_info['error']}"
                     )
-
-                    # ランダムな待機時間を設定（サーバー負荷軽減のため）
-                    if i > 0:  # 最初のURLは待機なし
-                        time.sleep(
-                            random.uniform(
-                                config.SCRAPING_WAIT_MIN, config.SCRAPING_WAIT_MAX
-                            )
-                        )
-
-                    # 物件情報を取得
-                    property_info = scrape_suumo_property_info(url)
-                    property_info["url"] = url  # URLも含めておく
-
-                    # 成功したらリストに追加
-                    new_properties.append(property_info)
+                else:
                     logger.debug(f"スクレイピング成功: {url}")
 
-                except Exception as e:
-                    # エラーがあった場合でもリストに追加（エラー情報付き）
-                    new_properties.append({"url": url, "error": str(e)})
-                    logger.error(f"スクレイピングエラー: {url} - {e}")
+                # 入力順を保って追加（エラー時もエラー情報付きで追加）
+                new_properties[i] = property_info
+                report_progress(len(urls_to_process), scraped_count)
 
             # 取得したデータを一括でスプレッドシートに追加
             if new_properties:
                 result, url_to_row = batch_add_new_properties(
-                    property_sheet, new_properties, existing_urls, result
+                    property_sheet, new_properties, existing_urls, result, snapshot
                 )
                 logger.info(f"一括追加完了: {len(new_properties)}件")
+                report_progress(len(urls_to_process), len(urls_to_process))
             else:
                 logger.info("追加する物件情報がありません")
 
@@ -157,62 +252,154 @@ def update_suumo_sheet(update_mode="new_only", new_url=None):
         elif update_mode == config.MODE_FULL_UPDATE:
             logger.debug(f"全体更新モード開始: 対象URL数={len(existing_urls)}")
 
-            if not existing_urls:
+            # シャードまたは行範囲が指定された場合は、その範囲の行だけを処理する
+            try:
+                row_range = resolve_shard_rows(
+                    len(existing_urls), shard_index, shard_count, start_row, end_row
+                )
+            except ValueError as e:
+                logger.error(f"処理範囲の指定エラー: {e}")
+                return {
+                    "status": "error",
+                    "error_message": str(e),
+                    "error_count": 1,
+                    "processed_urls": 0,
+                }
+            scope = ""
+            first_row, last_row = 2, len(existing_urls) + 1
+            if row_range:
+                first_row, last_row = row_range
+                scope = f"rows{first_row}-{last_row}"
+                result["row_range"] = {"start_row": first_row, "end_row": last_row}
+                logger.info(f"処理範囲: {first_row}～{last_row}行目")
+
+            if not existing_urls or first_row > last_row:
                 logger.info("処理対象のURLがありません")
                 return result
 
-            # 一括処理: すべてのURLからデータを取得
-            all_properties = []
-
-            for i, url in enumerate(existing_urls):
+            # 中断された前回の実行があれば、書き込み済みの物件を除いて続きから再開する
+            journal = None
+            flushed_urls = set()
+            pending_entries = {}
+            if config.CHECKPOINT_ENABLED:
+                run_key = make_run_key(update_mode, config.SPREADSHEET_ID, scope)
                 try:
-                    logger.debug(
-                        f"URL({i+1}/{len(existing_urls)})スクレイピング開始: {url}"
-                    )
-
-                    # ランダムな待機時間を設定（サーバー負荷軽減のため）
-                    if i > 0:  # 最初のURLは待機なし
-                        time.sleep(
-                            random.uniform(
-                                config.SCRAPING_WAIT_MIN, config.SCRAPING_WAIT_MAX
-                            )
+                    journal = get_checkpoint_journal()
+                    if journal.begin(run_key):
+                        flushed_urls = journal.flushed_urls(run_key)
+                        pending_entries = journal.scraped_entries(run_key)
+                        result["resumed_count"] = len(flushed_urls)
+                        logger.info(
+                            f"前回の実行を再開: 書き込み済み={len(flushed_urls)}件, "
+                            f"書き込み待ち={len(pending_entries)}件"
                         )
-
-                    # 物件情報を取得
-                    property_info = scrape_suumo_property_info(url)
+                except Exception as e:
+                    # 進捗を記録できなくても更新自体は行う（中断時は最初からやり直しになる）
+                    logger.warning(
+                        f"チェックポイントを利用できないため、記録せずに続行: {e}"
+                    )
+                    journal = None
+                    flushed_urls = set()
+                    pending_entries = {}
+
+            def on_committed(properties):
+                if journal:
+                    journal.mark_flushed(run_key, [prop["url"] for prop in properties])
+
+            def record_scraped(url, row, property_info):
+                # 記録に失敗しても更新は続け、以降は進捗を記録しない
+                nonlocal journal
+                if not journal:
+                    return
+                try:
+                    journal.mark_scraped(run_key, url, row, property_info)
+                except Exception as e:
+                    logger.warning(
+                        f"チェックポイントに記録できないため、以降は記録せずに続行: {e}"
+                    )
+                    journal = None
+
+            # 取得した物件情報は順次ライターに渡し、スクレイピングと並行して書き込む
+            processed_count = 0
+            targets = []  # (行番号, URL)
+            with BatchingSheetWriter(
+                property_sheet,
+                result,
+                snapshot,
+                on_committed=on_committed if journal else None,
+            ) as writer:
+                for row in range(first_row, min(last_row, len(existing_urls) + 1) + 1):
+                    url = existing_urls[row - 2]  # 2行目から開始
+                    if url in flushed_urls:
+                        processed_count += 1
+                    elif url in pending_entries:
+                        # スクレイピング済みの物件は取得し直さずに書き込む
+                        processed_count += 1
+                        writer.put(row, pending_entries[url])
+                    else:
+                        targets.append((row, url))
+                total = processed_count + len(targets)
+                report_progress(total, processed_count)
+
+                # 前回から更新されていないページは条件付きGETで判定して解析を省略する
+                for i, url, property_info in scrape_many(
+                    [url for _, url in targets], revalidate=True
+                ):
+                    row = targets[i][0]
                     property_info["url"] = url  # URLも含めておく
+                    processed_count += 1
+
+                    if property_info.get("not_modified"):
+                        logger.debug(f"更新なしのためスキップ: {url}")
+                        record_scraped(url, row, property_info)
+                        writer.put(row, property_info)
+                        report_progress(total, processed_count)
+                        continue
 
                     # 既存の通し番号を保持
-                    try:
-                        row = i + 2  # 2行目から開始
-                        existing_number = property_sheet.cell(
-                            row, config.COLUMNS["number"]
-                        ).value
-                        if existing_number:
-                            property_info["number"] = existing_number
-                    except Exception as e:
-                        logger.warning(f"既存の通し番号取得エラー: {e}")
-
-                    # 成功したらリストに追加
-                    all_properties.append(
-                        {"row": i + 2, "data": property_info}  # 2行目から開始
-                    )
-                    logger.debug(f"スクレイピング成功: {url}")
+                    existing_number = snapshot.value(row, "number")
+                    if existing_number:
+                        property_info["number"] = existing_number
 
+                    if "error" in property_info:
+                        logger.error(
+                            f"スクレイピングエラー: {url} - {property_info['error']}"
+                        )
+                    else:
+                        logger.debug(f"スクレイピング成功: {url}")
+                        record_scraped(url, row, property_info)
+
+                    # エラーがあった場合でも書き込み対象に追加（エラー情報付き）
+                    writer.put(row, property_info)
+                    report_progress(total, processed_count)
+
+            # 最後まで処理できた場合のみ完了とする（中断時は次回ここから再開）
+            if journal:
+                try:
+                    journal.complete(run_key)
                 except Exception as e:
-                    # エラーがあった場合でもリストに追加（エラー情報付き）
-                    all_properties.append(
-                        {"row": i + 2, "data": {"url": url, "error": str(e)}}
-                    )
-                    logger.error(f"スクレイピングエラー: {url} - {e}")
+                    logger.warning(f"チェックポイントを完了にできません: {e}")
 
-            # 取得したデータを一括でスプレッドシートに更新
-            if all_properties:
-                result = batch_update_properties(property_sheet, all_properties, result)
-                result["processed_urls"] = len(all_properties)
-                logger.info(f"一括更新完了: {len(all_properties)}件")
-            else:
-                logger.info("更新する物件情報がありません")
+            result["processed_urls"] = processed_count
+            report_progress(total, processed_count)
+            logger.info(f"一括更新完了: {processed_count}件")
+
+        # 変更されたセルを使う評価項目だけを採点し直す
+        # （評価基準マスタ・重みが前回全物件を採点したときから変わっていれば全物件を採点する）
+        # 物件情報は書き込みを反映したスナップショットを使い、シートを読み直さない
+        if update_mode == config.MODE_FULL_UPDATE:
+            scoring_enabled = config.SCORING_AFTER_UPDATE
+        else:
+            scoring_enabled = config.SCORING_AFTER_NEW_ONLY
+        if rescore and scoring_enabled and result.get("changed_cells"):
+            try:
+                result["scoring"] = run_scoring(
+                    changed_cells=result["changed_cells"],
+                    property_values=snapshot.values,
+                )
+            except Exception as e:
+                logger.warning(f"変更された物件の採点に失敗しました: {e}")
+                result["scoring"] = {"status": "error", "error_message": str(e)}
 
         # 処理結果の返却
         logger.debug(f"処理完了: {result}")
@@ -243,6 +430,21 @@ def main():
         help="実行モード（new_only: 新規物件のみ追加, full_update: 全物件の情報更新）",
     )
     parser.add_argument("--url", type=str, help="単一のURLを処理する場合に指定")
+    parser.add_argument(
+        "--shard-index", type=int, help="全体更新で担当するシャード番号（0始まり）"
+    )
+    parser.add_argument("--shard-count", type=int, help="全体更新のシャード数")
+    parser.add_argument("--start-row", type=int, help="全体更新で処理する開始行")
+    parser.add_argument("--end-row", type=int, help="全体更新で処理する終了行")
+    parser.add_argument(
+        "--score",
+        type=str,
+        choices=[SCORING_MODE_ALL, SCORING_MODE_SELECTED],
+        help="採点を実行する（all: 全物件, selected: --score-targetsで指定した物件）",
+    )
+    parser.add_argument(
+        "--score-targets", type=str, default="", help="採点する通し番号（カンマ区切り）"
+    )
     parser.add_argument(
         "--debug", action="store_true", help="デバッグモード（詳細なログを出力）"
     )
@@ -281,10 +483,28 @@ def main():
             traceback.print_exc()
             sys.exit(1)
 
+    # 採点モード
+    if args.score:
+        try:
+            result = run_scoring(args.score, args.score_targets)
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+            sys.exit(1 if result["status"] == "error" else 0)
+        except Exception as e:
+            logger.error(f"採点処理中にエラーが発生しました: {e}")
+            traceback.print_exc()
+            sys.exit(1)
+
     # 通常モード
     try:
         # メインモードの処理を実行
-        result = update_suumo_sheet(args.mode, args.url)
+        result = update_suumo_sheet(
+            args.mode,
+            args.url,
+            shard_index=args.shard_index,
+            shard_count=args.shard_count,
+            start_row=args.start_row,
+            end_row=args.end_row,
+        )
 
         # 処理結果を出力
         print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -305,6 +525,8 @@ def main():
 
     except KeyboardInterrupt:
         logger.info("ユーザーによる中断")
+        if args.mode == config.MODE_FULL_UPDATE and config.CHECKPOINT_ENABLED:
+            logger.info("進捗は保存済みのため、次回の全体更新は続きから再開します")
         sys.exit(130)  # SIGINT (Ctrl+C) の標準的な終了コード
     except Exception as e:
         logger.error(f"予期せぬエラーが発生しました: {e}")
@@ -0,0 +1,605 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+from gspread.utils import absolute_range_name
+from src.suumo_scraper import config
+from src.suumo_scraper.scoring.rules import (
+    RuleIndex,
+    ValueColumn,
+    compile_rules,
+    evaluate_rules,
+    get_compiled_master,
+    master_version,
+)
+from src.suumo_scraper.scoring.values import (
+    combine_values,
+    extract_walking_minutes,
+    format_number,
+    is_nan,
+    is_truthy,
+    to_number,
+    to_string,
+)
+from src.suumo_scraper.sheets.connection import get_sheet_connection_cache
+from src.suumo_scraper.sheets.rate_limiter import get_sheets_rate_limiter
+from src.suumo_scraper.sheets.update import chunk_updates, coalesce_row_ranges
+
+# 徒歩分数に変換して採点する項目
+ACCESS_ITEM = "アクセス"
+
+# 採点対象の指定
+SCORING_MODE_ALL = "all"  # 全物件
+SCORING_MODE_SELECTED = "selected"  # 指定した通し番号の物件のみ
+
+# 採点シートの先頭の行・列（1行目は出力項目、2行目は重み、B列は総合点）
+SCORE_HEADER_ROW = 1
+SCORE_WEIGHT_ROW = 2
+SCORE_TOTAL_COLUMN = 2
+
+
+def pad_rows(rows: List[List[Any]], width: int) -> List[List[Any]]:
+    """
+    行ごとに長さの異なる値を、指定した列数に揃える（足りない分は空文字列）
+
+    Args:
+        rows: 値の2次元リスト
+        width: 列数
+
+    Returns:
+        列数を揃えた値の2次元リスト
+    """
+    return [list(row[:width]) + [""] * (width - len(row)) for row in rows]
+
+
+def property_value(
+    item_name: str, header_index: Dict[str, int], row_values: List[Any]
+) -> Any:
+    """
+    物件情報から項目の値を取得する（数値に変換できる値は数値として扱う）
+
+    Args:
+        item_name: 物件情報シートのヘッダー名
+        header_index: {ヘッダー名: 列番号（0始まり）}
+        row_values: 物件の行の値
+
+    Returns:
+        値、項目が見つからない場合はNone
+    """
+    index = header_index.get(item_name)
+    if index is None:
+        return None
+
+    raw_value = row_values[index]
+
+    # アクセス項目は徒歩分数を抽出する
+    if item_name == ACCESS_ITEM:
+        return extract_walking_minutes(raw_value)
+
+    number = to_number(raw_value)
+    return raw_value if is_nan(number) else number
+
+
+def input_value(
+    input_item: str,
+    combination_method: Optional[str],
+    header_index: Dict[str, int],
+    row_values: List[Any],
+) -> Any:
+    """
+    評価基準マスタの入力項目の値を取得する（カンマ区切りの場合は組み合わせる）
+
+    Args:
+        input_item: 入力項目
+        combination_method: 複数項目の組み合わせ方法
+        header_index: {ヘッダー名: 列番号（0始まり）}
+        row_values: 物件の行の値
+
+    Returns:
+        値、取得できない場合はNone
+    """
+    if not input_item:
+        return None
+    if "," not in input_item:
+        return property_value(input_item, header_index, row_values)
+
+    values = []
+    for item in input_item.split(","):
+        value = property_value(item.strip(), header_index, row_values)
+        if value is not None:
+            values.append(value)
+    return combine_values(values, combination_method)
+
+
+def build_header_index(property_headers: List[Any]) -> Dict[str, int]:
+    """
+    物件情報シートのヘッダー名から列番号を引く辞書を作成する（同名の列は最初の列）
+
+    Args:
+        property_headers: 物件情報シートのヘッダー
+
+    Returns:
+        {ヘッダー名: 列番号（0始まり）}
+    """
+    header_index = {}
+    for index, header in enumerate(property_headers):
+        header_index.setdefault(to_string(header), index)
+    return header_index
+
+
+def input_key(rules: List[Dict], output_item: Any) -> Tuple:
+    """
+    評価項目の値の取り方（入力項目と組み合わせ方法）を取得する
+
+    Args:
+        rules: 評価項目の1人分のルール
+        output_item: 出力項目
+
+    Returns:
+        (入力項目, 組み合わせ方法)
+    """
+    # 入力項目と組み合わせ方法は最初のルールのものを使う
+    # 文字列でない出力項目は、GASと同様に入力値なし（空）として採点する
+    if not isinstance(output_item, str):
+        return (None, None)
+    return (rules[0]["input_item"], rules[0]["combination_method"])
+
+
+def item_input_columns(
+    master: Dict[str, Dict[str, List[Dict]]],
+    evaluation_headers: List[Any],
+    person: str,
+    header_index: Dict[str, int],
+) -> List[Set[int]]:
+    """
+    評価項目ごとに、採点に使う物件情報シートの列を求める
+
+    Args:
+        master: load_master_dataで読み込んだ評価基準
+        evaluation_headers: 採点シートの出力項目（C列から）
+        person: 人物（husband, wife）
+        header_index: {ヘッダー名: 列番号（0始まり）}
+
+    Returns:
+        評価項目ごとの列番号（1始まり）の集合のリスト
+    """
+    item_columns = []
+    for output_item in evaluation_headers:
+        columns = set()
+        rules = master.get(to_string(output_item), {}).get(person)
+        if rules:
+            input_item = input_key(rules, output_item)[0]
+            if input_item:
+                names = [input_item]
+                if "," in input_item:
+                    names = [name.strip() for name in input_item.split(",")]
+                for name in names:
+                    index = header_index.get(name)
+                    if index is not None:
+                        columns.add(index + 1)
+        item_columns.append(columns)
+    return item_columns
+
+
+def score_properties(
+    master: Dict[str, Dict[str, List[Dict]]],
+    evaluation_headers: List[Any],
+    weights: List[Any],
+    property_headers: List[Any],
+    property_rows: List[List[Any]],
+    person: str,
+    columns: Optional[Dict[Tuple, ValueColumn]] = None,
+    items: Optional[List[Optional[Set[int]]]] = None,
+    existing: Optional[List[List[Any]]] = None,
+    rule_indexes: Optional[Dict[str, Dict[str, RuleIndex]]] = None,
+) -> List[Tuple[float, List[Optional[float]]]]:
+    """
+    物件を1人分採点する
+    評価項目ごとに全物件の値を1つの列にまとめ、ルールを列単位で判定する
+
+    Args:
+        master: load_master_dataで読み込んだ評価基準
+        evaluation_headers: 採点シートの出力項目（C列から）
+        weights: 採点シートの重み（C列から）
+        property_headers: 物件情報シートのヘッダー
+        property_rows: 採点する物件の行の値のリスト
+        person: 人物（husband, wife）
+        columns: 入力項目ごとの値の列のキャッシュ（夫婦で同じ列を共有する場合に指定）
+        items: 物件ごとに採点し直す評価項目の番号の集合（Noneの物件はすべての項目）
+        existing: 物件ごとの採点シート上の重み付けしたスコア（採点し直さない項目の総合点の計算に使う）
+        rule_indexes: compile_masterで変換した索引（Noneの場合はその場で変換する）
+
+    Returns:
+        物件ごとの(総合点, 重み付けしたスコアのリスト)、採点し直さなかった項目はNone
+    """
+    if columns is None:
+        columns = {}
+    header_index = build_header_index(property_headers)
+
+    weighted_columns = []
+    for item, (output_item, weight) in enumerate(zip(evaluation_headers, weights)):
+        indices = None
+        if items is not None:
+            indices = [
+                i
+                for i, row_items in enumerate(items)
+                if row_items is None or item in row_items
+            ]
+        weighted = [None] * len(property_rows)
+        if indices == []:
+            weighted_columns.append(weighted)
+            continue
+
+        weight = to_number(weight)
+        rules = master.get(to_string(output_item), {}).get(person)
+        if not rules:
+            # 該当するルールがない項目は0点
+            scores = [0.0] * len(property_rows)
+        else:
+            key = input_key(rules, output_item)
+            column = columns.get(key)
+            if column is None:
+                column = ValueColumn(
+                    [input_value(*key, header_index, row) for row in property_rows]
+                )
+                columns[key] = column
+            if rule_indexes is not None:
+                rule_index = rule_indexes[to_string(output_item)][person]
+            else:
+                rule_index = compile_rules(rules)
+            scores = evaluate_rules(rule_index, column, indices)
+
+        for i in range(len(property_rows)) if indices is None else indices:
+            weighted[i] = scores[i] * weight
+        weighted_columns.append(weighted)
+
+    results = []
+    for i in range(len(property_rows)):
+        weighted_scores = [weighted[i] for weighted in weighted_columns]
+        total_score = 0.0
+        for item, score in enumerate(weighted_scores):
+            if score is None:
+                score = to_number(existing[i][item]) if existing else 0.0
+            total_score += score
+        results.append((total_score, weighted_scores))
+    return results
+
+
+def select_target_rows(
+    property_rows: List[List[Any]], mode: str = SCORING_MODE_ALL, target_nos: Any = ""
+) -> List[Tuple[int, List[Any]]]:
+    """
+    採点対象の物件を選ぶ（A列の通し番号が空の行は対象外）
+
+    Args:
+        property_rows: 物件情報シートの2行目以降の値
+        mode: "all"（全物件）または"selected"（指定した物件のみ）
+        target_nos: 採点する通し番号（カンマ区切りの文字列またはリスト）
+
+    Returns:
+        (物件情報シートの行番号, 行の値)のリスト
+    """
+    if mode != SCORING_MODE_ALL:
+        if isinstance(target_nos, str):
+            target_list = {value.strip() for value in target_nos.split(",")}
+        else:
+            target_list = {to_string(value) for value in target_nos or []}
+
+    targets = []
+    for index, row_values in enumerate(property_rows):
+        number = row_values[0] if row_values else ""
+        if not is_truthy(number):
+            continue
+        if mode != SCORING_MODE_ALL and to_string(number) not in target_list:
+            continue
+        targets.append((index + 2, row_values))  # 2行目から開始
+    return targets
+
+
+def scores_equal(sheet_value: Any, new_value: Any) -> bool:
+    """
+    採点シート上の値と書き込もうとしているスコアが同じかを判定する
+
+    Args:
+        sheet_value: シートから読み込んだ値
+        new_value: 書き込もうとしている値
+
+    Returns:
+        同じであればTrue
+    """
+    numeric = (int, float)
+    if (
+        isinstance(sheet_value, numeric)
+        and isinstance(new_value, numeric)
+        and not isinstance(sheet_value, bool)
+    ):
+        return float(sheet_value) == float(new_value)
+    return to_string(sheet_value) == to_string(new_value)
+
+
+def to_sheet_value(value: float) -> Any:
+    """
+    スコアをシートに書き込む値に変換する（NaNなどJSONにできない値は文字列にする）
+
+    Args:
+        value: スコア
+
+    Returns:
+        書き込む値
+    """
+    if is_nan(value) or value in (float("inf"), float("-inf")):
+        return format_number(value)
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+def changed_items(
+    changed_columns: Optional[List[int]], item_columns: List[Set[int]]
+) -> Set[int]:
+    """
+    変更された列を採点に使う評価項目を求める
+
+    Args:
+        changed_columns: 物件情報シートで変更された列番号のリスト
+        item_columns: item_input_columnsで求めた評価項目ごとの列番号の集合
+
+    Returns:
+        採点し直す評価項目の番号の集合
+    """
+    changed = set(changed_columns or [])
+    return {item for item, columns in enumerate(item_columns) if columns & changed}
+
+
+def scoring_version(
+    master_values: List[List[Any]],
+    score_values: List[List[List[Any]]],
+    property_headers: List[Any],
+) -> str:
+    """
+    採点結果に影響する設定（評価基準マスタ・採点シートの出力項目と重み・
+    物件情報シートのヘッダー）から版を表すハッシュ値を求める
+
+    Args:
+        master_values: 評価基準マスタ全体の値
+        score_values: 人物ごとの採点シートの値
+        property_headers: 物件情報シートのヘッダー
+
+    Returns:
+        ハッシュ値（16進数の文字列）
+    """
+    settings = [values[:SCORE_WEIGHT_ROW] for values in score_values]
+    payload = json.dumps(
+        [master_version(master_values), settings, property_headers],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_scored_version() -> Optional[str]:
+    """
+    前回全物件を採点したときの版を読み込む
+
+    Returns:
+        版のハッシュ値、記録がない場合はNone
+    """
+    try:
+        with open(config.SCORING_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"採点の版の読み込みに失敗: {e}")
+        return None
+
+
+def save_scored_version(version: str) -> None:
+    """
+    全物件を採点したときの版を保存する
+
+    Args:
+        version: 版のハッシュ値
+    """
+    try:
+        directory = os.path.dirname(config.SCORING_STATE_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{config.SCORING_STATE_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": version}, f)
+        os.replace(tmp_path, config.SCORING_STATE_FILE)
+    except Exception as e:
+        logging.warning(f"採点の版の保存に失敗: {e}")
+
+
+def run_scoring(
+    mode: str = SCORING_MODE_ALL,
+    target_nos: Any = "",
+    changed_cells: Optional[Dict[Any, List[int]]] = None,
+    property_values: Optional[List[List[Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    物件情報を評価基準マスタで採点し、夫婦それぞれの採点シートに書き込む
+    シートの読み込みと書き込みは、それぞれ1回のリクエストにまとめ、
+    書き込むのはシート上の値から変わったセルだけにする
+
+    Args:
+        mode: "all"（全物件）または"selected"（指定した物件のみ）
+        target_nos: 採点する通し番号（mode="selected"の場合）
+        changed_cells: 物件情報シートで変更されたセル {行番号: 列番号のリスト}
+            （指定した場合は、変更された列を使う評価項目だけを採点し直す。
+            評価基準マスタ・重みなどが前回全物件を採点したときから変わっている場合は、
+            全物件を採点する）
+        property_values: 物件情報シートの値（更新処理のスナップショットなど、
+            1行目はヘッダー）。指定した場合は物件情報シートを読み込まない
+
+    Returns:
+        処理結果の辞書
+
+    Raises:
+        RuntimeError: シートの読み込みに失敗した場合
+    """
+    spreadsheet = get_sheet_connection_cache().get_spreadsheet(config.SPREADSHEET_ID)
+    persons = list(config.SCORE_SHEET_NAMES)
+    sheet_names = [config.SCORING_MASTER_SHEET_NAME] + [
+        config.SCORE_SHEET_NAMES[person] for person in persons
+    ]
+    if property_values is None:
+        sheet_names.insert(0, config.PROPERTY_SHEET_NAME)
+
+    # 物件情報（指定されていない場合）・評価基準マスタ・採点シートをまとめて読み込む
+    # 数値のセルは数値のまま取得する（GASのgetValuesと同じ）
+    response = get_sheets_rate_limiter().read(
+        lambda: spreadsheet.values_batch_get(
+            [absolute_range_name(name) for name in sheet_names],
+            params={
+                "valueRenderOption": "UNFORMATTED_VALUE",
+                "dateTimeRenderOption": "FORMATTED_STRING",
+            },
+        ),
+        "採点データの読み込み",
+    )
+    if response is None:
+        raise RuntimeError("採点データの読み込みに失敗しました")
+    sheet_values = [
+        value_range.get("values", []) for value_range in response.get("valueRanges", [])
+    ]
+    if property_values is None:
+        property_values = sheet_values.pop(0)
+    master_values, *score_values = sheet_values
+
+    property_width = max((len(row) for row in property_values), default=0)
+    property_headers = pad_rows(property_values[:1], property_width)
+    property_headers = property_headers[0] if property_headers else []
+    version = scoring_version(master_values, score_values, property_headers)
+    if changed_cells is not None and version != load_scored_version():
+        # 変更された物件だけを採点すると、他の物件が古い基準の点数のまま残る
+        logging.info("評価基準マスタまたは重みが変更されたため、全物件を採点します")
+        changed_cells = None
+        mode = SCORING_MODE_ALL
+    targets = select_target_rows(
+        pad_rows(property_values[1:], property_width), mode, target_nos
+    )
+    if changed_cells is not None:
+        # JSONで受け取った場合は行番号が文字列になっている
+        changed_cells = {int(row): columns for row, columns in changed_cells.items()}
+        targets = [target for target in targets if target[0] in changed_cells]
+    master, rule_indexes = get_compiled_master(master_values)
+
+    # 出力項目は妻の採点シートのものを夫婦共通で使う（GASの採点処理と同じ）
+    wife_values = score_values[persons.index("wife")]
+    score_width = max((len(row) for row in wife_values), default=0)
+    evaluation_headers = pad_rows(
+        wife_values[SCORE_HEADER_ROW - 1 : SCORE_HEADER_ROW], score_width
+    )
+    evaluation_headers = evaluation_headers[0][2:] if evaluation_headers else []
+    row_width = SCORE_TOTAL_COLUMN + len(evaluation_headers)
+    header_index = build_header_index(property_headers)
+
+    property_rows = [row_values for _, row_values in targets]
+    columns = {}
+    updates = []
+    rescored = set()
+    for person, values in zip(persons, score_values):
+        weights = pad_rows(
+            values[SCORE_WEIGHT_ROW - 1 : SCORE_WEIGHT_ROW] or [[]], row_width
+        )
+        weights = weights[0][SCORE_TOTAL_COLUMN:]
+
+        # 採点シート上の総合点とスコア（2行目が重みのため、物件情報シートの1行下）
+        existing = []
+        for property_row, _ in targets:
+            score_row = values[property_row : property_row + 1] or [[]]
+            existing.append(pad_rows(score_row, row_width)[0][SCORE_TOTAL_COLUMN - 1 :])
+
+        items = None
+        if changed_cells is not None:
+            item_columns = item_input_columns(
+                master, evaluation_headers, person, header_index
+            )
+            items = []
+            for (property_row, _), current in zip(targets, existing):
+                # 採点されていないセルがある行（新しい物件など）はすべての項目を採点する
+                if any(value == "" for value in current):
+                    items.append(None)
+                else:
+                    items.append(
+                        changed_items(changed_cells[property_row], item_columns)
+                    )
+
+        results = score_properties(
+            master,
+            evaluation_headers,
+            weights,
+            property_headers,
+            property_rows,
+            person,
+            columns,
+            items,
+            [current[1:] for current in existing],
+            rule_indexes,
+        )
+
+        sheet_name = config.SCORE_SHEET_NAMES[person]
+        for (property_row, _), current, (total_score, weighted_scores) in zip(
+            targets, existing, results
+        ):
+            row = property_row + 1
+            row_data = (
+                [""] * (SCORE_TOTAL_COLUMN - 1)
+                + [to_sheet_value(total_score)]
+                + [
+                    None if score is None else to_sheet_value(score)
+                    for score in weighted_scores
+                ]
+            )
+            changed = [False] * (SCORE_TOTAL_COLUMN - 1) + [
+                value is not None and not scores_equal(old, value)
+                for old, value in zip(current, row_data[SCORE_TOTAL_COLUMN - 1 :])
+            ]
+            ranges = [
+                {
+                    "range": absolute_range_name(sheet_name, entry["range"]),
+                    "values": entry["values"],
+                }
+                for entry in coalesce_row_ranges(row, changed, row_data)
+            ]
+            if ranges:
+                rescored.add(property_row)
+                updates.append((None, row, row_data, ranges))
+
+    result = {
+        "status": "success",
+        "message": "採点が完了しました",
+        "scored_properties": len(targets),
+        "target_properties": len(targets),
+        "updated_properties": len(rescored),
+        "updated_cells": sum(
+            len(entry["values"][0]) for update in updates for entry in update[3]
+        ),
+    }
+
+    # 夫婦両方の採点シートへの書き込みを、APIの上限に収まる範囲で1回にまとめる
+    for chunk in chunk_updates(updates):
+        data = [entry for update in chunk for entry in update[3]]
+        response = get_sheets_rate_limiter().write(
+            lambda: spreadsheet.values_batch_update(
+                {"valueInputOption": "RAW", "data": data}
+            ),
+            "採点結果の書き込み",
+        )
+        if response is None:
+            result["status"] = "error"
+            result["error_message"] = "採点結果の書き込みに失敗しました"
+            return result
+
+    if changed_cells is None and mode == SCORING_MODE_ALL:
+        save_scored_version(version)
+
+    logging.info(
+        f"採点完了: {len(targets)}件（書き込み: {len(rescored)}件, "
+        f"{result['updated_cells']}セル）"
+    )
+    return result
@@ -0,0 +1,306 @@
+import math
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+# 評価基準のルールを値から逆引きするための索引
+# どの索引も「条件に一致するルールのうち、最も番号が小さいもの」を返す
+
+
+def prefix_minimums(values: List[int]) -> List[Optional[int]]:
+    """
+    先頭からの最小値の列を求める（先頭の要素は空の範囲としてNone）
+
+    Args:
+        values: 値のリスト
+
+    Returns:
+        長さがlen(values) + 1の最小値のリスト
+    """
+    minimums = [None]
+    for value in values:
+        current = minimums[-1]
+        minimums.append(value if current is None or value < current else current)
+    return minimums
+
+
+def suffix_minimums(values: List[int]) -> List[Optional[int]]:
+    """
+    末尾からの最小値の列を求める（末尾の要素は空の範囲としてNone）
+
+    Args:
+        values: 値のリスト
+
+    Returns:
+        長さがlen(values) + 1の最小値のリスト（i番目はvalues[i:]の最小値）
+    """
+    return list(reversed(prefix_minimums(list(reversed(values)))))
+
+
+class ThresholdIndex:
+    """
+    しきい値の比較（>, >=, <, <=）のルールの索引
+    しきい値を並べ替えておき、値の位置を二分探索して一致するルールの範囲を求める
+    """
+
+    def __init__(self):
+        self.thresholds = {">": [], ">=": [], "<": [], "<=": []}
+        self._built = None
+
+    def add(self, rule_index: int, operator: str, number: float):
+        """
+        Args:
+            rule_index: ルールの番号
+            operator: 演算子（>, >=, <, <=）
+            number: しきい値（NaNはどの値とも一致しないため登録しない）
+        """
+        if not math.isnan(number):
+            self.thresholds[operator].append((number, rule_index))
+            self._built = None
+
+    def _build(self):
+        built = {}
+        for operator, entries in self.thresholds.items():
+            entries = sorted(entries)
+            numbers = [number for number, _ in entries]
+            indices = [rule_index for _, rule_index in entries]
+            if operator in (">", ">="):
+                # 値より小さい（以下の）しきい値、つまり先頭からの範囲が一致する
+                built[operator] = (numbers, prefix_minimums(indices))
+            else:
+                built[operator] = (numbers, suffix_minimums(indices))
+        self._built = built
+
+    def first_match(self, number: float) -> Optional[int]:
+        """
+        Args:
+            number: 判定する値
+
+        Returns:
+            一致したルールの最小の番号、一致しない場合はNone
+        """
+        if math.isnan(number):
+            return None
+        if self._built is None:
+            self._build()
+
+        candidates = []
+        for operator, (numbers, minimums) in self._built.items():
+            if not numbers:
+                continue
+            if operator == ">":
+                position = bisect_left(numbers, number)
+            elif operator == ">=":
+                position = bisect_right(numbers, number)
+            elif operator == "<":
+                position = bisect_right(numbers, number)
+            else:
+                position = bisect_left(numbers, number)
+            if minimums[position] is not None:
+                candidates.append(minimums[position])
+        return min(candidates) if candidates else None
+
+
+class RangeIndex:
+    """
+    範囲指定（><、両端を含む）のルールの索引
+    範囲の端点で数直線を区間に分け、区間ごとに一致する最小のルールの番号を求めておく
+    """
+
+    def __init__(self):
+        self.ranges = []
+        self._built = None
+
+    def add(self, rule_index: int, minimum: float, maximum: float):
+        """
+        Args:
+            rule_index: ルールの番号
+            minimum: 最小値
+            maximum: 最大値（NaNや最小値より小さい場合はどの値とも一致しないため登録しない）
+        """
+        if math.isnan(minimum) or math.isnan(maximum) or minimum > maximum:
+            return
+        self.ranges.append((rule_index, minimum, maximum))
+        self._built = None
+
+    def _build(self):
+        points = sorted(
+            {
+                bound
+                for _, minimum, maximum in self.ranges
+                for bound in (minimum, maximum)
+            }
+        )
+        # 区間の番号: 2i+1は端点points[i]、2iはpoints[i]の手前の開区間
+        slots = [None] * (2 * len(points) + 1)
+        # 次に値が決まっていない区間の番号（決まった区間を飛ばすため）
+        next_open = list(range(len(slots) + 1))
+
+        def find(slot):
+            while next_open[slot] != slot:
+                next_open[slot] = next_open[next_open[slot]]
+                slot = next_open[slot]
+            return slot
+
+        for rule_index, minimum, maximum in sorted(self.ranges):
+            start = 2 * bisect_left(points, minimum) + 1
+            end = 2 * bisect_left(points, maximum) + 1
+            slot = find(start)
+            while slot <= end:
+                slots[slot] = rule_index
+                next_open[slot] = slot + 1
+                slot = find(slot + 1)
+        self._built = (points, slots)
+
+    def first_match(self, number: float) -> Optional[int]:
+        """
+        Args:
+            number: 判定する値
+
+        Returns:
+            一致したルールの最小の番号、一致しない場合はNone
+        """
+        if math.isnan(number) or not self.ranges:
+            return None
+        if self._built is None:
+            self._build()
+        points, slots = self._built
+        position = bisect_left(points, number)
+        if position < len(points) and points[position] == number:
+            return slots[2 * position + 1]
+        return slots[2 * position]
+
+
+class SubstringMatcher:
+    """
+    複数の文字列を一度の走査で部分一致判定する（Aho-Corasick法）
+    """
+
+    def __init__(self, patterns: List[str]):
+        """
+        Args:
+            patterns: 探す文字列のリスト（空文字列は含めない）
+        """
+        self.patterns = patterns
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[Set[int]] = [set()]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.outputs.append(set())
+                state = next_state
+            self.outputs[state].add(pattern_id)
+
+        # 失敗時の遷移先を幅優先で求め、遷移先の出力を引き継ぐ
+        self.failures = [0] * len(self.transitions)
+        pending = deque(self.transitions[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self.transitions[state].items():
+                pending.append(next_state)
+                failure = self.failures[state]
+                while failure and char not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                failure = self.transitions[failure].get(char, 0)
+                self.failures[next_state] = failure
+                self.outputs[next_state] |= self.outputs[failure]
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Args:
+            text: 判定する文字列
+
+        Returns:
+            文字列に含まれていたパターンの番号の集合
+        """
+        found = set()
+        state = 0
+        transitions = self.transitions
+        failures = self.failures
+        outputs = self.outputs
+        for char in text:
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class ContainsIndex:
+    """
+    部分一致（in, notin）のルールの索引
+    すべてのルールの比較値を1つのSubstringMatcherにまとめ、値の走査を1回で済ませる
+    """
+
+    def __init__(self):
+        self.pattern_ids: Dict[str, int] = {}
+        # in: パターンごとの最小のルールの番号
+        self.first_included: Dict[int, int] = {}
+        # 空文字列を含むinは常に一致する
+        self.always_included = None
+        # notin: (ルールの番号, パターンの番号の集合)を番号順に
+        self.excluded: List[Tuple[int, frozenset]] = []
+        self._matcher = None
+
+    def _pattern_ids(self, targets: List[str]) -> Tuple[frozenset, bool]:
+        ids = set()
+        has_empty = False
+        for target in targets:
+            if target == "":
+                has_empty = True
+                continue
+            if target not in self.pattern_ids:
+                self.pattern_ids[target] = len(self.pattern_ids)
+                self._matcher = None
+            ids.add(self.pattern_ids[target])
+        return frozenset(ids), has_empty
+
+    def add(self, rule_index: int, operator: str, targets: List[str]):
+        """
+        Args:
+            rule_index: ルールの番号（番号順に登録する）
+            operator: 演算子（in, notin）
+            targets: 比較値のリスト
+        """
+        ids, has_empty = self._pattern_ids(targets)
+        if operator == "in":
+            if has_empty and self.always_included is None:
+                self.always_included = rule_index
+            for pattern_id in ids:
+                self.first_included.setdefault(pattern_id, rule_index)
+        elif not has_empty:
+            # 空文字列はどの値にも含まれるため、それを含むnotinは一致しない
+            self.excluded.append((rule_index, ids))
+
+    def first_match(self, text: str) -> Optional[int]:
+        """
+        Args:
+            text: 判定する文字列（前後の空白を除いたもの）
+
+        Returns:
+            一致したルールの最小の番号、一致しない場合はNone
+        """
+        if not self.first_included and not self.excluded:
+            return self.always_included
+        if self._matcher is None:
+            patterns = sorted(self.pattern_ids, key=self.pattern_ids.get)
+            self._matcher = SubstringMatcher(patterns)
+        found = self._matcher.find(text) if self.pattern_ids else set()
+
+        candidates = [] if self.always_included is None else [self.always_included]
+        included = [self.first_included[i] for i in found if i in self.first_included]
+        if included:
+            candidates.append(min(included))
+        for rule_index, ids in self.excluded:
+            if candidates and rule_index > min(candidates):
+                break
+            if not (ids & found):
+                candidates.append(rule_index)
+                break
+        return min(candidates) if candidates else None
@@ -0,0 +1,356 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from src.suumo_scraper import config
+from src.suumo_scraper.scoring.matchers import (
+    ContainsIndex,
+    RangeIndex,
+    ThresholdIndex,
+)
+from src.suumo_scraper.scoring.values import (
+    NAN,
+    is_truthy,
+    to_number,
+    to_string,
+)
+
+# 評価基準マスタの列（A列から）
+MASTER_COLUMNS = [
+    "output_item",  # 出力項目（採点シートのヘッダー）
+    "input_item",  # 物件情報の対象項目（カンマ区切りで複数指定可）
+    "operator",  # 比較演算子
+    "target",  # 比較する値
+    "score",  # 条件に一致した場合のスコア
+    "person",  # 人物（husband, wife）
+    "combination_method",  # 複数項目の組み合わせ方法（省略可）
+]
+
+
+class ValueColumn:
+    """
+    1つの評価項目について、全物件の値を並べた列
+    演算子ごとに必要な変換（数値・文字列）は列全体に対して一度だけ行う
+    """
+
+    def __init__(self, values: List[Any]):
+        """
+        Args:
+            values: 物件ごとの値（値がない場合はNone）
+        """
+        # 比較の前にnullは空文字列として扱う
+        self.values = ["" if value is None else value for value in values]
+        self._numbers = None
+        self._strings = None
+        self._trimmed = None
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def numbers(self) -> List[float]:
+        if self._numbers is None:
+            self._numbers = [to_number(value) for value in self.values]
+        return self._numbers
+
+    @property
+    def strings(self) -> List[str]:
+        if self._strings is None:
+            self._strings = [to_string(value) for value in self.values]
+        return self._strings
+
+    @property
+    def trimmed(self) -> List[str]:
+        if self._trimmed is None:
+            self._trimmed = [text.strip() for text in self.strings]
+        return self._trimmed
+
+
+def load_master_data(rows: List[List[Any]]) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    評価基準マスタの値からルールを読み込む
+
+    Args:
+        rows: 評価基準マスタ全体の値（1行目はヘッダー）
+
+    Returns:
+        {出力項目: {人物: ルールのリスト}}（ルールは記載順）
+    """
+    master = {}
+    for row_values in rows[1:]:
+        row_values = list(row_values) + [""] * (len(MASTER_COLUMNS) - len(row_values))
+        rule = dict(zip(MASTER_COLUMNS, row_values))
+
+        # 空行をスキップ
+        if not (
+            is_truthy(rule["output_item"])
+            and is_truthy(rule["input_item"])
+            and is_truthy(rule["person"])
+        ):
+            continue
+
+        # 組み合わせ方法の正規化（空・"-"は指定なし）
+        combination_method = None
+        if is_truthy(rule["combination_method"]):
+            combination_method = to_string(rule["combination_method"]).strip()
+            if combination_method in ("", "-"):
+                combination_method = None
+        rule["combination_method"] = combination_method
+        rule["input_item"] = to_string(rule["input_item"])
+
+        output_item = to_string(rule.pop("output_item"))
+        person = to_string(rule.pop("person"))
+        master.setdefault(output_item, {}).setdefault(person, []).append(rule)
+
+    logging.debug(f"評価基準マスタを読み込みました: {len(master)}項目")
+    return master
+
+
+def normalize_operator(operator: Any) -> str:
+    """
+    演算子の表記ゆれを正規化する（CSVから読み込んだ場合の先頭の'を除去）
+
+    Args:
+        operator: 評価基準マスタの演算子
+
+    Returns:
+        正規化した演算子
+    """
+    text = to_string(operator)
+    return text[1:] if text.startswith("'") else text
+
+
+def split_targets(target: Any) -> List[str]:
+    """
+    カンマ区切りの比較値を分割する
+
+    Args:
+        target: 比較する値
+
+    Returns:
+        前後の空白を除いた値のリスト
+    """
+    return [value.strip() for value in to_string(target).split(",")]
+
+
+def parse_range(target: Any) -> Tuple[float, float]:
+    """
+    範囲指定（"最小値-最大値"）の比較値を解析する
+
+    Args:
+        target: 比較する値
+
+    Returns:
+        (最小値, 最大値)、指定がない方はNaN
+    """
+    bounds = [to_number(value.strip()) for value in to_string(target).split("-")]
+    return (bounds[0], bounds[1] if len(bounds) > 1 else NAN)
+
+
+class RuleIndex:
+    """
+    1つの評価項目のルールを、演算子ごとの索引にまとめたもの
+    比較値の解析と索引の構築は一度だけ行い、物件ごとの判定はルールの数によらずほぼ一定の手間で済む
+    """
+
+    def __init__(self, rules: List[Dict]):
+        """
+        Args:
+            rules: ルールのリスト（記載順）
+        """
+        self.scores = [to_number(rule["score"]) for rule in rules]
+        # =: 比較値ごとの最小のルールの番号
+        self.equal: Dict[str, int] = {}
+        # !=: (ルールの番号, 比較値)を番号順に
+        self.not_equal: List[Tuple[int, str]] = []
+        self.thresholds = ThresholdIndex()
+        self.ranges = RangeIndex()
+        self.contains = ContainsIndex()
+        self.first_exist = None
+        self.first_not_exist = None
+
+        for rule_index, rule in enumerate(rules):
+            operator = normalize_operator(rule["operator"])
+            target = rule["target"]
+            if operator == "=":
+                self.equal.setdefault(to_string(target), rule_index)
+            elif operator == "!=":
+                self.not_equal.append((rule_index, to_string(target)))
+            elif operator in (">", ">=", "<", "<="):
+                self.thresholds.add(rule_index, operator, to_number(target))
+            elif operator == "><":
+                self.ranges.add(rule_index, *parse_range(target))
+            elif operator in ("in", "notin"):
+                self.contains.add(rule_index, operator, split_targets(target))
+            elif operator == "exist":
+                if self.first_exist is None:
+                    self.first_exist = rule_index
+            elif operator == "notexist":
+                if self.first_not_exist is None:
+                    self.first_not_exist = rule_index
+            else:
+                logging.warning(
+                    f"不明な演算子のため一致しない条件として扱います: {operator}"
+                )
+
+        # !=は最初のルールの比較値と異なれば最初のルールが一致し、
+        # 同じであれば比較値が異なる次のルールが一致する
+        self.first_not_equal = None
+        if self.not_equal:
+            first_index, first_target = self.not_equal[0]
+            other = next(
+                (i for i, text in self.not_equal if text != first_target), None
+            )
+            self.first_not_equal = (first_index, first_target, other)
+
+        self.uses_strings = bool(self.equal or self.not_equal)
+        self.uses_numbers = bool(self.thresholds.thresholds or self.ranges.ranges)
+        self.uses_trimmed = bool(
+            self.contains.first_included
+            or self.contains.excluded
+            or self.contains.always_included is not None
+        )
+
+    def first_match(self, column: ValueColumn, i: int) -> Optional[int]:
+        """
+        物件が最初に一致するルールを求める
+
+        Args:
+            column: 評価項目の値の列
+            i: 物件の番号
+
+        Returns:
+            一致したルールの番号、どのルールにも一致しない場合はNone
+        """
+        candidates = []
+        if self.uses_strings:
+            text = column.strings[i]
+            if text in self.equal:
+                candidates.append(self.equal[text])
+            if self.first_not_equal is not None:
+                first_index, first_target, other = self.first_not_equal
+                matched = first_index if text != first_target else other
+                if matched is not None:
+                    candidates.append(matched)
+        if self.uses_numbers:
+            number = column.numbers[i]
+            for matched in (
+                self.thresholds.first_match(number),
+                self.ranges.first_match(number),
+            ):
+                if matched is not None:
+                    candidates.append(matched)
+        if self.uses_trimmed:
+            matched = self.contains.first_match(column.trimmed[i])
+            if matched is not None:
+                candidates.append(matched)
+        if self.first_exist is not None or self.first_not_exist is not None:
+            value = column.values[i]
+            exists = not (isinstance(value, str) and value == "")
+            matched = self.first_exist if exists else self.first_not_exist
+            if matched is not None:
+                candidates.append(matched)
+        return min(candidates) if candidates else None
+
+
+def compile_rules(rules: List[Dict]) -> RuleIndex:
+    """
+    1つの評価項目のルールを索引に変換する
+
+    Args:
+        rules: ルールのリスト
+
+    Returns:
+        RuleIndexオブジェクト
+    """
+    return RuleIndex(rules)
+
+
+def evaluate_rules(
+    rule_index: RuleIndex,
+    column: ValueColumn,
+    indices: Optional[List[int]] = None,
+    default: float = 0.0,
+) -> List[float]:
+    """
+    物件ごとに最初に一致したルールのスコアを求める
+
+    Args:
+        rule_index: compile_rulesで変換したルール
+        column: 評価項目の値の列
+        indices: 採点する物件の番号のリスト（Noneの場合は全物件）
+        default: どのルールにも一致しない場合（および採点しない物件）のスコア
+
+    Returns:
+        物件ごとのスコアのリスト
+    """
+    scores = [default] * len(column)
+    for i in range(len(column)) if indices is None else indices:
+        matched = rule_index.first_match(column, i)
+        if matched is not None:
+            scores[i] = rule_index.scores[matched]
+    return scores
+
+
+def compile_master(
+    master: Dict[str, Dict[str, List[Dict]]],
+) -> Dict[str, Dict[str, RuleIndex]]:
+    """
+    評価基準全体を索引に変換する
+
+    Args:
+        master: load_master_dataで読み込んだ評価基準
+
+    Returns:
+        {出力項目: {人物: RuleIndexオブジェクト}}
+    """
+    return {
+        output_item: {
+            person: compile_rules(rules) for person, rules in person_rules.items()
+        }
+        for output_item, person_rules in master.items()
+    }
+
+
+def master_version(rows: List[List[Any]]) -> str:
+    """
+    評価基準マスタの内容から版を表すハッシュ値を求める
+
+    Args:
+        rows: 評価基準マスタ全体の値
+
+    Returns:
+        ハッシュ値（16進数の文字列）
+    """
+    payload = json.dumps(rows, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_compiled_masters = {}
+_compiled_masters_lock = threading.Lock()
+
+
+def get_compiled_master(rows: List[List[Any]]) -> Tuple[Dict, Dict]:
+    """
+    評価基準マスタを読み込み、索引に変換する
+    同じ内容のマスタは前回の結果を再利用する（版ごとに設定数まで保持）
+
+    Args:
+        rows: 評価基準マスタ全体の値（1行目はヘッダー）
+
+    Returns:
+        (load_master_dataの結果, compile_masterの結果)（呼び出し側で変更しないこと）
+    """
+    version = master_version(rows)
+    with _compiled_masters_lock:
+        compiled = _compiled_masters.pop(version, None)
+        if compiled is None:
+            master = load_master_data(rows)
+            compiled = (master, compile_master(master))
+            logging.info(f"評価基準マスタの索引を作成しました: 版={version[:12]}")
+        _compiled_masters[version] = compiled
+        # 古い版から削除する
+        while len(_compiled_masters) > config.SCORING_RULE_CACHE_SIZE:
+            del _compiled_masters[next(iter(_compiled_masters))]
+        return compiled
@@ -0,0 +1,198 @@
+import math
+import re
+from decimal import Decimal
+from typing import Any, List, Optional
+
+# GASの採点処理（gas/scoring.js）と同じ結果になるよう、
+# JavaScriptの型変換（Number(), String(), 真偽値判定）の規則をそのまま再現する
+
+# Number()が10進数として受け付ける文字列
+JS_DECIMAL_PATTERN = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+# Number()が受け付ける2・8・16進数の文字列
+JS_RADIX_PATTERN = re.compile(r"0([xXoObB])([0-9a-zA-Z]+)")
+RADIX_BASES = {"x": 16, "o": 8, "b": 2}
+# アクセス情報の徒歩分数（複数駅に対応するため、すべて取得して最小値を使う）
+WALKING_MINUTES_PATTERN = re.compile(r"歩([0-9]+)分")
+
+NAN = float("nan")
+
+# 値の組み合わせ方法（評価基準マスタのG列）
+COMBINATION_ADD = "add"  # 加算
+COMBINATION_MULTIPLY = "multiply"  # 乗算
+COMBINATION_AVERAGE = "average"  # 平均
+COMBINATION_MAX = "max"  # 最大値
+COMBINATION_MIN = "min"  # 最小値
+COMBINATION_CONCAT = "concat"  # 文字列結合
+
+
+def to_number(value: Any) -> float:
+    """
+    JavaScriptのNumber()と同じ規則で数値に変換する（空文字列は0、変換できない場合はNaN）
+
+    Args:
+        value: 変換する値（Noneはnullとして扱う）
+
+    Returns:
+        数値
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip()
+    if not text:
+        return 0.0
+    if JS_DECIMAL_PATTERN.fullmatch(text):
+        return float(text)
+    match = JS_RADIX_PATTERN.fullmatch(text)
+    if match:
+        try:
+            return float(int(match.group(2), RADIX_BASES[match.group(1).lower()]))
+        except ValueError:
+            return NAN
+    if text in ("Infinity", "+Infinity"):
+        return math.inf
+    if text == "-Infinity":
+        return -math.inf
+    return NAN
+
+
+def format_number(number: float) -> str:
+    """
+    JavaScriptの数値の文字列表現と同じ形式で数値を文字列にする
+
+    Args:
+        number: 数値
+
+    Returns:
+        文字列（例: 3.0→"3", 1e-05→"0.00001", NaN→"NaN"）
+    """
+    if math.isnan(number):
+        return "NaN"
+    if math.isinf(number):
+        return "Infinity" if number > 0 else "-Infinity"
+    if number.is_integer() and abs(number) < 1e21:
+        return str(int(number))
+
+    # 最短の表現はPythonと同じ。指数表記にする範囲だけが異なる
+    text = repr(number)
+    if "e" not in text:
+        return text
+    mantissa, exponent = text.split("e")
+    exponent = int(exponent)
+    if -7 < exponent < 21:
+        return format(Decimal(text), "f")
+    return f"{mantissa}e{'+' if exponent >= 0 else '-'}{abs(exponent)}"
+
+
+def to_string(value: Any) -> str:
+    """
+    JavaScriptのString()と同じ規則で文字列に変換する
+
+    Args:
+        value: 変換する値（Noneはnullとして扱う）
+
+    Returns:
+        文字列
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return format_number(float(value))
+    return str(value)
+
+
+def is_truthy(value: Any) -> bool:
+    """
+    JavaScriptの真偽値判定と同じ規則で判定する（空文字列・0・NaN・nullは偽）
+
+    Args:
+        value: 判定する値
+
+    Returns:
+        真と判定される場合はTrue
+    """
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+
+def is_nan(value: Any) -> bool:
+    """
+    NaNかどうかを判定する
+
+    Args:
+        value: 判定する値
+
+    Returns:
+        NaNの場合はTrue
+    """
+    return isinstance(value, float) and math.isnan(value)
+
+
+def extract_walking_minutes(access_text: Any) -> Optional[float]:
+    """
+    アクセス情報から徒歩分数を抽出する（複数駅の場合は最小値）
+
+    Args:
+        access_text: アクセス情報
+
+    Returns:
+        徒歩分数、見つからない場合はNone
+    """
+    if not is_truthy(access_text):
+        return None
+    minutes = WALKING_MINUTES_PATTERN.findall(to_string(access_text))
+    if not minutes:
+        return None
+    return min(float(minute) for minute in minutes)
+
+
+def combine_values(values: List[Any], combination_method: Optional[str] = None) -> Any:
+    """
+    複数の入力項目の値を組み合わせる
+
+    Args:
+        values: 値のリスト（値がない項目は含まない）
+        combination_method: 組み合わせ方法（Noneまたは不明な方法の場合は加算）
+
+    Returns:
+        組み合わせた値、値がない場合はNone
+    """
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+
+    method = combination_method or COMBINATION_ADD
+    numbers = [to_number(value) for value in values]
+
+    if method == COMBINATION_MULTIPLY:
+        product = 1.0
+        for number in numbers:
+            product *= 1.0 if math.isnan(number) else number
+        return product
+
+    if method in (COMBINATION_AVERAGE, COMBINATION_MAX, COMBINATION_MIN):
+        valid_numbers = [number for number in numbers if not math.isnan(number)]
+        if not valid_numbers:
+            return 0.0
+        if method == COMBINATION_AVERAGE:
+            return sum(valid_numbers) / len(valid_numbers)
+        if method == COMBINATION_MAX:
+            return max(valid_numbers)
+        return min(valid_numbers)
+
+    if method == COMBINATION_CONCAT:
+        return "".join(to_string(value) for value in values)
+
+    # 加算（既定）
+    total = 0.0
+    for number in numbers:
+        total += 0.0 if math.isnan(number) else number
+    return total
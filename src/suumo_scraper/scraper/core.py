@@ -1,58 +1,41 @@
 import requests
-from bs4 import BeautifulSoup
-import time
-import random
 import logging
 import os
 from datetime import datetime
-from urllib3.util import Retry
-from requests.adapters import HTTPAdapter
 from src.suumo_scraper import config
-from src.suumo_scraper.scraper.parser_factory import create_parser
-
-
-def create_session():
-    """
-    リトライ機能を持つセッションを作成する
-
-    Returns:
-        設定済みのrequestsセッション
-    """
-    session = requests.Session()
-
-    # リトライ設定
-    retry_strategy = Retry(
-        total=config.MAX_RETRIES,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"],
-    )
-
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-
-    # ヘッダー設定
-    session.headers.update(config.REQUEST_HEADERS)
-
-    return session
-
-
-def scrape_suumo_property_info(url):
+from src.suumo_scraper.scraper.parser_factory import create_parser, precheck_patterns
+from src.suumo_scraper.scraper.http_cache import get_http_cache
+from src.suumo_scraper.scraper.partial_parse import (
+    extract_regions,
+    is_partial_parse_available,
+)
+from src.suumo_scraper.scraper.fingerprint import (
+    compute_property_hash,
+    get_fingerprint_store,
+)
+from src.suumo_scraper.scraper.session import get_session_manager
+from src.suumo_scraper.scraper.soup import make_soup
+from src.suumo_scraper.utils.rate_limit import get_host_rate_limiter
+
+
+def scrape_suumo_property_info(url, revalidate=False):
     """
     SUUMOの物件ページから詳細情報を取得する関数
 
     Args:
         url: スクレイピング対象のURL
+        revalidate: Trueの場合、前回のETag/Last-Modifiedで条件付きGETを行い、
+            ページが更新されていなければ解析せずに"not_modified"を返す。
+            更新されていても、解析結果の内容ハッシュが前回書き込み時と同じなら
+            "content_unchanged"を付けて返す（書き込みを省略するかはシート側で判定する）
 
     Returns:
         物件情報を格納した辞書
     """
     try:
-        # ランダムな待機時間を設定
-        time.sleep(random.uniform(config.SCRAPING_WAIT_MIN, config.SCRAPING_WAIT_MAX))
-
         logging.debug(f"スクレイピング開始: {url}")
+        etag = None
+        last_modified = None
 
         # ファイルURLの場合はローカルファイルを読み込む
         if url.startswith("file://"):
@@ -64,23 +47,39 @@ def scrape_suumo_property_info(url):
             except Exception as e:
                 logging.error(f"ローカルファイルの読み込みに失敗: {e}")
                 raise
-
-            soup = BeautifulSoup(html_content, "html.parser")
         else:
-            # セッションを作成
-            session = create_session()
+            # ホストごとのリクエスト間隔を守るため、リクエスト枠を取得するまで待機
+            get_host_rate_limiter().acquire(url)
+
+            # 接続プールを使い回すため、プロセス共有のセッションを取得
+            session_manager = get_session_manager()
+            session = session_manager.get_session()
+
+            # デバッグ用にHTML全体を保存する場合は、部分解析を使わない
+            partial_parse = (
+                config.PARTIAL_PARSE_ENABLED
+                and not config.SAVE_DEBUG_HTML
+                and is_partial_parse_available()
+            )
+
+            # 前回取得時の検証子があれば条件付きGETにする
+            request_headers = {}
+            if revalidate and config.HTTP_CACHE_ENABLED:
+                request_headers = get_http_cache().conditional_headers(url)
 
             # 通常のURLの場合はリクエストを送信 - タイムアウト設定を分離して明示的に指定
             try:
                 # まずHTTPSで試行
                 r = session.get(
                     url,
+                    headers=request_headers,
                     timeout=(
                         10,
                         config.REQUEST_TIMEOUT,
                     ),  # (接続タイムアウト, 読み込みタイムアウト)
                     allow_redirects=True,
                     verify=True,  # SSL証明書の検証
+                    stream=partial_parse,
                 )
                 r.raise_for_status()
             except (
@@ -89,13 +88,19 @@ def scrape_suumo_property_info(url):
             ) as e:
                 # SSLエラーやHTTPS接続エラーが発生した場合、HTTPで再試行
                 logging.warning(f"HTTPS接続エラー、HTTPで再試行します: {e}")
+                session_manager.report_failure()
+                # 再試行も1回のリクエストとしてリクエスト枠を取得する
+                get_host_rate_limiter().acquire(url)
                 r = session.get(
                     url.replace("https://", "http://"),
+                    headers=request_headers,
                     timeout=(10, config.REQUEST_TIMEOUT),
                     allow_redirects=True,
                     verify=False,  # SSL証明書の検証を無効化
+                    stream=partial_parse,
                 )
                 r.raise_for_status()
+            session_manager.report_success()
 
             # HTTPステータスコードとURLをログに記録（リダイレクトの確認）
             if r.history:
@@ -106,31 +111,173 @@ def scrape_suumo_property_info(url):
                     f"リダイレクト経路: {redirect_chain} -> {r.status_code}: {r.url}"
                 )
 
-            # レスポンスの内容を取得し、デバッグのためにHTMLを保存
-            html_content = r.content
-            save_html_for_debug(url, html_content)
+            # 前回から更新されていない場合は解析もシート更新も不要
+            if r.status_code == 304:
+                logging.debug(f"ページの更新なし（304）: {url}")
+                # ストリーミング時は接続をプールに戻すため、すぐに閉じる
+                r.close()
+                return {
+                    "property_id": extract_property_id(url),
+                    "not_modified": True,
+                }
+
+            etag = r.headers.get("ETag")
+            last_modified = r.headers.get("Last-Modified")
+
+            if partial_parse:
+                # 受信しながら解析し、物件情報の領域が揃った時点で解析を打ち切る
+                try:
+                    html_content = extract_regions(
+                        r.iter_content(config.PARTIAL_PARSE_CHUNK_SIZE),
+                        response_encoding(r),
+                    )
+                finally:
+                    r.close()
+                if html_content is None:
+                    raise ValueError("既知のパターンが含まれないページです")
+            else:
+                # レスポンスの内容を取得し、デバッグのためにHTMLを保存
+                html_content = r.content
+                save_html_for_debug(url, html_content)
+
+        property_info = parse_property_html(html_content, url)
+
+        # 検証子と内容ハッシュはシートへの書き込みが成功してから保存する
+        # （commit_property_statesを参照）
+        if etag or last_modified:
+            property_info["http_validators"] = {
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+        content_hash = compute_property_hash(property_info)
+        property_info["content_hash"] = content_hash
+
+        # 条件付きGETに対応していないページでも、内容が同じかどうかを記録しておく
+        # シートのセルが消されたり編集されたりしている場合は書き戻す必要があるため、
+        # ここでは"not_modified"にせず、シートと比較できない場合だけ書き込みを省略する
+        if (
+            revalidate
+            and config.CHANGE_DETECTION_ENABLED
+            and get_fingerprint_store().is_unchanged(
+                property_info.get("property_id"), content_hash
+            )
+        ):
+            logging.debug(f"内容の変更なし: {url}")
+            property_info["content_unchanged"] = True
 
-            soup = BeautifulSoup(html_content, "html.parser")
+        return property_info
 
-        # パターン判定とパーサー作成
-        parser = create_parser(soup, url)
+    except Exception as e:
+        # エラーのレスポンスも、ストリーミング時は閉じるまで接続が解放されない
+        response = getattr(e, "response", None)
+        if response is not None:
+            response.close()
+        logging.error(f"物件情報の取得に失敗: {url}, エラー: {e}")
+        return build_error_property_info(url, e)
 
-        # 物件情報を解析
-        property_info = parser.parse()
 
-        # デバッグ出力
-        logging.debug(f"物件情報の解析完了: {property_info['property_id']}")
+def response_encoding(response):
+    """
+    Content-Typeヘッダーで明示された文字コードを取得する
 
-        return property_info
+    Args:
+        response: requestsのレスポンス
 
-    except Exception as e:
-        logging.error(f"物件情報の取得に失敗: {url}, エラー: {e}")
-        # 最小限の情報だけを含む辞書を返す
-        return {
-            "property_id": url.split("_")[-1].split("/")[0] if "_" in url else "",
-            "name": "",
-            "error": str(e),
-        }
+    Returns:
+        文字コード、明示されていない場合はNone（HTML内のmetaタグで判定する）
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" in content_type.lower():
+        return response.encoding
+    return None
+
+
+def parse_property_html(html_content, url):
+    """
+    取得済みのHTMLから物件情報を解析する
+
+    Args:
+        html_content: HTML内容（文字列またはバイト列）
+        url: スクレイピング対象のURL
+
+    Returns:
+        物件情報を格納した辞書
+
+    Raises:
+        ValueError: 既知のパターンが含まれないページの場合
+    """
+    # エラーページなど既知のパターンを含まないページは、DOMを構築せずに除外する
+    if not precheck_patterns(html_content):
+        raise ValueError("既知のパターンが含まれないページです")
+
+    soup = make_soup(html_content)
+
+    # パターン判定とパーサー作成
+    parser = create_parser(soup, url)
+
+    # 物件情報を解析
+    property_info = parser.parse()
+
+    # デバッグ出力
+    logging.debug(f"物件情報の解析完了: {property_info['property_id']}")
+
+    return property_info
+
+
+def build_error_property_info(url, error):
+    """
+    取得に失敗した場合に返す最小限の物件情報を作成する
+
+    Args:
+        url: スクレイピング対象のURL
+        error: 発生した例外
+
+    Returns:
+        最小限の情報だけを含む辞書
+    """
+    return {
+        "property_id": extract_property_id(url),
+        "name": "",
+        "error": str(error),
+    }
+
+
+def extract_property_id(url):
+    """
+    URLから物件IDを抽出する
+
+    Args:
+        url: 物件ページのURL
+
+    Returns:
+        物件ID（抽出できない場合は空文字列）
+    """
+    return url.split("_")[-1].split("/")[0] if "_" in url else ""
+
+
+def commit_property_states(properties):
+    """
+    シートへの書き込みが成功した物件について、次回の差分判定用の状態を保存する
+    書き込み前に保存すると、書き込みに失敗した物件が次回「更新なし」と判定されてしまう
+
+    Args:
+        properties: 書き込みが完了した物件情報のリスト
+    """
+    fingerprints = {}
+    for property_info in properties:
+        url = property_info.get("url")
+        validators = property_info.get("http_validators")
+        if url and validators and config.HTTP_CACHE_ENABLED:
+            get_http_cache().store(
+                url, validators.get("etag"), validators.get("last_modified")
+            )
+
+        property_id = property_info.get("property_id")
+        if property_id and property_info.get("content_hash"):
+            fingerprints[property_id] = property_info["content_hash"]
+
+    if fingerprints and config.CHANGE_DETECTION_ENABLED:
+        get_fingerprint_store().update_many(fingerprints)
 
 
 def save_html_for_debug(url, html_content):
@@ -1,12 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
 import logging
 import os
 import json
 from datetime import datetime
-import config
-from scraper.core import save_html_for_debug
-from scraper.parser_factory import create_parser, detect_pattern, patterns
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper.core import save_html_for_debug
+from src.suumo_scraper.scraper.parser_factory import create_parser, detect_pattern
+from src.suumo_scraper.scraper.pattern_parsers import load_patterns
+from src.suumo_scraper.scraper.session import get_session
+from src.suumo_scraper.scraper.soup import make_soup
 
 
 def debug_scrape_url(url: str, save_html: bool = True):
@@ -39,11 +40,11 @@ def debug_scrape_url(url: str, save_html: bool = True):
                 print(f"ローカルファイルの読み込みに失敗: {e}")
                 raise
         else:
-            # 通常のURLの場合
-            r = requests.get(
+            # 通常のURLの場合（スクレイピング本体と同じ共有セッションを使用）
+            r = get_session().get(
                 url,
-                timeout=config.REQUEST_TIMEOUT,
-                headers={"User-Agent": config.USER_AGENT},
+                timeout=(10, config.REQUEST_TIMEOUT),
+                allow_redirects=True,
             )
             r.raise_for_status()
             html_content = r.content
@@ -55,7 +56,7 @@ def debug_scrape_url(url: str, save_html: bool = True):
 
         # BeautifulSoupでパース
         print("HTMLを解析中...")
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = make_soup(html_content)
 
         # デバッグ情報の収集
         debug_info = {
@@ -70,6 +71,7 @@ def debug_scrape_url(url: str, save_html: bool = True):
         }
 
         # パターン判別
+        patterns = load_patterns()
         detected_patterns = detect_pattern(soup)
         debug_info["detected_patterns"] = detected_patterns
 
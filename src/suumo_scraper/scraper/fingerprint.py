@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from src.suumo_scraper import config
+
+# ハッシュ計算から除外するカラム（取得のたびに変わる値やシート側で管理する値）
+EXCLUDED_COLUMNS = {"number", "url", "update_time"}
+
+
+def column_schema_version():
+    """
+    物件情報シートの列構成（config.COLUMNS）から版を表すハッシュ値を求める
+    列を追加・移動した場合は、保存済みの検証子と内容ハッシュを使わずに取得し直す
+
+    Returns:
+        ハッシュ値（16進数の文字列）
+    """
+    payload = json.dumps(config.COLUMNS, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def compute_property_hash(property_info):
+    """
+    物件情報の内容ハッシュを計算する
+    取得日時など内容と関係なく変わる値は除外するため、ページの内容が同じなら同じ値になる
+    列構成の版も含めるため、列を追加・移動した後は前回と異なる値になる
+
+    Args:
+        property_info: 物件情報の辞書
+
+    Returns:
+        SHA-256ハッシュの16進文字列
+    """
+    fields = {
+        key: property_info.get(key, "")
+        for key in config.COLUMNS
+        if key not in EXCLUDED_COLUMNS
+    }
+    payload = json.dumps(
+        {"schema": column_schema_version(), "fields": fields},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FingerprintStore:
+    """
+    物件IDごとの内容ハッシュをローカルファイルに保存するストア
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: 保存先のJSONファイル（Noneの場合は設定値）
+        """
+        self.path = path or config.FINGERPRINT_FILE
+        self.fingerprints = None
+        self.lock = threading.Lock()
+
+    def _load_locked(self):
+        if self.fingerprints is not None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.fingerprints = json.load(f)
+        except FileNotFoundError:
+            self.fingerprints = {}
+        except Exception as e:
+            logging.warning(f"フィンガープリントの読み込みに失敗: {e}")
+            self.fingerprints = {}
+
+    def get(self, property_id):
+        """
+        保存済みのハッシュを取得する
+
+        Args:
+            property_id: 物件ID
+
+        Returns:
+            ハッシュ文字列、保存されていない場合はNone
+        """
+        with self.lock:
+            self._load_locked()
+            return self.fingerprints.get(property_id)
+
+    def is_unchanged(self, property_id, content_hash):
+        """
+        前回書き込み時から内容が変わっていないかを判定する
+
+        Args:
+            property_id: 物件ID
+            content_hash: 今回の内容ハッシュ
+
+        Returns:
+            変わっていなければTrue
+        """
+        return bool(property_id) and self.get(property_id) == content_hash
+
+    def update_many(self, fingerprints):
+        """
+        複数のハッシュを更新してファイルに保存する
+
+        Args:
+            fingerprints: {物件ID: ハッシュ} の辞書
+        """
+        if not fingerprints:
+            return
+
+        with self.lock:
+            self._load_locked()
+            self.fingerprints.update(fingerprints)
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # 書き込み途中で中断されても壊れないよう、一時ファイル経由で置き換える
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.fingerprints, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logging.warning(f"フィンガープリントの保存に失敗: {e}")
+
+
+_fingerprint_store = None
+_fingerprint_store_lock = threading.Lock()
+
+
+def get_fingerprint_store():
+    """
+    プロセス全体で共有するフィンガープリントストアを取得する
+
+    Returns:
+        FingerprintStoreオブジェクト
+    """
+    global _fingerprint_store
+    with _fingerprint_store_lock:
+        if _fingerprint_store is None:
+            _fingerprint_store = FingerprintStore()
+        return _fingerprint_store
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper.fingerprint import column_schema_version
+
+
+class ValidatorCache:
+    """
+    URLごとのETag/Last-Modifiedをディスクに保存するキャッシュ
+    条件付きGET（If-None-Match/If-Modified-Since）に使用する
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir: キャッシュの保存先ディレクトリ（Noneの場合は設定値）
+        """
+        self.cache_dir = cache_dir or config.HTTP_CACHE_DIR
+        self.lock = threading.Lock()
+
+    def _path(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url):
+        """
+        URLの検証子を取得する
+
+        Args:
+            url: 対象のURL
+
+        Returns:
+            {"etag": ..., "last_modified": ...} の辞書、
+            キャッシュがない（または保存後に列構成が変わった）場合はNone
+        """
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"HTTPキャッシュの読み込みに失敗: {url} - {e}")
+            return None
+
+        # URLのハッシュ衝突に備えてURLも確認する
+        if entry.get("url") != url:
+            return None
+        # 列構成が変わった後は、新しい列を書き込むため304にせず取得し直す
+        if entry.get("schema") != column_schema_version():
+            return None
+        return entry
+
+    def conditional_headers(self, url):
+        """
+        条件付きGET用のリクエストヘッダーを作成する
+
+        Args:
+            url: 対象のURL
+
+        Returns:
+            リクエストヘッダーの辞書（キャッシュがない場合は空）
+        """
+        entry = self.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, etag=None, last_modified=None):
+        """
+        URLの検証子を保存する
+
+        Args:
+            url: 対象のURL
+            etag: レスポンスのETagヘッダー
+            last_modified: レスポンスのLast-Modifiedヘッダー
+        """
+        if not etag and not last_modified:
+            self.invalidate(url)
+            return
+
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "schema": column_schema_version(),
+        }
+        path = self._path(url)
+        try:
+            with self.lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            # 書き込み途中のファイルを読まないよう、一時ファイル経由で置き換える
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.warning(f"HTTPキャッシュの保存に失敗: {url} - {e}")
+
+    def invalidate(self, url):
+        """
+        URLの検証子を削除する
+
+        Args:
+            url: 対象のURL
+        """
+        try:
+            os.remove(self._path(url))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"HTTPキャッシュの削除に失敗: {url} - {e}")
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """
+    プロセス全体で共有するHTTPキャッシュを取得する
+
+    Returns:
+        ValidatorCacheオブジェクト
+    """
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = ValidatorCache()
+        return _http_cache
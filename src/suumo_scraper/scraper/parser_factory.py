@@ -1,34 +1,85 @@
 import logging
-from bs4 import BeautifulSoup
-import json
-import os
+from functools import lru_cache
 from src.suumo_scraper.scraper.pattern_parsers import (
     BaseParser,
     FavoritePatternParser,
+    get_selector_plan,
     load_patterns,
 )
+from src.suumo_scraper.scraper.selector_plan import (
+    IDENTIFIER_KEY,
+    parse_simple_compound,
+    split_selector,
+)
+
+
+@lru_cache(maxsize=None)
+def identifier_tokens(identifier):
+    """
+    パターン識別子から、HTMLのバイト列に必ず含まれるID・クラス名を取り出す
+
+    Args:
+        identifier: パターン識別子のセレクタ
+
+    Returns:
+        バイト列のタプル、事前判定できないセレクタの場合はNone
+    """
+    _, compound = split_selector(identifier)[-1]
+    parsed = parse_simple_compound(compound)
+    if parsed is None:
+        return None
+    _, element_id, classes = parsed
+    names = ([element_id] if element_id else []) + sorted(classes)
+    if not names:
+        return None
+    return tuple(name.encode("utf-8") for name in names)
+
+
+def precheck_patterns(html_content):
+    """
+    DOMを構築する前に、HTMLのバイト列から含まれうるパターンを判定する
+    識別子のID・クラス名が含まれないパターンは確実に除外できる
+
+    Args:
+        html_content: HTML内容（文字列またはバイト列）
 
-# パターン定義の読み込み
-patterns = load_patterns()
+    Returns:
+        含まれうるパターン名のリスト
+    """
+    if isinstance(html_content, str):
+        html_content = html_content.encode("utf-8")
 
+    candidates = []
+    for pattern_name, pattern_config in load_patterns().items():
+        pattern_identifier = pattern_config.get("pattern_identifier")
+        if not pattern_identifier:
+            continue
+        tokens = identifier_tokens(pattern_identifier)
+        if tokens is None or all(token in html_content for token in tokens):
+            candidates.append(pattern_name)
+    return candidates
 
-def detect_pattern(soup):
+
+def detect_pattern(soup, extracted=None):
     """
     HTMLのパターンを判別する
 
     Args:
         soup: BeautifulSoupオブジェクト
+        extracted: 抽出プランの結果（Noneの場合はここで抽出する）
 
     Returns:
         検出されたパターン名のリスト、見つからなかった場合は空リスト
     """
     logging.debug("HTMLパターンの判別を開始")
 
+    if extracted is None:
+        extracted = get_selector_plan().extract(soup)
+
     detected_patterns = []
-    # 各パターンの識別子を確認
-    for pattern_name, pattern_config in patterns.items():
-        pattern_identifier = pattern_config.get("pattern_identifier")
-        if pattern_identifier and soup.select_one(pattern_identifier):
+    # 各パターンの識別子を確認（要素の抽出と同じ走査で判定済み）
+    for pattern_name, elements in extracted.items():
+        if elements.get(IDENTIFIER_KEY) is not None:
             logging.debug(f"パターン '{pattern_name}' を検出")
             detected_patterns.append(pattern_name)
 
@@ -49,19 +100,28 @@ def create_parser(soup, url):
     Returns:
         パーサーオブジェクト
     """
-    detected_patterns = detect_pattern(soup)
+    # パターン判別と要素の抽出を1回の走査で行い、結果をパーサーに引き継ぐ
+    extracted = get_selector_plan().extract(soup)
+    detected_patterns = detect_pattern(soup, extracted)
 
     if not detected_patterns:
         logging.warning(
             f"未知のパターンのため、お気に入りパターンで解析を試みます: {url}"
         )
-        return FavoritePatternParser(soup, url, "favorite_gallery")
-
+        pattern_name = "favorite_gallery"
     # 複数のパターンが検出された場合、favorite_galleryを優先
-    if "favorite_gallery" in detected_patterns:
-        return FavoritePatternParser(soup, url, "favorite_gallery")
+    elif "favorite_gallery" in detected_patterns:
+        pattern_name = "favorite_gallery"
     elif "favorite_contents" in detected_patterns:
-        return FavoritePatternParser(soup, url, "favorite_contents")
+        pattern_name = "favorite_contents"
     else:
         # その他のパターンが検出された場合（将来的な拡張用）
-        return FavoritePatternParser(soup, url, detected_patterns[0])
+        pattern_name = detected_patterns[0]
+
+    return FavoritePatternParser(
+        soup,
+        url,
+        pattern_name,
+        detected_patterns=detected_patterns,
+        extracted=extracted,
+    )
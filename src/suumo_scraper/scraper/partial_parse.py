@@ -0,0 +1,178 @@
+import logging
+from src.suumo_scraper.scraper.pattern_parsers import get_selector_plan
+from src.suumo_scraper.scraper.selector_plan import parse_simple_compound
+from src.suumo_scraper.scraper.soup import make_soup
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+def is_partial_parse_available():
+    """
+    部分解析（lxmlのストリーミング解析）が利用できるかを確認する
+
+    Returns:
+        利用可能であればTrue
+    """
+    return etree is not None and region_matchers() is not None
+
+
+def region_matchers():
+    """
+    抽出プランの先頭ステップから、解析対象とする領域の判定条件を作成する
+
+    Returns:
+        (タグ名, ID, クラス名の集合) のリスト
+        単純なセレクタで表せない先頭ステップがある場合はNone（ページ全体の解析が必要）
+    """
+    matchers = []
+    for compound in get_selector_plan().roots:
+        parsed = parse_simple_compound(compound)
+        if parsed is None:
+            return None
+        matchers.append(parsed)
+    return matchers
+
+
+def region_requirements():
+    """
+    先頭ステップごとに、ページの途中で解析をやめてよいかの判定に使うセレクタを求める
+
+    IDで指定された領域はページ内に1つしかないため、見つかった時点で確定する
+    singleのセレクタは文書順で最初の要素を使うため、取り出した領域の中で見つかれば
+    以降の領域は結果に影響しない。multipleのセレクタは、一致する要素を含む領域が
+    閉じた時点で確定したものとする（同じ要素が以降の別の領域にも現れるページでは、
+    その領域の要素は抽出されない）
+
+    Returns:
+        先頭ステップと同じ順序のリスト。各要素は見つかる必要があるセレクタ
+        （soupsieveのコンパイル済みセレクタ）のリスト
+    """
+    requirements = []
+    for compound, root in get_selector_plan().roots.items():
+        if parse_simple_compound(compound)[1] is not None:
+            requirements.append([root.path_matcher])
+            continue
+        paths = []
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children.values())
+            if node.targets:
+                paths.append(node.path_matcher)
+        # 領域自体が見つかったことも条件にする
+        paths.append(root.path_matcher)
+        requirements.append(paths)
+    return requirements
+
+
+def _match_region(element, matchers):
+    """
+    要素が解析対象の領域の先頭かを判定する
+
+    Returns:
+        一致したかどうか
+    """
+    if not isinstance(element.tag, str):
+        return False
+    for tag, element_id, classes in matchers:
+        if tag is not None and element.tag != tag:
+            continue
+        if element_id is not None and element.get("id") != element_id:
+            continue
+        if classes and not classes.issubset(element.get("class", "").split()):
+            continue
+        return True
+    return False
+
+
+def _update_requirements(fragment, state):
+    """
+    閉じた領域で見つかったセレクタを、残りの条件から取り除く
+
+    Args:
+        fragment: 閉じた領域のHTML断片
+        state: 解析中の状態（pending）
+    """
+    if not any(state["pending"]):
+        return
+    soup = make_soup(fragment)
+    state["pending"] = [
+        [path for path in paths if path.select_one(soup) is None]
+        for paths in state["pending"]
+    ]
+
+
+def _handle_events(parser, matchers, state):
+    """
+    パーサーのイベントを処理し、閉じた領域をHTML断片として保存する
+
+    Args:
+        parser: lxmlのHTMLPullParser
+        matchers: 領域の判定条件のリスト
+        state: 解析中の状態（region, fragments, pending）
+    """
+    for event, element in parser.read_events():
+        if event == "start":
+            if state["region"] is None and _match_region(element, matchers):
+                state["region"] = element
+            continue
+
+        if element is state["region"]:
+            fragment = etree.tostring(
+                element, encoding="unicode", method="html", with_tail=False
+            )
+            state["fragments"].append(fragment)
+            state["region"] = None
+            _update_requirements(fragment, state)
+        elif state["region"] is not None:
+            continue
+
+        # 領域外の要素は不要なので、ツリーから外してメモリを解放する
+        element.clear()
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+
+
+def extract_regions(chunks, encoding=None):
+    """
+    HTMLを少しずつ解析し、抽出対象の領域だけをHTML断片として取り出す
+    抽出に必要な要素がすべて見つかった時点（multipleのセレクタは、一致する要素を含む
+    領域が閉じた時点）で解析をやめ、残りの受信データは読み捨てる
+
+    Args:
+        chunks: HTMLのバイト列を順に返すイテラブル（レスポンスのiter_contentなど）
+        encoding: 文字コード（Noneの場合はlxmlが判定する）
+
+    Returns:
+        領域を文書順に連結したHTML文字列、領域が1つも見つからなかった場合はNone
+    """
+    matchers = region_matchers()
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+    state = {
+        "region": None,
+        "fragments": [],
+        "pending": region_requirements(),
+    }
+
+    chunks = iter(chunks)
+    for chunk in chunks:
+        parser.feed(chunk)
+        _handle_events(parser, matchers, state)
+        if state["region"] is None and not any(state["pending"]):
+            # 接続をプールに戻せるよう、残りは解析せずに読み捨てる
+            for _ in chunks:
+                pass
+            break
+    else:
+        parser.close()
+        _handle_events(parser, matchers, state)
+
+    fragments = state["fragments"]
+    if not fragments:
+        return None
+    logging.debug(f"部分解析: {len(fragments)}個の領域を抽出")
+    return "<html><body>" + "".join(fragments) + "</body></html>"
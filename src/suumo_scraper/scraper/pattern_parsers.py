@@ -1,26 +1,42 @@
-import json
-import os
 import logging
 from bs4 import BeautifulSoup
 from datetime import datetime
+from src.suumo_scraper.scraper.pattern_registry import get_pattern_registry
+from src.suumo_scraper.scraper.selector_plan import IDENTIFIER_KEY
 from src.suumo_scraper.utils.text_processor import (
     extract_number_from_text,
     process_currency,
     process_age,
     process_area,
     clean_text,
+    parse_yen,
+    parse_area,
+    parse_walk_minutes,
+    parse_walk_minutes_by_line,
+    parse_floor,
+    parse_built_year,
 )
 
 
-# パターン定義の読み込み
 def load_patterns():
     """
     patterns.jsonからパターン定義を読み込む
+    プロセス内でキャッシュされるため、ファイルの読み込みは初回と変更時のみ行う
+
+    Returns:
+        パターン定義の辞書（呼び出し側で変更しないこと）
+    """
+    return get_pattern_registry().get()
+
+
+def get_selector_plan():
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    patterns_file = os.path.join(current_dir, "patterns.json")
-    with open(patterns_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    パターン定義のセレクタをコンパイルした抽出プランを取得する
+
+    Returns:
+        SelectorPlanオブジェクト
+    """
+    return get_pattern_registry().get_selector_plan()
 
 
 class BaseParser:
@@ -28,7 +44,7 @@ class BaseParser:
     パーサーの基底クラス
     """
 
-    def __init__(self, pattern_name, soup, url):
+    def __init__(self, pattern_name, soup, url, extracted=None):
         """
         パーサーの初期化
 
@@ -36,11 +52,13 @@ class BaseParser:
             pattern_name: パターン名
             soup: BeautifulSoupオブジェクト
             url: スクレイピング対象のURL
+            extracted: 抽出プランの結果（Noneの場合は必要になった時点で抽出する）
         """
         self.pattern_name = pattern_name
         self.soup = soup
         self.url = url
-        self.patterns = load_patterns()
+        # 解析中に再読み込みされても食い違わないよう、定義とプランを組で取得する
+        self.patterns, self.selector_plan = get_pattern_registry().current()
 
         # パターン定義の読み込み
         if pattern_name not in self.patterns:
@@ -50,6 +68,18 @@ class BaseParser:
         self.selectors = self.config.get("selectors", {})
         self.selector_types = self.config.get("selector_types", {})
         self.processor_rules = self.config.get("processor_rules", {})
+        self.extracted = extracted
+
+    def extract_elements(self):
+        """
+        抽出プランで全パターンの要素をまとめて取得する（ページごとに1回だけ実行）
+
+        Returns:
+            {パターン名: {キー: 要素または要素のリスト}} の辞書
+        """
+        if self.extracted is None:
+            self.extracted = self.selector_plan.extract(self.soup)
+        return self.extracted
 
     def get_element(self, key, silent=False):
         """
@@ -67,13 +97,7 @@ class BaseParser:
                 logging.warning(f"セレクタが定義されていません: {key}")
             return None
 
-        selector = self.selectors[key]
-        selector_type = self.selector_types.get(key, "single")
-
-        if selector_type == "multiple":
-            return self.soup.select(selector)
-        else:
-            return self.soup.select_one(selector)
+        return self.extract_elements()[self.pattern_name].get(key)
 
     def get_text(self, key, silent=False):
         """
@@ -144,20 +168,40 @@ class FavoritePatternParser(BaseParser):
     お気に入りパターン用のパーサー
     """
 
-    def __init__(self, soup, url, pattern_name="favorite_gallery"):
-        super().__init__(pattern_name, soup, url)
+    def __init__(
+        self,
+        soup,
+        url,
+        pattern_name="favorite_gallery",
+        detected_patterns=None,
+        extracted=None,
+    ):
+        """
+        Args:
+            soup: BeautifulSoupオブジェクト
+            url: スクレイピング対象のURL
+            pattern_name: 主に使用するパターン名
+            detected_patterns: 検出済みのパターン名のリスト（Noneの場合はここで判別する）
+            extracted: 抽出プランの結果（Noneの場合は必要になった時点で抽出する）
+        """
+        super().__init__(pattern_name, soup, url, extracted)
         self.soup = soup
         self.url = url
+
+        if detected_patterns is None:
+            extracted = self.extract_elements()
+            detected_patterns = [
+                name
+                for name, elements in extracted.items()
+                if elements.get(IDENTIFIER_KEY) is not None
+            ]
+
         # 追加のパターンを読み込む
-        self.additional_patterns = {}
-        for pattern_name, pattern_config in self.patterns.items():
-            if (
-                pattern_name != self.pattern_name
-                and "pattern_identifier" in pattern_config
-            ):
-                identifier = pattern_config["pattern_identifier"]
-                if soup.select_one(identifier):
-                    self.additional_patterns[pattern_name] = pattern_config
+        self.additional_patterns = {
+            name: self.patterns[name]
+            for name in detected_patterns
+            if name != self.pattern_name and name in self.patterns
+        }
 
     def get_from_any_pattern(self, key):
         """
@@ -175,20 +219,19 @@ class FavoritePatternParser(BaseParser):
             return value
 
         # 追加のパターンから検索
+        extracted = self.extract_elements()
         for pattern_name, pattern_config in self.additional_patterns.items():
             selectors = pattern_config.get("selectors", {})
             if key in selectors:
-                selector = selectors[key]
                 selector_type = pattern_config.get("selector_types", {}).get(
                     key, "single"
                 )
+                element = extracted[pattern_name].get(key)
 
                 if selector_type == "multiple":
-                    elements = self.soup.select(selector)
-                    if elements:
-                        return [clean_text(el.text) for el in elements]
+                    if element:
+                        return [clean_text(el.text) for el in element]
                 else:
-                    element = self.soup.select_one(selector)
                     if element:
                         return clean_text(element.text)
 
@@ -272,4 +315,47 @@ class FavoritePatternParser(BaseParser):
             if isinstance(value, list):
                 result[key] = " / ".join(value)
 
+        result.update(self.parse_typed_fields(result))
         return result
+
+    def parse_typed_fields(self, result):
+        """
+        絞り込みや採点で使う数値の項目を、加工前の表記から求める
+
+        Args:
+            result: parseで作成した物件情報の辞書
+
+        Returns:
+            数値の項目の辞書（求められない値は空文字列）
+        """
+        raw = {}
+        for key in ("rent", "management_fee", "deposit", "key_money", "area", "age"):
+            value = self.get_from_any_pattern(key)
+            raw[key] = " / ".join(value) if isinstance(value, list) else value
+
+        # アクセスは駅ごとの行のリスト（単一のセレクタの場合は文字列）
+        access_lines = self.get_from_any_pattern("access") or []
+        if isinstance(access_lines, str):
+            access_lines = [access_lines]
+        walk_minutes = parse_walk_minutes_by_line(access_lines)
+
+        floor_number, total_floors = parse_floor(result["floor"])
+        typed = {
+            "rent_yen": parse_yen(raw["rent"]),
+            "management_fee_yen": parse_yen(raw["management_fee"]),
+            "deposit_yen": parse_yen(raw["deposit"]),
+            "key_money_yen": parse_yen(raw["key_money"]),
+            "area_m2": parse_area(raw["area"]),
+            "walk_minutes": parse_walk_minutes(result["access"]),
+            # アクセスの行と同じ順序で「3 / 7 / -」のように並べる（徒歩の表記がない行は-）
+            "walk_minutes_by_station": (
+                " / ".join("-" if m is None else str(m) for m in walk_minutes)
+                if walk_minutes
+                else None
+            ),
+            "floor_number": floor_number,
+            "total_floors": total_floors,
+            "built_year": parse_built_year(raw["age"]),
+        }
+        # シートの他の項目と同じく、値がない場合は空文字列とする
+        return {key: "" if value is None else value for key, value in typed.items()}
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import threading
+import time
+import soupsieve as sv
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper.selector_plan import SelectorPlan
+
+# patterns.jsonのデフォルトの場所
+DEFAULT_PATTERNS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "patterns.json"
+)
+
+# patterns.jsonで使用できる値
+SELECTOR_TYPES = {"single", "multiple"}
+PROCESSOR_RULES = {"currency", "number", "age"}
+
+
+def validate_patterns(patterns):
+    """
+    パターン定義の内容を検証する
+
+    Args:
+        patterns: パターン定義の辞書
+
+    Raises:
+        ValueError: 定義に誤りがある場合
+    """
+    if not isinstance(patterns, dict) or not patterns:
+        raise ValueError("パターン定義が空か、オブジェクト形式ではありません")
+
+    errors = []
+    for pattern_name, pattern_config in patterns.items():
+        if not isinstance(pattern_config, dict):
+            errors.append(f"{pattern_name}: オブジェクト形式ではありません")
+            continue
+
+        identifier = pattern_config.get("pattern_identifier")
+        selectors = dict(pattern_config.get("selectors", {}))
+        if identifier is not None:
+            selectors["pattern_identifier"] = identifier
+        for key, selector in selectors.items():
+            if not isinstance(selector, str) or not selector.strip():
+                errors.append(f"{pattern_name}.{key}: セレクタが空です")
+                continue
+            try:
+                sv.compile(selector)
+            except Exception as e:
+                errors.append(f"{pattern_name}.{key}: セレクタが不正です ({e})")
+
+        for key, selector_type in pattern_config.get("selector_types", {}).items():
+            if selector_type not in SELECTOR_TYPES:
+                errors.append(
+                    f"{pattern_name}.{key}: 未知のセレクタ種別です ({selector_type})"
+                )
+
+        for key, rule in pattern_config.get("processor_rules", {}).items():
+            if rule not in PROCESSOR_RULES:
+                errors.append(f"{pattern_name}.{key}: 未知の処理ルールです ({rule})")
+
+    if errors:
+        raise ValueError("パターン定義に誤りがあります: " + "; ".join(errors))
+
+
+class PatternRegistry:
+    """
+    patterns.jsonをプロセス内でキャッシュするレジストリ
+    ファイルの更新日時を一定間隔で確認し、変更されていれば読み込み直す
+    """
+
+    def __init__(self, path=None, reload_interval=None):
+        """
+        Args:
+            path: patterns.jsonのパス（Noneの場合はパッケージ内のファイル）
+            reload_interval: 更新日時を確認する間隔（秒、Noneの場合は設定値）
+        """
+        self.path = path or DEFAULT_PATTERNS_FILE
+        self.reload_interval = (
+            reload_interval
+            if reload_interval is not None
+            else config.PATTERNS_RELOAD_INTERVAL
+        )
+        self.patterns = None
+        self.selector_plan = None
+        self.mtime = None
+        self.checked_at = 0.0
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _load_locked(self, mtime):
+        with open(self.path, "r", encoding="utf-8") as f:
+            patterns = json.load(f)
+        validate_patterns(patterns)
+
+        self.patterns = patterns
+        self.selector_plan = SelectorPlan(patterns)
+        self.mtime = mtime
+        self.version += 1
+        logging.debug(f"パターン定義を読み込みました: {self.path}")
+
+    def _refresh_locked(self):
+        now = time.monotonic()
+        if self.patterns is not None and now - self.checked_at < self.reload_interval:
+            return
+        self.checked_at = now
+
+        mtime = os.path.getmtime(self.path)
+        if self.patterns is None:
+            # 初回の読み込みに失敗した場合は例外をそのまま送出する
+            self._load_locked(mtime)
+        elif mtime != self.mtime:
+            try:
+                self._load_locked(mtime)
+                logging.info("パターン定義の変更を検出し、再読み込みしました")
+            except Exception as e:
+                # 編集途中などで不正な場合は、前回の定義を使い続ける
+                logging.error(
+                    f"パターン定義の再読み込みに失敗、前回の定義を使用します: {e}"
+                )
+                self.mtime = mtime
+
+    def get(self):
+        """
+        パターン定義を取得する
+
+        Returns:
+            パターン定義の辞書（呼び出し側で変更しないこと）
+        """
+        with self.lock:
+            self._refresh_locked()
+            return self.patterns
+
+    def current(self):
+        """
+        パターン定義と抽出プランを同じバージョンの組で取得する
+
+        Returns:
+            (パターン定義の辞書, SelectorPlanオブジェクト)
+        """
+        with self.lock:
+            self._refresh_locked()
+            return self.patterns, self.selector_plan
+
+    def get_selector_plan(self):
+        """
+        現在のパターン定義に対応する抽出プランを取得する
+
+        Returns:
+            SelectorPlanオブジェクト
+        """
+        with self.lock:
+            self._refresh_locked()
+            return self.selector_plan
+
+
+_pattern_registry = None
+_pattern_registry_lock = threading.Lock()
+
+
+def get_pattern_registry():
+    """
+    プロセス全体で共有するパターンレジストリを取得する
+
+    Returns:
+        PatternRegistryオブジェクト
+    """
+    global _pattern_registry
+    with _pattern_registry_lock:
+        if _pattern_registry is None:
+            _pattern_registry = PatternRegistry()
+        return _pattern_registry
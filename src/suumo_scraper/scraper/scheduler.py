@@ -0,0 +1,57 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper.core import scrape_suumo_property_info
+
+
+def scrape_many(urls, max_workers=None, scrape_func=None, **scrape_kwargs):
+    """
+    複数のURLを並行してスクレイピングし、完了した順に結果を返すジェネレータ
+    サーバー負荷の制御はscrape_suumo_property_info内のホスト別レート制限で行うため、
+    ワーカー数を増やしてもリクエスト間隔は設定値を超えない
+
+    Args:
+        urls: スクレイピング対象のURLリスト
+        max_workers: 同時に処理するワーカー数（Noneの場合は設定値）
+        scrape_func: 1件のURLを処理する関数（テスト用に差し替え可能）
+        **scrape_kwargs: scrape_funcに渡す追加の引数
+
+    Yields:
+        (入力リスト内のインデックス, URL, 物件情報の辞書) のタプル
+    """
+    if max_workers is None:
+        max_workers = config.SCRAPING_MAX_WORKERS
+    if scrape_func is None:
+        scrape_func = scrape_suumo_property_info
+
+    urls = list(urls)
+    if not urls:
+        return
+
+    max_workers = max(1, min(max_workers, len(urls)))
+    # 処理中のタスク数を制限して、結果がメモリに溜まり続けないようにする
+    max_in_flight = max_workers * 2
+    logging.debug(f"並行スクレイピング開始: {len(urls)}件, ワーカー数={max_workers}")
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="scraper"
+    ) as executor:
+        pending = {}
+        next_index = 0
+
+        while next_index < len(urls) or pending:
+            while next_index < len(urls) and len(pending) < max_in_flight:
+                url = urls[next_index]
+                future = executor.submit(scrape_func, url, **scrape_kwargs)
+                pending[future] = (next_index, url)
+                next_index += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, url = pending.pop(future)
+                try:
+                    property_info = future.result()
+                except Exception as e:
+                    logging.error(f"スクレイピングエラー: {url} - {e}")
+                    property_info = {"error": str(e)}
+                yield index, url, property_info
@@ -0,0 +1,237 @@
+import re
+import soupsieve as sv
+from bs4 import Tag
+
+# パターン識別子の抽出結果を格納するキー
+IDENTIFIER_KEY = "pattern_identifier"
+
+# 共通の祖先として共有できる結合子（子・子孫）
+SHARED_COMBINATORS = {">", " "}
+
+# タグ名・ID・クラスだけで構成される単純なセレクタ（例: "table.data_table", "#js-view_gallery"）
+SIMPLE_COMPOUND_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[#.][\w-]+)*)$"
+)
+
+
+def parse_simple_compound(compound):
+    """
+    単純なセレクタをタグ名・ID・クラスに分解する
+
+    Args:
+        compound: 複合セレクタ
+
+    Returns:
+        (タグ名, ID, クラス名の集合)、単純なセレクタでない場合はNone
+    """
+    m = SIMPLE_COMPOUND_PATTERN.match(compound)
+    if not m or not compound:
+        return None
+
+    parts = re.findall(r"([#.])([\w-]+)", m.group("rest"))
+    ids = [name for kind, name in parts if kind == "#"]
+    if len(ids) > 1:
+        return None
+    classes = {name for kind, name in parts if kind == "."}
+    return m.group("tag"), (ids[0] if ids else None), classes
+
+
+def compile_simple_compound(compound):
+    """
+    単純なセレクタを、soupsieveを使わない高速な判定関数に変換する
+
+    Args:
+        compound: 複合セレクタ
+
+    Returns:
+        要素を受け取ってbool値を返す関数、単純なセレクタでない場合はNone
+    """
+    parsed = parse_simple_compound(compound)
+    if parsed is None:
+        return None
+    tag, element_id, classes = parsed
+
+    def match(element):
+        if tag is not None and element.name != tag:
+            return False
+        if element_id is not None and element.get("id") != element_id:
+            return False
+        if classes and not classes.issubset(element.get("class") or ()):
+            return False
+        return True
+
+    return match
+
+
+def split_selector(selector):
+    """
+    CSSセレクタを結合子ごとのステップに分割する
+
+    例: "#a > div li" → [(None, "#a"), (">", "div"), (" ", "li")]
+
+    Args:
+        selector: CSSセレクタ
+
+    Returns:
+        (結合子, 複合セレクタ) のリスト。分割できないセレクタの場合は
+        [(None, セレクタ全体)] を返す
+    """
+    selector = selector.strip()
+    # 引用符やカンマを含むセレクタは分割せずそのまま扱う
+    if any(ch in selector for ch in "\"',"):
+        return [(None, selector)]
+
+    steps = []
+    buffer = []
+    depth = 0
+    combinator = None
+    for ch in selector:
+        if depth == 0 and ch in " >+~":
+            if buffer:
+                steps.append((combinator, "".join(buffer)))
+                buffer = []
+                combinator = " "
+            if ch != " ":
+                combinator = ch
+            continue
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        buffer.append(ch)
+    if buffer:
+        steps.append((combinator, "".join(buffer)))
+
+    # 兄弟結合子は祖先を共有できないため分割しない
+    if any(step[0] is not None and step[0] not in SHARED_COMBINATORS for step in steps):
+        return [(None, selector)]
+    return steps
+
+
+class PlanNode:
+    """
+    抽出プランのノード（セレクタの共通部分を共有するトライ木）
+    """
+
+    def __init__(self, combinator, compound, path):
+        self.combinator = combinator
+        self.compound = compound
+        self.path = path  # ルートからこのノードまでのセレクタ全体
+        self.children = {}
+        self.targets = []  # このノードで確定する (パターン名, キー, セレクタ種別)
+
+        # 候補要素（ルートは全要素、それ以外は親要素の子・子孫）を1つずつ判定する
+        self.match = compile_simple_compound(compound) or sv.compile(compound).match
+        self.path_matcher = sv.compile(path)
+
+    def child(self, combinator, compound):
+        key = (combinator, compound)
+        if key not in self.children:
+            self.children[key] = PlanNode(
+                combinator, compound, f"{self.path} {combinator} {compound}"
+            )
+        return self.children[key]
+
+
+class SelectorPlan:
+    """
+    patterns.jsonのセレクタを一度だけコンパイルした抽出プラン
+    共通の祖先を持つセレクタはトライ木で共有し、ページ全体の走査は1回で済ませる
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: パターン定義の辞書（patterns.jsonの内容）
+        """
+        self.roots = {}
+        self.pattern_keys = {}
+        for pattern_name, pattern_config in patterns.items():
+            selectors = pattern_config.get("selectors", {})
+            selector_types = pattern_config.get("selector_types", {})
+            self.pattern_keys[pattern_name] = list(selectors)
+            for key, selector in selectors.items():
+                selector_type = selector_types.get(key, "single")
+                self._add(selector, (pattern_name, key, selector_type))
+
+            # パターンの判別も同じ走査で行う
+            identifier = pattern_config.get("pattern_identifier")
+            if identifier:
+                self._add(identifier, (pattern_name, IDENTIFIER_KEY, "single"))
+
+    def _add(self, selector, target):
+        steps = split_selector(selector)
+        first_combinator, first_compound = steps[0]
+        if first_compound not in self.roots:
+            self.roots[first_compound] = PlanNode(None, first_compound, first_compound)
+        node = self.roots[first_compound]
+        for combinator, compound in steps[1:]:
+            node = node.child(combinator, compound)
+        node.targets.append(target)
+
+    def extract(self, soup):
+        """
+        ページからすべてのパターン・キーの要素を抽出する
+
+        Args:
+            soup: BeautifulSoupオブジェクト
+
+        Returns:
+            {パターン名: {キー: 要素（single）または要素のリスト（multiple）}} の辞書
+            singleで見つからなかった場合の値はNone
+            パターン識別子に一致した要素はIDENTIFIER_KEYに格納される
+        """
+        results = {name: {} for name in self.pattern_keys}
+
+        # 各セレクタの先頭ステップに一致する要素を1回の走査でまとめて探す
+        root_matches = {compound: [] for compound in self.roots}
+        root_nodes = list(self.roots.items())
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for compound, node in root_nodes:
+                if node.match(element):
+                    root_matches[compound].append(element)
+
+        for compound, node in root_nodes:
+            matches = root_matches[compound]
+            self._walk(soup, node, matches, len(matches) <= 1, results)
+        return results
+
+    def _walk(self, soup, node, matches, disjoint, results):
+        """
+        トライ木をたどって各ノードの要素を求める
+
+        Args:
+            soup: BeautifulSoupオブジェクト
+            node: 現在のノード
+            matches: 現在のノードに一致した要素のリスト（文書順）
+            disjoint: matches同士が入れ子になっていないことが保証されている場合True
+            results: 抽出結果を格納する辞書
+        """
+        for pattern_name, key, selector_type in node.targets:
+            if selector_type == "multiple":
+                results[pattern_name][key] = matches
+            else:
+                results[pattern_name][key] = matches[0] if matches else None
+
+        for child in node.children.values():
+            if disjoint or len(matches) <= 1:
+                # 入れ子でない要素から順に検索すれば、結果は文書順・重複なしになる
+                child_matches = []
+                for element in matches:
+                    if child.combinator == ">":
+                        candidates = element.children
+                    else:
+                        candidates = element.descendants
+                    child_matches.extend(
+                        candidate
+                        for candidate in candidates
+                        if isinstance(candidate, Tag) and child.match(candidate)
+                    )
+                child_disjoint = child.combinator == ">" or len(child_matches) <= 1
+            else:
+                # 入れ子の要素がある場合は順序や重複が崩れるため、全体から検索する
+                child_matches = child.path_matcher.select(soup)
+                child_disjoint = len(child_matches) <= 1
+            self._walk(soup, child, child_matches, child_disjoint, results)
@@ -0,0 +1,183 @@
+import requests
+import threading
+import time
+import logging
+from urllib3.util import Retry
+from requests.adapters import HTTPAdapter
+from src.suumo_scraper import config
+from src.suumo_scraper.utils.rate_limit import get_host_rate_limiter
+
+
+class RateLimitedRetry(Retry):
+    """
+    再試行の前にもホストごとのリクエスト枠を取得するRetry
+    再試行もリクエストとして数え、失敗が続くホストにも設定した間隔を超えて送らないようにする
+    """
+
+    # 再試行するリクエストの送信先（incrementで接続プールから設定する）
+    rate_limit_url = None
+
+    def increment(self, *args, **kwargs):
+        new_retry = super().increment(*args, **kwargs)
+        pool = kwargs.get("_pool")
+        if pool is not None:
+            host = pool.host
+            if pool.port and pool.port not in (80, 443):
+                host = f"{host}:{pool.port}"
+            new_retry.rate_limit_url = f"{pool.scheme}://{host}/"
+        return new_retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limit_url:
+            get_host_rate_limiter().acquire(self.rate_limit_url)
+
+
+def create_session(pool_size=None):
+    """
+    リトライ機能を持つセッションを作成する
+
+    Args:
+        pool_size: ホストごとに保持する接続数（Noneの場合は設定値）
+
+    Returns:
+        設定済みのrequestsセッション
+    """
+    if pool_size is None:
+        pool_size = config.HTTP_POOL_SIZE
+
+    session = requests.Session()
+
+    # リトライ設定（再試行もホストごとのレート制限の対象にする）
+    retry_strategy = RateLimitedRetry(
+        total=config.MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # ヘッダー設定
+    session.headers.update(config.REQUEST_HEADERS)
+
+    return session
+
+
+class SessionManager:
+    """
+    プロセス全体で共有するHTTPセッションの管理クラス
+    接続プールとTLSセッションを使い回し、一定時間使われなかった場合や
+    接続エラーが続いた場合はセッションを作り直す
+    """
+
+    def __init__(self, pool_size=None, idle_timeout=None, max_failures=None):
+        """
+        Args:
+            pool_size: ホストごとに保持する接続数
+            idle_timeout: この秒数以上使われなかったセッションは破棄する
+            max_failures: 連続した接続エラーがこの回数に達したらセッションを作り直す
+        """
+        self.pool_size = pool_size or config.HTTP_POOL_SIZE
+        self.idle_timeout = (
+            idle_timeout
+            if idle_timeout is not None
+            else config.HTTP_SESSION_IDLE_TIMEOUT
+        )
+        self.max_failures = max_failures or config.HTTP_SESSION_MAX_FAILURES
+        self.session = None
+        self.last_used = 0.0
+        self.failure_count = 0
+        self.lock = threading.Lock()
+
+    def _close_locked(self, reason):
+        if self.session is not None:
+            logging.debug(f"HTTPセッションを破棄: {reason}")
+            self.session.close()
+            self.session = None
+        self.failure_count = 0
+
+    def get_session(self):
+        """
+        共有セッションを取得する（必要に応じて作成・再作成する）
+
+        Returns:
+            requestsセッション
+        """
+        with self.lock:
+            now = time.monotonic()
+            if (
+                self.session is not None
+                and self.idle_timeout > 0
+                and now - self.last_used > self.idle_timeout
+            ):
+                self._close_locked("アイドルタイムアウト")
+            if self.session is None:
+                self.session = create_session(self.pool_size)
+                logging.debug(f"HTTPセッションを作成: プールサイズ={self.pool_size}")
+            self.last_used = now
+            return self.session
+
+    def report_success(self):
+        """リクエスト成功を記録する"""
+        with self.lock:
+            self.failure_count = 0
+
+    def report_failure(self):
+        """接続エラーを記録し、続いている場合はセッションを作り直す"""
+        with self.lock:
+            self.failure_count += 1
+            if self.failure_count >= self.max_failures:
+                logging.warning(
+                    f"接続エラーが{self.failure_count}回続いたためHTTPセッションを再作成します"
+                )
+                self._close_locked("ヘルスチェック失敗")
+
+    def evict_if_idle(self):
+        """アイドルタイムアウトを過ぎたセッションを破棄する"""
+        with self.lock:
+            if (
+                self.session is not None
+                and self.idle_timeout > 0
+                and time.monotonic() - self.last_used > self.idle_timeout
+            ):
+                self._close_locked("アイドルタイムアウト")
+
+    def close(self):
+        """セッションを閉じる"""
+        with self.lock:
+            self._close_locked("クローズ")
+
+
+_session_manager = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """
+    プロセス全体で共有するセッションマネージャーを取得する
+
+    Returns:
+        SessionManagerオブジェクト
+    """
+    global _session_manager
+    with _session_manager_lock:
+        if _session_manager is None:
+            _session_manager = SessionManager()
+        return _session_manager
+
+
+def get_session():
+    """
+    共有HTTPセッションを取得する
+
+    Returns:
+        requestsセッション
+    """
+    return get_session_manager().get_session()
@@ -0,0 +1,70 @@
+import logging
+import threading
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+from src.suumo_scraper import config
+
+# 利用可能なパーサーバックエンド（速い順）
+PARSER_BACKENDS = ["lxml", "html5lib", "html.parser"]
+
+# 標準ライブラリのみで動作するため常に利用できるバックエンド
+FALLBACK_BACKEND = "html.parser"
+
+_resolved_backends = {}
+_resolved_backends_lock = threading.Lock()
+
+
+def is_backend_available(backend):
+    """
+    パーサーバックエンドがインストールされているかを確認する
+
+    Args:
+        backend: バックエンド名（"lxml", "html5lib", "html.parser"）
+
+    Returns:
+        利用可能であればTrue
+    """
+    return builder_registry.lookup(backend) is not None
+
+
+def resolve_parser_backend(backend=None):
+    """
+    使用するパーサーバックエンドを決定する
+    指定されたバックエンドが利用できない場合はhtml.parserにフォールバックする
+
+    Args:
+        backend: 希望するバックエンド名（Noneの場合は設定値）
+
+    Returns:
+        実際に使用するバックエンド名
+    """
+    if backend is None:
+        backend = config.HTML_PARSER
+
+    with _resolved_backends_lock:
+        if backend not in _resolved_backends:
+            if backend not in PARSER_BACKENDS:
+                raise ValueError(f"未対応のパーサーバックエンド: {backend}")
+            resolved = backend
+            if not is_backend_available(backend):
+                logging.warning(
+                    f"パーサーバックエンド '{backend}' が利用できないため "
+                    f"'{FALLBACK_BACKEND}' を使用します"
+                )
+                resolved = FALLBACK_BACKEND
+            _resolved_backends[backend] = resolved
+        return _resolved_backends[backend]
+
+
+def make_soup(html_content, backend=None):
+    """
+    設定されたバックエンドでHTMLを解析する
+
+    Args:
+        html_content: HTML内容（文字列またはバイト列）
+        backend: 使用するバックエンド名（Noneの場合は設定値）
+
+    Returns:
+        BeautifulSoupオブジェクト
+    """
+    return BeautifulSoup(html_content, resolve_parser_backend(backend))
@@ -3,6 +3,9 @@ from google.oauth2.service_account import Credentials
 import logging
 import json
 import os
+import threading
+import time
+from datetime import datetime, timezone
 from src.suumo_scraper import config
 
 
@@ -56,3 +59,161 @@ def setup_sheet_connection():
     except Exception as e:
         logging.error(f"スプレッドシート接続エラー: {e}")
         raise RuntimeError(f"スプレッドシート接続に失敗しました: {e}") from e
+
+
+def get_client_credentials(client):
+    """
+    gspreadクライアントが使用している認証情報を取得する
+
+    Args:
+        client: gspreadクライアント
+
+    Returns:
+        認証情報、取得できない場合はNone
+    """
+    http_client = getattr(client, "http_client", None)
+    return getattr(http_client, "auth", None)
+
+
+class SheetConnectionCache:
+    """
+    gspreadクライアントとスプレッドシート・ワークシートを保持するキャッシュ
+    Cloud Functionのウォームな実行間で使い回し、認証とメタデータ取得の往復を省く
+    """
+
+    def __init__(self, ttl=None, refresh_margin=None):
+        """
+        Args:
+            ttl: クライアントを作り直すまでの秒数（Noneの場合は設定値）
+            refresh_margin: アクセストークンの期限の何秒前に更新するか（Noneの場合は設定値）
+        """
+        self.ttl = ttl if ttl is not None else config.SHEETS_CONNECTION_TTL
+        self.refresh_margin = (
+            refresh_margin
+            if refresh_margin is not None
+            else config.SHEETS_TOKEN_REFRESH_MARGIN
+        )
+        self.client = None
+        self.created_at = 0.0
+        self.spreadsheets = {}
+        self.worksheets = {}
+        self.lock = threading.Lock()
+
+    def _clear(self):
+        self.client = None
+        self.spreadsheets.clear()
+        self.worksheets.clear()
+
+    def _refresh_token(self):
+        credentials = get_client_credentials(self.client)
+        if credentials is None or not hasattr(credentials, "refresh"):
+            return
+
+        # google-authの有効期限はタイムゾーンなしのUTC
+        expiry = getattr(credentials, "expiry", None)
+        if getattr(credentials, "token", None) and expiry is not None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if (expiry - now).total_seconds() > self.refresh_margin:
+                return
+
+        from google.auth.transport.requests import Request
+
+        try:
+            credentials.refresh(Request())
+            logging.debug(
+                f"アクセストークンを更新しました（期限: {credentials.expiry}）"
+            )
+        except Exception as e:
+            # 更新できない認証情報は使い続けず、次回はクライアントから作り直す
+            self._clear()
+            raise RuntimeError(f"アクセストークンの更新に失敗しました: {e}") from e
+
+    def _ensure_client(self):
+        if self.client is not None and time.monotonic() - self.created_at > self.ttl:
+            logging.debug("スプレッドシート接続の有効期間が過ぎたため再接続します")
+            self._clear()
+        if self.client is None:
+            self.client = setup_sheet_connection()
+            self.created_at = time.monotonic()
+            logging.info("スプレッドシート接続を作成しました")
+        self._refresh_token()
+        return self.client
+
+    def get_client(self):
+        """
+        キャッシュしたgspreadクライアントを取得する（期限切れ間近のトークンは更新する）
+
+        Returns:
+            gspreadクライアント
+
+        Raises:
+            RuntimeError: 接続または認証に失敗した場合
+        """
+        with self.lock:
+            return self._ensure_client()
+
+    def get_spreadsheet(self, spreadsheet_id=None):
+        """
+        キャッシュしたスプレッドシートを取得する
+
+        Args:
+            spreadsheet_id: スプレッドシートID（Noneの場合は設定値）
+
+        Returns:
+            gspreadのSpreadsheetオブジェクト
+        """
+        spreadsheet_id = spreadsheet_id or config.SPREADSHEET_ID
+        with self.lock:
+            client = self._ensure_client()
+            spreadsheet = self.spreadsheets.get(spreadsheet_id)
+            if spreadsheet is None:
+                spreadsheet = client.open_by_key(spreadsheet_id)
+                self.spreadsheets[spreadsheet_id] = spreadsheet
+            return spreadsheet
+
+    def get_worksheet(self, sheet_name, spreadsheet_id=None):
+        """
+        キャッシュしたワークシートを取得する
+
+        Args:
+            sheet_name: シート名
+            spreadsheet_id: スプレッドシートID（Noneの場合は設定値）
+
+        Returns:
+            gspreadのWorksheetオブジェクト
+        """
+        spreadsheet_id = spreadsheet_id or config.SPREADSHEET_ID
+        spreadsheet = self.get_spreadsheet(spreadsheet_id)
+        with self.lock:
+            key = (spreadsheet_id, sheet_name)
+            worksheet = self.worksheets.get(key)
+            if worksheet is None:
+                worksheet = spreadsheet.worksheet(sheet_name)
+                self.worksheets[key] = worksheet
+            return worksheet
+
+    def invalidate(self):
+        """
+        キャッシュを破棄する（シートの削除・権限変更などで接続が使えなくなった場合）
+        """
+        with self.lock:
+            self._clear()
+        logging.info("スプレッドシート接続のキャッシュを破棄しました")
+
+
+_sheet_connection_cache = None
+_sheet_connection_cache_lock = threading.Lock()
+
+
+def get_sheet_connection_cache():
+    """
+    プロセス全体で共有するスプレッドシート接続のキャッシュを取得する
+
+    Returns:
+        SheetConnectionCacheオブジェクト
+    """
+    global _sheet_connection_cache
+    with _sheet_connection_cache_lock:
+        if _sheet_connection_cache is None:
+            _sheet_connection_cache = SheetConnectionCache()
+        return _sheet_connection_cache
@@ -0,0 +1,189 @@
+import logging
+import random
+import threading
+import time
+import requests
+from google.auth.exceptions import TransportError
+from gspread.exceptions import APIError
+from src.suumo_scraper import config
+from src.suumo_scraper.utils.rate_limit import TokenBucket
+
+# 再試行すべきHTTPステータスコード（クォータ超過・一時的なサーバーエラー）
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# クォータ超過を表すエラーの状態（APIのエラーレスポンスのstatus）
+QUOTA_EXCEEDED_STATUS = "RESOURCE_EXHAUSTED"
+# 再試行すべき例外（APIのエラーと、一時的な通信エラー）
+RETRYABLE_EXCEPTIONS = (APIError, requests.exceptions.RequestException, TransportError)
+
+
+def get_status_code(error):
+    """
+    Sheets APIの例外からHTTPステータスコードを取得する
+
+    Args:
+        error: 例外オブジェクト
+
+    Returns:
+        ステータスコード（クォータ超過は429）、APIのエラーでない場合はNone
+    """
+    if not isinstance(error, APIError):
+        return None
+    if (getattr(error, "error", None) or {}).get("status") == QUOTA_EXCEEDED_STATUS:
+        return 429
+    return getattr(error.response, "status_code", None)
+
+
+def get_retry_after(error):
+    """
+    レスポンスのRetry-Afterヘッダーから待機秒数を取得する
+
+    Args:
+        error: 例外オブジェクト
+
+    Returns:
+        待機秒数、指定されていない場合はNone
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class SheetsRateLimiter:
+    """
+    Sheets APIの読み込み・書き込みクォータに合わせてリクエストを送るレート制限
+    クォータ超過時はRetry-After（なければ指数バックオフ）の間、すべての呼び出しを止める
+    """
+
+    def __init__(
+        self,
+        write_quota_per_minute=None,
+        read_quota_per_minute=None,
+        burst=None,
+        max_retries=None,
+    ):
+        """
+        Args:
+            write_quota_per_minute: 1分あたりの書き込みリクエスト数（Noneの場合は設定値）
+            read_quota_per_minute: 1分あたりの読み込みリクエスト数（Noneの場合は設定値）
+            burst: 連続で許容するリクエスト数（Noneの場合は設定値）
+            max_retries: 最大再試行回数（Noneの場合は設定値）
+        """
+        if write_quota_per_minute is None:
+            write_quota_per_minute = config.SHEETS_WRITE_QUOTA_PER_MINUTE
+        if read_quota_per_minute is None:
+            read_quota_per_minute = config.SHEETS_READ_QUOTA_PER_MINUTE
+        if burst is None:
+            burst = config.SHEETS_QUOTA_BURST
+        self.max_retries = (
+            max_retries if max_retries is not None else config.API_RETRY_COUNT
+        )
+        self.buckets = {
+            "write": TokenBucket(write_quota_per_minute / 60.0, burst),
+            "read": TokenBucket(read_quota_per_minute / 60.0, burst),
+        }
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _wait_for_pause(self):
+        while True:
+            with self.lock:
+                wait_time = self.paused_until - time.monotonic()
+            if wait_time <= 0:
+                return
+            time.sleep(wait_time)
+
+    def _pause(self, wait_time):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + wait_time)
+
+    def backoff_time(self, error, attempt):
+        """
+        再試行までの待機時間を計算する
+
+        Args:
+            error: 発生した例外
+            attempt: 再試行の回数（1始まり）
+
+        Returns:
+            待機秒数
+        """
+        jitter = random.uniform(0, 1)
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return retry_after + jitter
+        return min(2**attempt + jitter, config.SHEETS_BACKOFF_MAX)
+
+    def call(self, func, kind="write", description="Sheets API"):
+        """
+        クォータを守ってSheets APIを呼び出し、失敗した場合は再試行する
+        再試行するのはAPIのエラー（再試行すべきステータスコードのもの）と通信エラーのみで、
+        それ以外の例外はそのまま送出する
+
+        Args:
+            func: 実行する関数（引数なし）
+            kind: "write"または"read"
+            description: ログに出力する処理名
+
+        Returns:
+            関数の実行結果、すべての再試行が失敗した場合はNone
+        """
+        bucket = self.buckets[kind]
+        attempt = 0
+        while True:
+            self._wait_for_pause()
+            bucket.acquire()
+            try:
+                return func()
+            except RETRYABLE_EXCEPTIONS as e:
+                status_code = get_status_code(e)
+                if (
+                    isinstance(e, APIError)
+                    and status_code not in RETRYABLE_STATUS_CODES
+                ):
+                    logging.error(f"{description}に失敗（再試行しません）: {e}")
+                    return None
+
+                attempt += 1
+                if attempt > self.max_retries:
+                    logging.error(f"{description}: 最大再試行回数に達しました: {e}")
+                    return None
+
+                wait_time = self.backoff_time(e, attempt)
+                if status_code == 429:
+                    # クォータ超過は全体の問題なので、他の呼び出しも止める
+                    self._pause(wait_time)
+                logging.warning(
+                    f"{description}に失敗、{wait_time:.1f}秒後に再試行します"
+                    f"（{attempt}/{self.max_retries}）: {e}"
+                )
+                if status_code != 429:
+                    time.sleep(wait_time)
+
+    def write(self, func, description="Sheets API書き込み"):
+        """書き込みリクエストを実行する（callの省略形）"""
+        return self.call(func, "write", description)
+
+    def read(self, func, description="Sheets API読み込み"):
+        """読み込みリクエストを実行する（callの省略形）"""
+        return self.call(func, "read", description)
+
+
+_sheets_rate_limiter = None
+_sheets_rate_limiter_lock = threading.Lock()
+
+
+def get_sheets_rate_limiter():
+    """
+    プロセス全体で共有するSheets APIのレート制限を取得する
+
+    Returns:
+        SheetsRateLimiterオブジェクト
+    """
+    global _sheets_rate_limiter
+    with _sheets_rate_limiter_lock:
+        if _sheets_rate_limiter is None:
+            _sheets_rate_limiter = SheetsRateLimiter()
+        return _sheets_rate_limiter
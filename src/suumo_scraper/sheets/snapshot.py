@@ -0,0 +1,133 @@
+import logging
+from typing import Any, Dict, List, Optional
+from gspread.utils import DateTimeOption, ValueRenderOption
+from src.suumo_scraper import config
+from src.suumo_scraper.sheets.rate_limiter import get_sheets_rate_limiter
+
+
+class SheetSnapshot:
+    """
+    物件情報シートの内容を1回の読み込みで保持するスナップショット
+    URLの重複確認や通し番号の引き継ぎなど、シートの値が必要な処理はこれを参照する
+    """
+
+    def __init__(self, values: List[List[Any]]):
+        """
+        Args:
+            values: シート全体の値（1行目はヘッダー、数値のセルは数値）
+        """
+        self.values = values
+        self.url_to_row: Dict[str, int] = {}
+        for index, row_values in enumerate(values[1:]):
+            url = self._cell(row_values, config.COLUMNS["url"])
+            if url and url not in self.url_to_row:
+                self.url_to_row[url] = index + 2  # 2行目から開始
+
+    @classmethod
+    def load(cls, property_sheet) -> "SheetSnapshot":
+        """
+        シート全体を一括で読み込んでスナップショットを作成する
+        採点でもそのまま使えるよう、採点処理と同じく数値のセルは数値のまま取得する
+
+        Args:
+            property_sheet: 物件情報シート
+
+        Returns:
+            SheetSnapshotオブジェクト
+        """
+        values = get_sheets_rate_limiter().read(
+            lambda: property_sheet.get_all_values(
+                value_render_option=ValueRenderOption.unformatted,
+                date_time_render_option=DateTimeOption.formatted_string,
+            ),
+            "シートの読み込み",
+        )
+        if values is None:
+            raise RuntimeError("シートの読み込みに失敗しました")
+        logging.debug(f"シートのスナップショットを取得: {len(values)}行")
+        return cls(values)
+
+    @staticmethod
+    def _cell(row_values: List[Any], col: int) -> Any:
+        if col - 1 < len(row_values):
+            return row_values[col - 1]
+        return ""
+
+    @property
+    def urls(self) -> List[str]:
+        """
+        既存のURL一覧（ヘッダー行を除く、URL列の最後の値まで）
+
+        Returns:
+            URLのリスト（i番目の要素がi+2行目に対応）
+        """
+        urls = [
+            self._cell(row_values, config.COLUMNS["url"])
+            for row_values in self.values[1:]
+        ]
+        while urls and not urls[-1]:
+            urls.pop()
+        return urls
+
+    def row_for_url(self, url: str) -> Optional[int]:
+        """
+        URLが登録されている行番号を取得する
+
+        Args:
+            url: 物件URL
+
+        Returns:
+            行番号、登録されていない場合はNone
+        """
+        return self.url_to_row.get(url)
+
+    def row_values(self, row: int, width: int) -> List[Any]:
+        """
+        指定した行の値を取得する
+
+        Args:
+            row: 行番号（1始まり）
+            width: 取得する列数（足りない分は空文字列で埋める）
+
+        Returns:
+            値のリスト
+        """
+        row_values = self.values[row - 1] if 1 <= row <= len(self.values) else []
+        row_values = row_values[:width]
+        return row_values + [""] * (width - len(row_values))
+
+    def update_row(self, row: int, row_data: List) -> None:
+        """
+        シートに書き込んだ行の値をスナップショットにも反映する
+
+        Args:
+            row: 行番号（1始まり）
+            row_data: 書き込んだ値のリスト（A列から）
+        """
+        while len(self.values) < row:
+            self.values.append([])
+        current = self.values[row - 1]
+        if len(current) < len(row_data):
+            current.extend([""] * (len(row_data) - len(current)))
+        for index, value in enumerate(row_data):
+            current[index] = "" if value is None else str(value)
+
+        # 1行目はヘッダーのため、URLとして登録しない
+        url = self._cell(current, config.COLUMNS["url"])
+        if row > 1 and url and url not in self.url_to_row:
+            self.url_to_row[url] = row
+
+    def value(self, row: int, key: str) -> Any:
+        """
+        指定した行・カラムの値を取得する
+
+        Args:
+            row: 行番号（1始まり）
+            key: カラム名（config.COLUMNSのキー）
+
+        Returns:
+            セルの値、範囲外の場合は空文字列
+        """
+        if row < 1 or row > len(self.values):
+            return ""
+        return self._cell(self.values[row - 1], config.COLUMNS[key])
@@ -1,7 +1,12 @@
-import time
+import json
 import logging
+from gspread.utils import a1_to_rowcol
 from src.suumo_scraper import config
-from typing import Dict, List, Any
+from src.suumo_scraper.scraper.core import commit_property_states
+from src.suumo_scraper.scraper.fingerprint import EXCLUDED_COLUMNS
+from src.suumo_scraper.sheets.rate_limiter import get_sheets_rate_limiter
+from src.suumo_scraper.sheets.snapshot import SheetSnapshot
+from typing import Callable, Dict, List, Any, Optional
 
 
 def update_property_data(
@@ -37,9 +42,11 @@ def update_property_data(
         if "number" not in property_info and row > 2:
             try:
                 # 前の行の通し番号を取得して+1する
-                prev_number = property_sheet.cell(
-                    row - 1, config.COLUMNS["number"]
-                ).value
+                prev_cell = get_sheets_rate_limiter().read(
+                    lambda: property_sheet.cell(row - 1, config.COLUMNS["number"]),
+                    "通し番号の取得",
+                )
+                prev_number = prev_cell.value if prev_cell else None
                 if prev_number and prev_number.isdigit():
                     property_info["number"] = str(int(prev_number) + 1)
                 else:
@@ -70,57 +77,11 @@ def update_property_data(
             elif key == "url" and "url" in property_info:
                 row_data[col - 1] = property_info["url"]
 
-        # エクスポネンシャルバックオフの実装関数
-        def exponential_backoff_retry(
-            func,
-            max_retries=config.API_RETRY_COUNT,
-            initial_wait=config.API_RATE_LIMIT_WAIT,
-        ):
-            """
-            エクスポネンシャルバックオフを使用して関数を再試行する
-
-            Args:
-                func: 実行する関数
-                max_retries: 最大再試行回数
-                initial_wait: 初期待機時間（秒）
-
-            Returns:
-                関数の実行結果またはNone（すべての再試行が失敗した場合）
-            """
-            retry_count = 0
-            wait_time = initial_wait
-
-            while retry_count <= max_retries:
-                try:
-                    if retry_count > 0:
-                        logging.info(
-                            f"再試行 {retry_count}/{max_retries}... 待機時間: {wait_time}秒"
-                        )
-                        time.sleep(wait_time)
-                    return func()
-                except Exception as e:
-                    is_rate_limit = "Quota exceeded" in str(e) or "429" in str(e)
-                    retry_count += 1
-
-                    if retry_count > max_retries:
-                        logging.error(f"最大再試行回数に達しました: {e}")
-                        return None
-
-                    # レート制限エラーの場合は待機時間を長くする
-                    if is_rate_limit:
-                        wait_time = min(wait_time * 2, 300)  # 最大5分まで
-                    else:
-                        wait_time = min(
-                            wait_time * 1.5, 120
-                        )  # その他のエラーは1.5倍、最大2分
-
-            return None
+        # Sheets APIのクォータに合わせて呼び出すレート制限
+        limiter = get_sheets_rate_limiter()
 
         # バッチ更新方式1: 行全体を一度に更新（最も効率的）
         try:
-            # APIリクエスト前に短時間の待機を設定して連続リクエストを避ける
-            time.sleep(config.API_WRITE_INTERVAL)
-
             # データの長さを確認してセル範囲を調整
             # データの長さを確認してセル範囲を調整（最大列数をCOLUMNSの最大値に合わせる）
             max_column_index = max(config.COLUMNS.values())
@@ -152,7 +113,7 @@ def update_property_data(
                     logging.debug(f"セル範囲: A{row}:{last_column}{row}")
                     raise
 
-            result_update = exponential_backoff_retry(update_whole_row)
+            result_update = limiter.write(update_whole_row, "行全体の更新")
 
             if result_update is not None:
                 logging.debug(f"物件情報一括更新成功（行: {row}）")
@@ -202,8 +163,7 @@ def update_property_data(
                     logging.debug(f"バッチデータ: {batch_data}")
                     raise
 
-            time.sleep(config.API_WRITE_INTERVAL)
-            result_batch = exponential_backoff_retry(update_batch)
+            result_batch = limiter.write(update_batch, "バッチ方式での更新")
 
             if result_batch is None:
                 raise Exception("バッチ更新に失敗しました")
@@ -252,8 +212,7 @@ def update_property_data(
                             logging.error(f"重要情報更新エラー: {e}")
                             raise
 
-                    time.sleep(config.API_WRITE_INTERVAL)
-                    exponential_backoff_retry(update_essential_batch)
+                    limiter.write(update_essential_batch, "重要情報の更新")
                     logging.info(f"重要情報の更新に成功（行: {row}）")
                     result["status"] = "partial_success"
             except Exception as essential_error:
@@ -281,8 +240,7 @@ def update_property_data(
                                     logging.error(f"セル更新エラー ({cell_ref}): {e}")
                                     raise
 
-                            time.sleep(config.API_WRITE_INTERVAL)
-                            exponential_backoff_retry(update_single_cell)
+                            limiter.write(update_single_cell, "セルの更新")
                     logging.info(f"最小限の識別情報更新に成功（行: {row}）")
                 except Exception as cell_error:
                     logging.error(f"すべての更新方法が失敗（行: {row}）: {cell_error}")
@@ -301,8 +259,249 @@ def update_property_data(
     return result
 
 
+def column_letter(col: int) -> str:
+    """
+    列番号を列文字に変換する（1→A, 27→AA）
+
+    Args:
+        col: 列番号（1始まり）
+
+    Returns:
+        列文字
+    """
+    letters = ""
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def values_equal(sheet_value: Any, new_value: Any) -> bool:
+    """
+    シート上の値と書き込もうとしている値が同じかを判定する
+
+    Args:
+        sheet_value: シートから読み込んだ値（数値のセルは数値、それ以外は文字列）
+        new_value: 書き込もうとしている値
+
+    Returns:
+        同じであればTrue
+    """
+    sheet_text = "" if sheet_value is None else str(sheet_value)
+    new_text = "" if new_value is None else str(new_value)
+    if sheet_text == new_text:
+        return True
+    # 数値は表記（55000と55000.0、桁区切りなど）の違いを無視して比較する
+    try:
+        return float(sheet_text.replace(",", "")) == float(new_text)
+    except ValueError:
+        return False
+
+
+def coalesce_row_ranges(
+    row: int, changed: List[bool], row_data: List[Any]
+) -> List[Dict[str, Any]]:
+    """
+    書き込むセルを連続する範囲にまとめた更新データを作成する
+
+    Args:
+        row: 行番号
+        changed: 列ごとに書き込むかどうか（A列から）
+        row_data: 書き込む値（A列から）
+
+    Returns:
+        batch_update用の更新データのリスト
+    """
+    ranges = []
+    index = 0
+    while index < len(changed):
+        if not changed[index]:
+            index += 1
+            continue
+        start = index
+        while index < len(changed) and changed[index]:
+            index += 1
+        cell_range = f"{column_letter(start + 1)}{row}"
+        if index - start > 1:
+            cell_range += f":{column_letter(index)}{row}"
+        ranges.append({"range": cell_range, "values": [row_data[start:index]]})
+    return ranges
+
+
+def estimate_payload_size(entry: Dict[str, Any]) -> int:
+    """
+    batch_updateの1範囲分のリクエストサイズ（バイト）を見積もる
+
+    Args:
+        entry: {"range": 範囲, "values": 値の2次元リスト}
+
+    Returns:
+        JSONにした場合のバイト数
+    """
+    return len(json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def chunk_updates(updates: List[tuple]) -> List[List[tuple]]:
+    """
+    物件ごとの更新データを、APIの制限に収まる範囲でできるだけ大きなリクエストにまとめる
+
+    Args:
+        updates: (物件情報, 行番号, 行データ, 更新範囲のリスト) のリスト
+
+    Returns:
+        1リクエスト分ずつに分けたリスト
+    """
+    chunks = []
+    chunk = []
+    chunk_cells = 0
+    chunk_bytes = 0
+    for update in updates:
+        ranges = update[3]
+        cells = sum(len(entry["values"][0]) for entry in ranges)
+        size = sum(estimate_payload_size(entry) for entry in ranges)
+        if chunk and (
+            chunk_cells + cells > config.SHEETS_MAX_CELLS_PER_REQUEST
+            or chunk_bytes + size > config.SHEETS_MAX_PAYLOAD_BYTES
+        ):
+            chunks.append(chunk)
+            chunk = []
+            chunk_cells = 0
+            chunk_bytes = 0
+        chunk.append(update)
+        chunk_cells += cells
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def diff_row_ranges(
+    row: int, old_values: List[str], row_data: List[Any]
+) -> List[Dict[str, Any]]:
+    """
+    行の変更されたセルだけを、連続する範囲にまとめた更新データを作成する
+
+    Args:
+        row: 行番号
+        old_values: シート上の現在の値（A列から）
+        row_data: 書き込む値（A列から）
+
+    Returns:
+        batch_update用の更新データのリスト、変更がない場合は空リスト
+    """
+    changed = [not values_equal(old, new) for old, new in zip(old_values, row_data)]
+
+    # 取得日時など内容と関係なく変わる列だけの変更は、変更とみなさない
+    content_columns = [
+        col - 1 for key, col in config.COLUMNS.items() if key not in EXCLUDED_COLUMNS
+    ]
+    if not any(changed[index] for index in content_columns):
+        return []
+
+    return coalesce_row_ranges(row, changed, row_data)
+
+
+def range_columns(cell_range: str) -> List[int]:
+    """
+    A1形式の範囲に含まれる列番号を取得する
+
+    Args:
+        cell_range: 範囲（例: "C5:E5"、シート名付きも可）
+
+    Returns:
+        列番号（1始まり）のリスト
+    """
+    start, _, end = cell_range.split("!")[-1].partition(":")
+    first = a1_to_rowcol(start)[1]
+    last = a1_to_rowcol(end)[1] if end else first
+    return list(range(first, last + 1))
+
+
+def record_changed_cells(
+    result: Dict[str, Any], row: int, ranges: List[Dict[str, Any]]
+) -> None:
+    """
+    シートに書き込んだセルを結果の変更セットに記録する（採点の再計算に使う）
+
+    Args:
+        result: 結果を格納する辞書（"changed_cells"に{行番号: 列番号のリスト}を記録）
+        row: 行番号
+        ranges: 書き込んだ更新データのリスト
+    """
+    changed_cells = result.setdefault("changed_cells", {})
+    columns = set(changed_cells.get(row, []))
+    for entry in ranges:
+        columns.update(range_columns(entry["range"]))
+    changed_cells[row] = sorted(columns)
+
+
+def ensure_typed_headers(property_sheet, snapshot: SheetSnapshot) -> None:
+    """
+    数値の項目のヘッダーが物件情報シートになければ書き込む
+    採点はヘッダー名で列を探すため、列を追加した後の最初の実行で書き込んでおく
+    （別の名前が入力されている列は上書きしない）
+
+    Args:
+        property_sheet: 物件情報シート
+        snapshot: シートのスナップショット
+    """
+    row_data = snapshot.row_values(1, max(config.COLUMNS.values()))
+    changed = [False] * len(row_data)
+    for key, header in config.TYPED_COLUMN_HEADERS.items():
+        index = config.COLUMNS[key] - 1
+        current = row_data[index]
+        if current == "":
+            row_data[index] = header
+            changed[index] = True
+        elif current != header:
+            logging.warning(
+                f"{column_letter(index + 1)}1のヘッダーが「{current}」のため、"
+                f"「{header}」を書き込みません"
+            )
+
+    ranges = coalesce_row_ranges(1, changed, row_data)
+    if not ranges:
+        return
+    response = get_sheets_rate_limiter().write(
+        lambda: property_sheet.batch_update(ranges), "ヘッダーの書き込み"
+    )
+    if response is None:
+        logging.warning("数値の項目のヘッダーを書き込めませんでした")
+        return
+    snapshot.update_row(1, row_data)
+    logging.info(f"数値の項目のヘッダーを書き込みました: {sum(changed)}列")
+
+
+def finish_committed_properties(
+    properties: List[Dict[str, Any]],
+    on_committed: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> None:
+    """
+    シートへの反映が完了した物件について、差分判定用の状態の保存とコールバックを行う
+    書き込み自体は成功しているため、ここでの失敗は警告にとどめて書き込みエラーにしない
+
+    Args:
+        properties: シートへの反映が完了した物件情報のリスト
+        on_committed: 物件のリストを受け取るコールバック（チェックポイントの記録など）
+    """
+    try:
+        commit_property_states(properties)
+    except Exception as e:
+        logging.warning(f"差分判定用の状態の保存に失敗: {e}")
+
+    if on_committed:
+        try:
+            on_committed(properties)
+        except Exception as e:
+            logging.warning(f"書き込み完了の記録に失敗: {e}")
+
+
 def batch_update_properties(
-    property_sheet, properties_data: List[Dict[str, Any]], result: Dict[str, Any]
+    property_sheet,
+    properties_data: List[Dict[str, Any]],
+    result: Dict[str, Any],
+    snapshot: Optional[SheetSnapshot] = None,
+    on_committed: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
 ) -> Dict[str, Any]:
     """
     複数の物件情報を一括でスプレッドシートに更新する関数
@@ -310,7 +509,11 @@ def batch_update_properties(
     Args:
         property_sheet: 物件情報シート
         properties_data: 更新する物件情報のリスト [{"row": 行番号, "data": 物件データ}, ...]
-        result: 結果を格納する辞書
+            "reserve_row": Trueの物件は、取得エラーでもURLと通し番号を書き込む
+        result: 結果を格納する辞書（書き込んだセルは"changed_cells"に記録する）
+        snapshot: シートのスナップショット（指定した場合は変更されたセルだけを書き込む）
+        on_committed: シートへの反映が完了した（または不要だった）物件のリストを
+            受け取るコールバック
 
     Returns:
         更新された結果辞書
@@ -320,8 +523,9 @@ def batch_update_properties(
     # 最大列番号を特定
     max_col = max(col for col in config.COLUMNS.values())
 
-    # 一括更新用のバッチデータを準備
-    all_batch_data = []
+    # 物件ごとの更新データ [(物件情報, 行番号, 行データ, 更新範囲のリスト), ...]
+    updates = []
+    unchanged_properties = []
 
     # 各物件のデータをバッチに追加
     for prop in properties_data:
@@ -339,6 +543,25 @@ def batch_update_properties(
                 }
             )
             logging.error(f"物件情報取得エラー: {property_info.get('error', '')}")
+
+            # 新規追加の行は、エラーでもURLと通し番号だけは書き込んで行を確保する
+            if prop.get("reserve_row"):
+                row_data = [""] * max_col
+                for key in ("number", "url"):
+                    if property_info.get(key):
+                        row_data[config.COLUMNS[key] - 1] = property_info[key]
+                ranges = coalesce_row_ranges(
+                    row, [value != "" for value in row_data], row_data
+                )
+                if ranges:
+                    updates.append((None, row, row_data, ranges))
+            continue
+
+        # ページが更新されていない物件は書き込まない
+        if property_info.get("not_modified"):
+            result["success_count"] += 1
+            result["unchanged_count"] = result.get("unchanged_count", 0) + 1
+            unchanged_properties.append(property_info)
             continue
 
         # 行データの作成
@@ -349,26 +572,50 @@ def batch_update_properties(
             if key in property_info:
                 row_data[col - 1] = property_info.get(key, "")
 
-        # 列範囲の計算
-        max_column_index = max(config.COLUMNS.values())
-        last_column = chr(64 + min(max_column_index, 26))
-        if max_column_index > 26:
-            last_column = "A" + chr(64 + (max_column_index - 26))
+        if snapshot is None:
+            # シートと比較できない場合は、前回書き込んだ内容と同じ物件だけ書き込みを省略する
+            if property_info.get("content_unchanged"):
+                result["success_count"] += 1
+                result["unchanged_count"] = result.get("unchanged_count", 0) + 1
+                unchanged_properties.append(property_info)
+                continue
+            # スナップショットがない場合は行全体を書き込む
+            ranges = [
+                {
+                    "range": f"A{row}:{column_letter(max_col)}{row}",
+                    "values": [row_data],
+                }
+            ]
+        else:
+            # シート上の値と比較し、変更されたセルだけを書き込む
+            ranges = diff_row_ranges(row, snapshot.row_values(row, max_col), row_data)
+            if not ranges:
+                logging.debug(f"シート上の値と同じためスキップ（行: {row}）")
+                result["success_count"] += 1
+                result["unchanged_count"] = result.get("unchanged_count", 0) + 1
+                unchanged_properties.append(property_info)
+                continue
+
+        updates.append((property_info, row, row_data, ranges))
 
-        # バッチデータに追加
-        all_batch_data.append(
-            {
-                "range": f"A{row}:{last_column}{row}",
-                "values": [row_data[:max_column_index]],
-            }
-        )
+    # 内容が変わらずETagだけ変わった物件は、次回304で判定できるよう検証子を更新しておく
+    if unchanged_properties:
+        finish_committed_properties(unchanged_properties, on_committed)
+
+    # APIのセル数・リクエストサイズの上限まで、できるだけ多くの範囲を1回で書き込む
+    chunks = chunk_updates(updates)
+    total_count = sum(1 for update in updates if update[0] is not None)
 
-    # Google Sheets APIの制限（1リクエストあたり100セル）に対応するため、バッチを分割
-    max_batches_per_request = 10  # 1リクエストあたりの最大バッチ数
     success_count = 0
+    done_count = 0
 
-    for i in range(0, len(all_batch_data), max_batches_per_request):
-        batch_chunk = all_batch_data[i : i + max_batches_per_request]
+    for chunk in chunks:
+        batch_chunk = [entry for update in chunk for entry in update[3]]
+        # 行の確保だけを行うエラー物件（物件情報がNone）は件数に含めない
+        chunk_properties = [update[0] for update in chunk if update[0] is not None]
+        first = done_count + 1
+        last = done_count + len(chunk_properties)
+        done_count = last
 
         # バッチ更新を実行する関数
         def execute_batch_update():
@@ -379,68 +626,36 @@ def batch_update_properties(
                 logging.error(f"バッチ更新エラー: {str(e)}")
                 raise
 
-        # エクスポネンシャルバックオフで実行
-        def exponential_backoff_retry(
-            func,
-            max_retries=config.API_RETRY_COUNT,
-            initial_wait=config.API_RATE_LIMIT_WAIT,
-        ):
-            retry_count = 0
-            wait_time = initial_wait
-
-            while retry_count <= max_retries:
-                try:
-                    if retry_count > 0:
-                        logging.info(
-                            f"再試行 {retry_count}/{max_retries}... 待機時間: {wait_time}秒"
-                        )
-                        time.sleep(wait_time)
-                    return func()
-                except Exception as e:
-                    is_rate_limit = "Quota exceeded" in str(e) or "429" in str(e)
-                    retry_count += 1
-
-                    if retry_count > max_retries:
-                        logging.error(f"最大再試行回数に達しました: {e}")
-                        return None
-
-                    # レート制限エラーの場合は待機時間を長くする
-                    if is_rate_limit:
-                        wait_time = min(wait_time * 2, 300)  # 最大5分まで
-                    else:
-                        wait_time = min(
-                            wait_time * 1.5, 120
-                        )  # その他のエラーは1.5倍、最大2分
-
-            return None
-
-        # APIリクエスト前に短時間の待機を設定して連続リクエストを避ける
-        time.sleep(config.API_WRITE_INTERVAL)
-
-        # バッチ更新を実行
-        result_batch = exponential_backoff_retry(execute_batch_update)
+        # バッチ更新を実行（クォータを超えないよう待機し、失敗時は再試行する）
+        result_batch = get_sheets_rate_limiter().write(
+            execute_batch_update, "バッチ更新"
+        )
 
         if result_batch is not None:
-            success_count += len(batch_chunk)
+            success_count += len(chunk_properties)
+            # 書き込みが完了した物件のみ、次回の差分判定用の状態を保存する
+            finish_committed_properties(chunk_properties, on_committed)
+            for _, row, row_data, ranges in chunk:
+                record_changed_cells(result, row, ranges)
+                if snapshot is not None:
+                    snapshot.update_row(row, row_data)
             logging.info(
-                f"バッチ更新成功: {i+1}～{min(i+max_batches_per_request, len(all_batch_data))}件目"
+                f"バッチ更新成功: {first}～{last}件目（{len(batch_chunk)}範囲）"
             )
         else:
             result["status"] = "partial_error"
-            result["error_count"] += len(batch_chunk)
+            result["error_count"] += len(chunk_properties)
             result["errors"].append(
                 {
                     "url": "batch_update",
-                    "error_message": f"バッチ{i+1}～{min(i+max_batches_per_request, len(all_batch_data))}の更新に失敗",
+                    "error_message": f"バッチ{first}～{last}の更新に失敗",
                 }
             )
-            logging.error(
-                f"バッチ更新失敗: {i+1}～{min(i+max_batches_per_request, len(all_batch_data))}件目"
-            )
+            logging.error(f"バッチ更新失敗: {first}～{last}件目")
 
     result["success_count"] += success_count
     logging.info(
-        f"一括更新処理完了: 成功={success_count}件, 失敗={len(all_batch_data)-success_count}件"
+        f"一括更新処理完了: 成功={success_count}件, 失敗={total_count-success_count}件"
     )
 
     return result
@@ -451,6 +666,7 @@ def batch_add_new_properties(
     new_properties: List[Dict[str, Any]],
     existing_urls: List[str],
     result: Dict[str, Any],
+    snapshot: Optional[SheetSnapshot] = None,
 ) -> Dict[str, Any]:
     """
     新規物件を一括でスプレッドシートに追加する関数
@@ -460,6 +676,7 @@ def batch_add_new_properties(
         new_properties: 追加する物件情報のリスト
         existing_urls: 既存のURL一覧
         result: 結果を格納する辞書
+        snapshot: シートのスナップショット（指定した場合は変更されたセルだけを書き込む）
 
     Returns:
         更新された結果辞書、および新しい行番号とURLのマッピング
@@ -469,113 +686,34 @@ def batch_add_new_properties(
 
     logging.info(f"新規物件一括追加処理開始: {len(new_properties)}件")
 
-    # 新規物件のURLだけをまず追加（行確保のため）
+    # URLと物件データを同じリクエストで書き込む（行番号は既存の最終行の次から）
     url_to_row = {}  # URLと行番号のマッピング
     next_row = len(existing_urls) + 2  # 既存のURL数 + ヘッダー行 + 1
+    existing_url_set = set(existing_urls)
+    properties_data = []
 
-    # URLのみを一括更新するためのデータを準備
-    url_batch_data = []
-
-    for i, property_info in enumerate(new_properties):
+    for property_info in new_properties:
         url = property_info.get("url", "")
-        if not url or url in existing_urls:
-            # URLが空または既存の場合はスキップ
+        if not url or url in existing_url_set or url in url_to_row:
+            # URLが空または既存・重複の場合はスキップ
             continue
 
-        row = next_row + i
+        row = next_row + len(url_to_row)
         url_to_row[url] = row
 
-        # URLのみをバッチに追加
-        url_column = config.COLUMNS["url"]
-        if url_column <= 26:
-            col_letter = chr(64 + url_column)
-        else:
-            col_letter = "A" + chr(64 + (url_column - 26))
-
-        url_batch_data.append({"range": f"{col_letter}{row}", "values": [[url]]})
-
-    if not url_batch_data:
-        return result, {}
-
-    # URLの一括更新を実行
-    def update_urls_batch():
-        try:
-            response = property_sheet.batch_update(url_batch_data)
-            return response
-        except Exception as e:
-            logging.error(f"URL一括追加エラー: {str(e)}")
-            raise
-
-    # エクスポネンシャルバックオフで実行
-    def exponential_backoff_retry(
-        func,
-        max_retries=config.API_RETRY_COUNT,
-        initial_wait=config.API_RATE_LIMIT_WAIT,
-    ):
-        retry_count = 0
-        wait_time = initial_wait
-
-        while retry_count <= max_retries:
-            try:
-                if retry_count > 0:
-                    logging.info(
-                        f"再試行 {retry_count}/{max_retries}... 待機時間: {wait_time}秒"
-                    )
-                    time.sleep(wait_time)
-                return func()
-            except Exception as e:
-                is_rate_limit = "Quota exceeded" in str(e) or "429" in str(e)
-                retry_count += 1
-
-                if retry_count > max_retries:
-                    logging.error(f"最大再試行回数に達しました: {e}")
-                    return None
-
-                # レート制限エラーの場合は待機時間を長くする
-                if is_rate_limit:
-                    wait_time = min(wait_time * 2, 300)  # 最大5分まで
-                else:
-                    wait_time = min(
-                        wait_time * 1.5, 120
-                    )  # その他のエラーは1.5倍、最大2分
-
-        return None
-
-    # APIリクエスト前に短時間の待機を設定
-    time.sleep(config.API_WRITE_INTERVAL)
-
-    # URL一括追加を実行
-    url_result = exponential_backoff_retry(update_urls_batch)
-
-    if url_result is None:
-        result["status"] = "partial_error"
-        result["error_count"] += len(url_batch_data)
-        result["errors"].append(
-            {"url": "batch_add_urls", "error_message": "URLの一括追加に失敗"}
-        )
-        logging.error("URLの一括追加に失敗")
-        return result, {}
-
-    logging.info(f"URL一括追加成功: {len(url_batch_data)}件")
+        # 通し番号を設定
+        if "number" not in property_info:
+            # 自動的に通し番号を設定（行番号-1）
+            property_info["number"] = str(row - 1)
 
-    # 登録されたURLに対応する物件データを準備
-    properties_data = []
-
-    for property_info in new_properties:
-        url = property_info.get("url", "")
-        if url in url_to_row:
-            # 通し番号を設定
-            row = url_to_row[url]
-            if "number" not in property_info:
-                # 自動的に通し番号を設定（行番号-1）
-                property_info["number"] = str(row - 1)
-
-            # 物件データを準備
-            properties_data.append({"row": row, "data": property_info})
+        # 取得に失敗した物件も、URLと通し番号は書き込んで行を確保する
+        properties_data.append({"row": row, "data": property_info, "reserve_row": True})
 
     # 物件データの一括更新
     if properties_data:
-        result = batch_update_properties(property_sheet, properties_data, result)
+        result = batch_update_properties(
+            property_sheet, properties_data, result, snapshot
+        )
         result["processed_urls"] += len(properties_data)
 
     return result, url_to_row
@@ -612,39 +750,17 @@ def process_url(
         next_row = len(existing_urls) + 2
 
         # URLをシートに追加（レート制限エラー対策）
-        update_success = False
-        retry_count = 0
-        while not update_success and retry_count < config.API_RETRY_COUNT:
-            try:
-                property_sheet.update_cell(next_row, config.COLUMNS["url"], url)
-                logging.debug(f"URL追加: 行={next_row}, URL={url}")
-                update_success = True
-                time.sleep(config.API_WRITE_INTERVAL)  # 書き込み後の待機
-            except Exception as url_error:
-                retry_count += 1
-                if "Quota exceeded" in str(url_error) or "429" in str(url_error):
-                    wait_time = config.API_RATE_LIMIT_WAIT * (retry_count)
-                    logging.warning(
-                        f"URL追加時にAPIレート制限エラー発生。待機します（{wait_time}秒）: {url_error}"
-                    )
-                    time.sleep(wait_time)
-                else:
-                    logging.error(f"URL追加エラー（{retry_count}回目）: {url_error}")
-                    time.sleep(config.API_WRITE_INTERVAL)
+        def add_url():
+            return property_sheet.update_cell(next_row, config.COLUMNS["url"], url)
 
-                if retry_count >= config.API_RETRY_COUNT:
-                    logging.error(
-                        f"URL追加の最大再試行回数（{config.API_RETRY_COUNT}回）に達しました。次のURLに進みます。"
-                    )
-                    result["status"] = "partial_error"
-                    result["error_count"] += 1
-                    result["errors"].append(
-                        {
-                            "url": url,
-                            "error_message": f"URL追加エラー: {str(url_error)}",
-                        }
-                    )
-                    return result
+        if get_sheets_rate_limiter().write(add_url, "URL追加") is None:
+            result["status"] = "partial_error"
+            result["error_count"] += 1
+            result["errors"].append(
+                {"url": url, "error_message": "URL追加エラー: 書き込みに失敗しました"}
+            )
+            return result
+        logging.debug(f"URL追加: 行={next_row}, URL={url}")
 
         # ここで物件情報取得の関数をインポート（循環参照回避のため）
         from scraper.core import scrape_suumo_property_info
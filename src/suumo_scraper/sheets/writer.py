@@ -0,0 +1,142 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from src.suumo_scraper import config
+from src.suumo_scraper.sheets.snapshot import SheetSnapshot
+from src.suumo_scraper.sheets.update import batch_update_properties
+
+# 書き込みスレッドに終了を伝えるための番兵
+_STOP = object()
+
+
+class BatchingSheetWriter:
+    """
+    スクレイピング結果を受け取り、まとめてシートに書き込むバックグラウンドのライター
+    件数または経過時間でまとめて書き込むため、スクレイピングと書き込みが並行して進む
+    キューの大きさに上限があるため、書き込みが追いつかない場合は受け取り側が待機する
+    """
+
+    def __init__(
+        self,
+        property_sheet,
+        result: Dict[str, Any],
+        snapshot: Optional[SheetSnapshot] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        on_committed: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ):
+        """
+        Args:
+            property_sheet: 物件情報シート
+            result: 結果を格納する辞書（書き込みスレッドが更新する）
+            snapshot: シートのスナップショット（指定した場合は変更されたセルだけを書き込む）
+            batch_size: まとめて書き込む件数（Noneの場合は設定値）
+            flush_interval: 件数に達しなくても書き込むまでの秒数（Noneの場合は設定値）
+            queue_size: キューに保持する最大件数（Noneの場合は設定値）
+            on_committed: シートへの反映が完了した物件のリストを受け取るコールバック
+        """
+        self.property_sheet = property_sheet
+        self.result = result
+        self.snapshot = snapshot
+        self.batch_size = batch_size or config.SHEETS_WRITER_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else config.SHEETS_WRITER_FLUSH_INTERVAL
+        )
+        self.queue = queue.Queue(maxsize=queue_size or config.SHEETS_WRITER_QUEUE_SIZE)
+        self.on_committed = on_committed
+        self.thread = None
+        self.written_count = 0
+
+    def start(self) -> "BatchingSheetWriter":
+        """
+        書き込みスレッドを開始する
+
+        Returns:
+            自分自身
+        """
+        self.thread = threading.Thread(
+            target=self._run, name="sheet-writer", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def put(self, row: int, property_info: Dict[str, Any]) -> None:
+        """
+        書き込む物件情報をキューに追加する（キューが一杯の場合は空くまで待機）
+
+        Args:
+            row: 書き込む行番号
+            property_info: 物件情報の辞書
+        """
+        self.queue.put({"row": row, "data": property_info})
+
+    def close(self) -> Dict[str, Any]:
+        """
+        残りの物件情報を書き込んでスレッドを終了する
+
+        Returns:
+            結果を格納した辞書
+        """
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+        return self.result
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _flush(self, buffer):
+        if not buffer:
+            return
+        try:
+            batch_update_properties(
+                self.property_sheet,
+                buffer,
+                self.result,
+                self.snapshot,
+                self.on_committed,
+            )
+        except Exception as e:
+            logging.error(f"シートへの書き込み中にエラー発生: {e}")
+            self.result["status"] = "partial_error"
+            self.result["error_count"] += len(buffer)
+            self.result["errors"].append(
+                {"url": "batch_update", "error_message": str(e)}
+            )
+        self.written_count += len(buffer)
+        logging.info(f"書き込み済み: {self.written_count}件")
+        buffer.clear()
+
+    def _run(self):
+        buffer = []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, last_flush + self.flush_interval - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout if buffer else None)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(buffer)
+                return
+            if item is not None:
+                if not buffer:
+                    last_flush = time.monotonic()
+                buffer.append(item)
+
+            if len(buffer) >= self.batch_size or (
+                buffer and time.monotonic() - last_flush >= self.flush_interval
+            ):
+                self._flush(buffer)
+                last_flush = time.monotonic()
@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from src.suumo_scraper import config
+
+# 物件ごとの処理状況
+STATUS_SCRAPED = "scraped"  # スクレイピング済み（シートには未書き込み）
+STATUS_FLUSHED = "flushed"  # シートへの書き込みまで完了
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    run_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT,
+    content_hash TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_key, url)
+);
+"""
+
+
+def make_run_key(update_mode, spreadsheet_id, scope=""):
+    """
+    チェックポイントを識別するキーを作成する
+
+    Args:
+        update_mode: 更新モード
+        spreadsheet_id: スプレッドシートID
+        scope: 対象範囲を区別する文字列（シャードなど）
+
+    Returns:
+        実行キー
+    """
+    return ":".join(part for part in (update_mode, spreadsheet_id, scope) if part)
+
+
+class CheckpointJournal:
+    """
+    全体更新の進捗をSQLiteに記録するジャーナル
+    中断された実行を、次回の実行で続きから再開するために使う
+    """
+
+    def __init__(self, path=None, max_age=None):
+        """
+        Args:
+            path: SQLiteファイルのパス（Noneの場合は設定値）
+            max_age: 再開の対象とする実行の最大経過時間（秒、Noneの場合は設定値）
+        """
+        self.path = path or config.CHECKPOINT_DB_PATH
+        self.max_age = (
+            max_age if max_age is not None else config.CHECKPOINT_MAX_AGE_HOURS * 3600
+        )
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # スクレイピングのループと書き込みスレッドの両方から使うため、ロックで直列化する
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def begin(self, run_key):
+        """
+        実行を開始する。未完了の実行が残っていれば、それを再開する
+
+        Args:
+            run_key: 実行キー
+
+        Returns:
+            未完了の実行を再開する場合はTrue
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT started_at, completed_at FROM runs WHERE run_key = ?",
+                (run_key,),
+            ).fetchone()
+            if row is not None and row[1] is None and now - row[0] <= self.max_age:
+                return True
+
+            # 完了済み・古すぎる実行の記録は破棄して新しく始める
+            self.connection.execute("DELETE FROM entries WHERE run_key = ?", (run_key,))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO runs (run_key, started_at, completed_at) "
+                "VALUES (?, ?, NULL)",
+                (run_key, now),
+            )
+            return False
+
+    def flushed_urls(self, run_key):
+        """
+        シートへの書き込みまで完了したURLを取得する
+
+        Args:
+            run_key: 実行キー
+
+        Returns:
+            URLの集合
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT url FROM entries WHERE run_key = ? AND status = ?",
+                (run_key, STATUS_FLUSHED),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def scraped_entries(self, run_key):
+        """
+        スクレイピング済みでシートに未書き込みの物件を取得する
+
+        Args:
+            run_key: 実行キー
+
+        Returns:
+            {URL: 物件情報の辞書}
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT url, data FROM entries WHERE run_key = ? AND status = ?",
+                (run_key, STATUS_SCRAPED),
+            ).fetchall()
+        entries = {}
+        for url, data in rows:
+            try:
+                entries[url] = json.loads(data)
+            except (TypeError, ValueError) as e:
+                logging.warning(
+                    f"チェックポイントの物件情報を読み込めません: {url}, {e}"
+                )
+        return entries
+
+    def mark_scraped(self, run_key, url, row, property_info):
+        """
+        スクレイピング済みとして物件情報を記録する
+
+        Args:
+            run_key: 実行キー
+            url: 物件URL
+            row: 書き込む行番号
+            property_info: 物件情報の辞書
+        """
+        data = json.dumps(property_info, ensure_ascii=False, default=str)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(run_key, url, row, status, data, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_key,
+                    url,
+                    row,
+                    STATUS_SCRAPED,
+                    data,
+                    property_info.get("content_hash"),
+                    time.time(),
+                ),
+            )
+
+    def mark_flushed(self, run_key, urls):
+        """
+        シートへの書き込みが完了したことを記録する（物件情報は不要になるため削除する）
+
+        Args:
+            run_key: 実行キー
+            urls: 書き込みが完了したURLのリスト
+        """
+        if not urls:
+            return
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE entries SET status = ?, data = NULL, updated_at = ? "
+                "WHERE run_key = ? AND url = ?",
+                [(STATUS_FLUSHED, now, run_key, url) for url in urls],
+            )
+
+    def complete(self, run_key):
+        """
+        実行の完了を記録し、物件ごとの記録を削除する
+
+        Args:
+            run_key: 実行キー
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries WHERE run_key = ?", (run_key,))
+            self.connection.execute(
+                "UPDATE runs SET completed_at = ? WHERE run_key = ?",
+                (time.time(), run_key),
+            )
+
+
+_checkpoint_journal = None
+_checkpoint_journal_lock = threading.Lock()
+
+
+def get_checkpoint_journal():
+    """
+    プロセス全体で共有するチェックポイントジャーナルを取得する
+
+    Returns:
+        CheckpointJournalオブジェクト
+    """
+    global _checkpoint_journal
+    with _checkpoint_journal_lock:
+        if _checkpoint_journal is None:
+            _checkpoint_journal = CheckpointJournal()
+        return _checkpoint_journal
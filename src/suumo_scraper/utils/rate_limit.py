@@ -0,0 +1,117 @@
+import threading
+import time
+import logging
+from urllib.parse import urlparse
+from src.suumo_scraper import config
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレート制限
+    スレッドセーフで、複数のワーカーから同時に利用できる
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        Args:
+            rate: 1秒あたりに補充されるトークン数
+            capacity: バケットの最大トークン数（連続で許容するリクエスト数）
+        """
+        if rate <= 0:
+            raise ValueError(f"rateは正の値である必要があります: {rate}")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """
+        トークンを取得する（待機しない）
+
+        Returns:
+            取得できた場合は0、できなかった場合は取得可能になるまでの待機秒数
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        トークンが取得できるまで待機する
+
+        Returns:
+            待機した合計秒数
+        """
+        waited = 0.0
+        while True:
+            wait_time = self.try_acquire(tokens)
+            if wait_time <= 0:
+                return waited
+            time.sleep(wait_time)
+            waited += wait_time
+
+
+class HostRateLimiter:
+    """
+    ホストごとにトークンバケットを持つレート制限
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        """
+        URLのホストに対するリクエスト枠を取得するまで待機する
+
+        Args:
+            url: リクエスト対象のURL
+
+        Returns:
+            待機した秒数
+        """
+        host = urlparse(url).netloc or "localhost"
+        waited = self.get_bucket(host).acquire()
+        if waited > 0:
+            logging.debug(f"レート制限により待機: {host} {waited:.2f}秒")
+        return waited
+
+
+_host_rate_limiter = None
+_host_rate_limiter_lock = threading.Lock()
+
+
+def get_host_rate_limiter():
+    """
+    プロセス全体で共有するホスト別レート制限を取得する
+
+    Returns:
+        HostRateLimiterオブジェクト
+    """
+    global _host_rate_limiter
+    with _host_rate_limiter_lock:
+        if _host_rate_limiter is None:
+            _host_rate_limiter = HostRateLimiter(
+                config.SCRAPING_RATE_PER_HOST, config.SCRAPING_BURST_PER_HOST
+            )
+        return _host_rate_limiter
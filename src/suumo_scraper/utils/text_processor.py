@@ -1,11 +1,45 @@
 import re
+from datetime import datetime
+
+# 数値表記の正規化テーブル（str.translateで一度に処理する）
+# 全角の数字・記号を半角に変換し、空白・桁区切り・「円」を取り除く
+NUMERIC_TRANSLATION = str.maketrans(
+    "０１２３４５６７８９．－／Ｂ",
+    "0123456789.-/B",
+    " \t\r\n　\xa0,，円",
+)
+
+# \dは全角数字にも一致するため、全角の表記も正規化せずにそのまま抽出できる
+NON_NUMBER_PATTERN = re.compile(r"[^\d.．]")
+NUMBER_PATTERN = re.compile(r"\d+(?:[.．]\d+)?")
+# 金額（万の単位と端数を含む、例: 8.5万、8万5000）
+AMOUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(?:(万)(\d+)?)?")
+WALK_MINUTES_PATTERN = re.compile(r"歩(\d+)分")
+TOTAL_FLOORS_PATTERN = re.compile(r"(\d+)階建")
+# 所在階（地下階、メゾネットの2-3階などを含む）
+FLOOR_PATTERN = re.compile(r"(B|地下)?(\d+)(?:-\d+)?階(?!建)")
+YEAR_PATTERN = re.compile(r"(\d{4})年")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# 費用がないことを表す表記（敷金・礼金・管理費の「-」など、正規化後の値）
+NO_FEE_TEXTS = {"-", "ー", "―", "なし", "無", "無し"}
+
+
+def normalize_numeric_text(text):
+    """数値表記を正規化する関数（全角→半角、空白・桁区切り・「円」の除去を1回の走査で行う）"""
+    return text.translate(NUMERIC_TRANSLATION)
+
+
+def to_ascii_number(text):
+    """抽出した数値の文字列を半角にする関数（ほとんどの値は半角のため、その場合はそのまま返す）"""
+    return text if text.isascii() else normalize_numeric_text(text)
 
 
 def extract_number_from_text(text):
     """文字列から数値のみを抽出する関数"""
     if not text:
         return ""
-    return re.sub(r"[^\d.]", "", text)
+    return to_ascii_number(NON_NUMBER_PATTERN.sub("", text))
 
 
 def process_currency(text):
@@ -13,13 +47,10 @@ def process_currency(text):
     if not text:
         return ""
     # 万円表記の場合は10000倍する（例: 5.5万円 → 55000）
-    if "万円" in text or "万" in text:
-        number = re.findall(r"(\d+(?:\.\d+)?)", text)
-        if number:
-            try:
-                return str(float(number[0]) * 10000)
-            except (ValueError, IndexError):
-                return ""
+    if "万" in text:
+        match = NUMBER_PATTERN.search(text)
+        if match:
+            return str(float(to_ascii_number(match.group())) * 10000)
     # 円表記の場合はそのまま数値を抽出
     return extract_number_from_text(text)
 
@@ -45,4 +76,82 @@ def clean_text(text):
     """テキストの余分な空白や改行を削除"""
     if not text:
         return ""
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split()は連続する空白（改行・全角空白を含む）で分割し、前後の空白も除く
+    return " ".join(text.split())
+
+
+def parse_yen(text):
+    """金額表記を円単位の整数に変換する関数（例: 8.5万円・8万5000円 → 85000、- → 0、変換できない場合はNone）"""
+    if not text:
+        return None
+    text = normalize_numeric_text(text)
+    if text in NO_FEE_TEXTS:
+        return 0
+    # 家賃の何ヶ月分という表記は金額に換算できない
+    if "ヶ月" in text or "か月" in text:
+        return None
+    match = AMOUNT_PATTERN.search(text)
+    if not match:
+        return None
+    number = float(match.group(1))
+    if match.group(2):
+        number = number * 10000 + int(match.group(3) or 0)
+    return int(round(number))
+
+
+def parse_area(text):
+    """面積表記を平方メートル単位の数値に変換する関数（変換できない場合はNone）"""
+    if not text:
+        return None
+    match = NUMBER_PATTERN.search(normalize_numeric_text(text))
+    return float(match.group()) if match else None
+
+
+def parse_walk_minutes(text):
+    """アクセス表記から最寄り駅までの徒歩分数を抽出する関数（複数駅の場合は最小値、見つからない場合はNone、駅ごとの値はparse_walk_minutes_by_line）"""
+    if not text:
+        return None
+    minutes = WALK_MINUTES_PATTERN.findall(normalize_numeric_text(text))
+    return min(int(minute) for minute in minutes) if minutes else None
+
+
+def parse_walk_minutes_by_line(lines):
+    """アクセス表記の行（駅）ごとに徒歩分数を抽出する関数（行と同じ順序のリスト、徒歩の表記がない行はNone）"""
+    return [parse_walk_minutes(line) for line in lines or []]
+
+
+def parse_floor(text):
+    """階数表記から(所在階, 地上階数)を抽出する関数（例: 3階/10階建 → (3, 10)、地下階は負の数）"""
+    if not text:
+        return None, None
+    text = normalize_numeric_text(text)
+
+    total_floors = None
+    match = TOTAL_FLOORS_PATTERN.search(text)
+    if match:
+        total_floors = int(match.group(1))
+
+    floor = None
+    # メゾネット（2-3階）などは下の階を所在階とする
+    match = FLOOR_PATTERN.search(text.split("/")[0])
+    if match:
+        floor = int(match.group(2))
+        if match.group(1):
+            floor = -floor
+    return floor, total_floors
+
+
+def parse_built_year(text, current_year=None):
+    """築年数表記から建築年を求める関数（例: 築10年 → 今年-10、新築 → 今年、変換できない場合はNone）"""
+    if not text:
+        return None
+    if current_year is None:
+        current_year = datetime.now().year
+    if "新築" in text:
+        return current_year
+    text = normalize_numeric_text(text)
+    match = YEAR_PATTERN.search(text)
+    if match:
+        return int(match.group(1))
+    match = DIGITS_PATTERN.search(text)
+    return current_year - int(match.group()) if match else None
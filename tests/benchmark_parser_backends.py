@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTMLパーサーバックエンドごとの解析時間を比較するベンチマークスクリプト
+保存済みのHTML（debug_data/*.html など）を使い、1ページあたりの解析時間を計測します
+"""
+
+import argparse
+import glob
+import logging
+import os
+import statistics
+import time
+
+# 内部モジュールのインポート
+from src.suumo_scraper.utils.logger import setup_logger
+from src.suumo_scraper.scraper.parser_factory import create_parser
+from src.suumo_scraper.scraper.soup import (
+    PARSER_BACKENDS,
+    is_backend_available,
+    make_soup,
+)
+
+# ロガーの設定（計測中のデバッグログを抑制）
+logger = setup_logger()
+logger.setLevel(logging.WARNING)
+
+
+def load_fixtures(paths):
+    """
+    ベンチマーク対象のHTMLファイルを読み込む
+
+    Args:
+        paths: ファイルパスまたはglobパターンのリスト
+
+    Returns:
+        (ファイルパス, HTML内容) のリスト
+    """
+    fixtures = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "rb") as f:
+                fixtures.append((path, f.read()))
+    return fixtures
+
+
+def benchmark_backend(backend, fixtures, repeat):
+    """
+    1つのバックエンドで全ページを解析して時間を計測する
+
+    Args:
+        backend: バックエンド名
+        fixtures: (ファイルパス, HTML内容) のリスト
+        repeat: 繰り返し回数
+
+    Returns:
+        (1ページあたりの解析時間のリスト（ミリ秒）, ファイルパスごとの解析結果)
+    """
+    timings = []
+    results = {}
+    for _ in range(repeat):
+        for path, html_content in fixtures:
+            start = time.perf_counter()
+            soup = make_soup(html_content, backend)
+            property_info = create_parser(soup, path).parse()
+            timings.append((time.perf_counter() - start) * 1000)
+
+            property_info.pop("update_time", None)
+            results[path] = property_info
+    return timings, results
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description="HTMLパーサーバックエンドのベンチマーク"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[os.path.join("debug_data", "*.html")],
+        help="HTMLファイルのパスまたはglobパターン（省略時はdebug_data/*.html）",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="繰り返し回数")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.paths)
+    if not fixtures:
+        print(
+            "HTMLファイルが見つかりません（config.SAVE_DEBUG_HTML=Trueで保存できます）"
+        )
+        return
+
+    total_kb = sum(len(html) for _, html in fixtures) / 1024
+    print(f"対象: {len(fixtures)}ページ（平均 {total_kb / len(fixtures):.0f}KB）")
+    print(f"{'backend':<12} {'mean(ms)':>10} {'median(ms)':>11} {'min(ms)':>9}  結果")
+
+    baseline_results = None
+    for backend in reversed(PARSER_BACKENDS):  # html.parserを基準にする
+        if not is_backend_available(backend):
+            print(f"{backend:<12} {'未インストール':>10}")
+            continue
+
+        timings, results = benchmark_backend(backend, fixtures, args.repeat)
+        if baseline_results is None:
+            baseline_results = results
+            comparison = "基準"
+        else:
+            differences = [
+                path for path in results if results[path] != baseline_results[path]
+            ]
+            comparison = (
+                "一致" if not differences else f"{len(differences)}ページで差異あり"
+            )
+
+        print(
+            f"{backend:<12} {statistics.mean(timings):>10.1f} "
+            f"{statistics.median(timings):>11.1f} {min(timings):>9.1f}  {comparison}"
+        )
+
+
+if __name__ == "__main__":
+    main()
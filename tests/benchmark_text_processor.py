@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+テキスト処理関数（utils/text_processor.py）の処理時間を計測するベンチマークスクリプト
+物件ページから抽出される表記の例（または保存済みのHTMLから抽出した表記）を使い、
+正規表現をその都度コンパイルしていた以前の実装と比較します
+"""
+
+import argparse
+import glob
+import logging
+import re
+import statistics
+import time
+
+# 内部モジュールのインポート
+from src.suumo_scraper.utils.logger import setup_logger
+from src.suumo_scraper.utils import text_processor
+
+# ロガーの設定（計測中のデバッグログを抑制）
+logger = setup_logger()
+logger.setLevel(logging.WARNING)
+
+# 項目ごとの表記の例（物件ページに実際に現れる形式）
+SAMPLE_FIELDS = {
+    "text": [
+        "ＪＲ山手線/新宿駅 歩3分",
+        "  東京メトロ丸ノ内線/西新宿駅 歩7分\n  ",
+        "東京都新宿区西新宿１",
+        "\n\t\tスーモハイツ新宿 302\n\t",
+        "バス・トイレ別、バルコニー付、エアコン付、室内洗濯機置場",
+        "即入居可",
+        "2024/10/01",
+    ],
+    "currency": [
+        "8.5万円",
+        "5.5万円",
+        "12万円",
+        "5000円",
+        "10,000円",
+        "-",
+        "－",
+        "８．５万円",
+    ],
+    "number": ["25.5m2", "20.16m2", "40m2", "３０．２ｍ２"],
+    "age": ["築10年", "新築", "築1年", "築３５年"],
+}
+
+# テキスト処理関数ごとに、表記の例のどの項目を使うか
+FUNCTIONS = {
+    "clean_text": "text",
+    "process_currency": "currency",
+    "extract_number_from_text": "number",
+    "process_age": "age",
+}
+
+# セレクタのキーと表記の項目の対応（HTMLから抽出する場合）
+FIELD_KEYS = {
+    "text": ["property_name", "address", "access", "layout", "conditions"],
+    "currency": ["rent", "management_fee", "deposit", "key_money"],
+    "number": ["area"],
+    "age": ["age"],
+}
+
+
+def legacy_extract_number_from_text(text):
+    """以前の実装（比較用）"""
+    if not text:
+        return ""
+    return re.sub(r"[^\d.]", "", text)
+
+
+def legacy_process_currency(text):
+    """以前の実装（比較用）"""
+    if not text:
+        return ""
+    if "万円" in text or "万" in text:
+        number = re.findall(r"(\d+(?:\.\d+)?)", text)
+        if number:
+            try:
+                return str(float(number[0]) * 10000)
+            except (ValueError, IndexError):
+                return ""
+    return legacy_extract_number_from_text(text)
+
+
+def legacy_process_age(text):
+    """以前の実装（比較用）"""
+    if not text:
+        return ""
+    if "新築" in text:
+        return "0"
+    return legacy_extract_number_from_text(text)
+
+
+def legacy_clean_text(text):
+    """以前の実装（比較用）"""
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+LEGACY_FUNCTIONS = {
+    "clean_text": legacy_clean_text,
+    "process_currency": legacy_process_currency,
+    "extract_number_from_text": legacy_extract_number_from_text,
+    "process_age": legacy_process_age,
+}
+
+
+def load_fields_from_html(paths):
+    """
+    保存済みのHTMLから、加工前の表記を項目ごとに抽出する
+
+    Args:
+        paths: ファイルパスまたはglobパターンのリスト
+
+    Returns:
+        {項目: 表記のリスト}
+    """
+    from src.suumo_scraper.scraper.parser_factory import create_parser
+    from src.suumo_scraper.scraper.soup import make_soup
+
+    fields = {field: [] for field in FIELD_KEYS}
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "rb") as f:
+                parser = create_parser(make_soup(f.read()), path)
+            for field, keys in FIELD_KEYS.items():
+                for key in keys:
+                    value = parser.get_from_any_pattern(key)
+                    values = value if isinstance(value, list) else [value]
+                    fields[field].extend(v for v in values if v)
+    return fields
+
+
+def benchmark_function(function, corpus, repeat):
+    """
+    1つの関数で表記の例をすべて処理する時間を計測する
+
+    Args:
+        function: 計測する関数
+        corpus: 表記のリスト
+        repeat: 繰り返し回数
+
+    Returns:
+        1回あたりの処理時間のリスト（マイクロ秒）
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            function(text)
+        timings.append((time.perf_counter() - start) * 1e6 / len(corpus))
+    return timings
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="テキスト処理関数のベンチマーク")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="表記を抽出するHTMLファイルのパスまたはglobパターン（省略時は組み込みの例）",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="繰り返し回数")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1000,
+        help="表記の例を何回繰り返して1回分の入力にするか",
+    )
+    args = parser.parse_args()
+
+    fields = load_fields_from_html(args.paths) if args.paths else SAMPLE_FIELDS
+    print(
+        f"{'function':<26} {'legacy(us)':>11} {'current(us)':>12} {'speedup':>8}  結果"
+    )
+
+    for name, field in FUNCTIONS.items():
+        samples = fields.get(field) or SAMPLE_FIELDS[field]
+        corpus = samples * args.scale
+        legacy = LEGACY_FUNCTIONS[name]
+        current = getattr(text_processor, name)
+
+        legacy_time = statistics.median(benchmark_function(legacy, corpus, args.repeat))
+        current_time = statistics.median(
+            benchmark_function(current, corpus, args.repeat)
+        )
+
+        # 全角数字は正規化するようになったため、以前の実装と結果が異なるものを数える
+        differences = [text for text in samples if legacy(text) != current(text)]
+        comparison = (
+            "一致" if not differences else f"{len(differences)}件で差異あり（全角など）"
+        )
+        print(
+            f"{name:<26} {legacy_time:>11.2f} {current_time:>12.2f} "
+            f"{legacy_time / current_time:>7.2f}x  {comparison}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+テスト共通のフィクスチャ
+Sheets APIを呼び出さずに書き込み処理を確認するための偽のワークシートを提供します
+"""
+
+import pytest
+from gspread.utils import a1_range_to_grid_range
+
+from src.suumo_scraper import config
+from src.suumo_scraper.sheets import rate_limiter
+
+
+class FakeWorksheet:
+    """
+    batch_update・get_all_valuesだけを持つ偽のワークシート（値はすべて文字列で保持する）
+    """
+
+    def __init__(self, rows=None):
+        self.grid = [[str(value) for value in row] for row in rows or []]
+        self.batch_updates = []
+
+    def _set(self, row, col, value):
+        while len(self.grid) < row:
+            self.grid.append([])
+        cells = self.grid[row - 1]
+        while len(cells) < col:
+            cells.append("")
+        cells[col - 1] = "" if value is None else str(value)
+
+    def get_all_values(self, **kwargs):
+        width = max((len(row) for row in self.grid), default=0)
+        return [row + [""] * (width - len(row)) for row in self.grid]
+
+    def batch_update(self, data, **kwargs):
+        self.batch_updates.append(data)
+        for entry in data:
+            grid_range = a1_range_to_grid_range(entry["range"])
+            for i, values in enumerate(entry["values"]):
+                for j, value in enumerate(values):
+                    self._set(
+                        grid_range["startRowIndex"] + i + 1,
+                        grid_range["startColumnIndex"] + j + 1,
+                        value,
+                    )
+        return {}
+
+
+@pytest.fixture
+def fake_worksheet():
+    """行の値のリストから偽のワークシートを作成する関数"""
+    return FakeWorksheet
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch, tmp_path):
+    """
+    テストごとにSheets APIのレート制限を待機しないものに差し替え、
+    検証子・内容ハッシュ・採点の版の保存先を一時ディレクトリにする
+    """
+    monkeypatch.setattr(
+        rate_limiter,
+        "_sheets_rate_limiter",
+        rate_limiter.SheetsRateLimiter(6000, 6000, 100, max_retries=0),
+    )
+    monkeypatch.setattr(config, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(config, "CHANGE_DETECTION_ENABLED", False)
+    monkeypatch.setattr(config, "HTTP_CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(config, "FINGERPRINT_FILE", str(tmp_path / "fingerprints.json"))
+    monkeypatch.setattr(config, "SCORING_STATE_FILE", str(tmp_path / "scoring.json"))
@@ -0,0 +1,47 @@
+"""
+シャード実行のコーディネーター（coordinator.py）のテスト
+"""
+
+import pytest
+
+from src.suumo_scraper import config, coordinator
+
+
+def test_rescoring_runs_once_with_merged_changed_cells(monkeypatch):
+    payloads = []
+    scoring_calls = []
+
+    def request_shard(worker_url, payload, headers=None, timeout=None):
+        payloads.append(payload)
+        row = str(payload["shard_index"] + 2)
+        return {
+            "status": "success",
+            "processed_urls": 1,
+            "success_count": 1,
+            "error_count": 0,
+            "changed_cells": {row: [3]},
+        }
+
+    def run_scoring(**kwargs):
+        scoring_calls.append(kwargs)
+        return {"status": "success"}
+
+    monkeypatch.setattr(coordinator, "request_shard", request_shard)
+    monkeypatch.setattr(coordinator, "run_scoring", run_scoring)
+    monkeypatch.setattr(config, "SCORING_AFTER_UPDATE", True)
+
+    result = coordinator.run_sharded_update("https://worker.example/", 3)
+
+    # 各シャードでは採点せず、コーディネーターが1回だけ採点する
+    assert all(payload["skip_scoring"] for payload in payloads)
+    assert scoring_calls == [{"changed_cells": {"2": [3], "3": [3], "4": [3]}}]
+    assert result["scoring"] == {"status": "success"}
+    assert result["processed_urls"] == 3
+
+
+def test_shard_count_is_bounded():
+    assert coordinator.resolve_shard_count(None) == config.SHARD_COUNT
+    assert coordinator.resolve_shard_count("2") == 2
+    for invalid in (0, config.SHARD_MAX_COUNT + 1, "x"):
+        with pytest.raises(ValueError):
+            coordinator.resolve_shard_count(invalid)
@@ -0,0 +1,28 @@
+"""
+変更検出（scraper/http_cache.py, scraper/fingerprint.py）のテスト
+"""
+
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper.fingerprint import compute_property_hash
+from src.suumo_scraper.scraper.http_cache import ValidatorCache
+
+URL = "https://suumo.jp/chintai/bc_100000000001/"
+
+
+def test_validators_are_dropped_when_columns_change(monkeypatch, tmp_path):
+    cache = ValidatorCache(str(tmp_path))
+    cache.store(URL, etag='"v1"')
+    assert cache.conditional_headers(URL) == {"If-None-Match": '"v1"'}
+
+    # 列を追加した後は、新しい列を書き込むため条件付きGETにしない
+    monkeypatch.setitem(config.COLUMNS, "new_column", max(config.COLUMNS.values()) + 1)
+    assert cache.conditional_headers(URL) == {}
+
+
+def test_content_hash_changes_when_columns_change(monkeypatch):
+    property_info = {"property_id": "100000000001", "name": "テスト物件"}
+    before = compute_property_hash(property_info)
+    assert compute_property_hash(dict(property_info, update_time="now")) == before
+
+    monkeypatch.setitem(config.COLUMNS, "rent_yen", 40)
+    assert compute_property_hash(property_info) != before
@@ -0,0 +1,158 @@
+"""
+部分解析（scraper/partial_parse.py）のテスト
+ページ全体を解析した場合と同じ物件情報が得られること、ストリーミングで受信したレスポンスが閉じられることを確認します
+"""
+
+import pytest
+import requests
+
+from src.suumo_scraper import config
+from src.suumo_scraper.scraper import core
+from src.suumo_scraper.scraper.core import parse_property_html
+from src.suumo_scraper.scraper.partial_parse import (
+    extract_regions,
+    is_partial_parse_available,
+    region_requirements,
+)
+
+pytestmark = pytest.mark.skipif(
+    not is_partial_parse_available(), reason="lxmlがインストールされていません"
+)
+
+URL = "https://suumo.jp/chintai/jnc_000000000001/"
+CHUNK_SIZE = 1024
+
+# 領域の間に挟む、チャンクの境界をまたぐための要素
+FILLER = "".join(
+    f'<div class="reco"><a href="/x/{k}">おすすめ物件 {k}</a></div>\n'
+    for k in range(200)
+)
+
+FIRST_TABLE = """<table class="data_table">
+<tr><th>間取り詳細</th><td>洋6 K2</td><th>構造</th><td>鉄筋コン</td></tr>
+<tr><th>階建</th><td>3階/10階建</td><th>築年月</th><td>2010年3月</td></tr>
+</table>"""
+
+SECOND_TABLE = """<table class="data_table">
+<tr><th>a</th><td>x</td></tr><tr><th>a</th><td>x</td></tr><tr><th>a</th><td>x</td></tr>
+<tr><th>a</th><td>x</td></tr><tr><th>a</th><td>x</td></tr>
+<tr><th>入居</th><td>即</td></tr>
+<tr><th>条件</th><td>ペット相談</td></tr>
+<tr><th>周辺</th><td class="data_around"><ul><li>コンビニ 100m</li><li>駅 300m</li></ul></td></tr>
+<tr><th>情報更新日</th><td>2026/10/01</td></tr>
+</table>"""
+
+
+def make_page(*sections):
+    body = "\n".join(sections)
+    return (
+        "<!DOCTYPE html><html><head><title>物件</title></head><body>"
+        '<h1 class="section_h1-header-title">テストマンション 101号室</h1>'
+        '<div id="js-view_gallery"><div></div></div>'
+        f"{body}</body></html>"
+    ).encode("utf-8")
+
+
+def chunked(content):
+    return [
+        content[start : start + CHUNK_SIZE]
+        for start in range(0, len(content), CHUNK_SIZE)
+    ]
+
+
+def parse_both(content):
+    full = parse_property_html(content, URL)
+    partial = parse_property_html(extract_regions(chunked(content), "utf-8"), URL)
+    # 取得日時は解析のたびに変わるため比較しない
+    for info in (full, partial):
+        info.pop("update_time", None)
+    return full, partial
+
+
+def test_later_table_after_chunk_boundary_is_extracted():
+    content = make_page(FIRST_TABLE, FILLER, SECOND_TABLE, FILLER)
+    full, partial = parse_both(content)
+
+    assert partial == full
+    assert partial["surrounding"] == "コンビニ 100m / 駅 300m"
+
+
+def test_single_table_page_matches_full_parse():
+    content = make_page(FIRST_TABLE, FILLER)
+    full, partial = parse_both(content)
+
+    assert partial == full
+
+
+def test_parse_stops_after_all_targets_are_found():
+    # multipleのセレクタ（周辺環境）も、一致する要素を含む領域が閉じれば確定する
+    assert all(region_requirements())
+
+    later_table = (
+        '<table class="data_table"><tr><th>周辺</th>'
+        '<td class="data_around"><ul><li>後続の領域</li></ul></td></tr></table>'
+    )
+    content = make_page(FIRST_TABLE, FILLER, SECOND_TABLE, FILLER, later_table)
+    fed = []
+
+    def chunks():
+        for chunk in chunked(content):
+            fed.append(chunk)
+            yield chunk
+
+    html = extract_regions(chunks(), "utf-8")
+
+    # 残りのデータは読み捨てられ、末尾の領域は解析されない
+    assert len(fed) == len(chunked(content))
+    assert "後続の領域" not in html
+    assert "駅 300m" in html
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.history = []
+        self.headers = {}
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSessionManager:
+    def __init__(self, response):
+        self.response = response
+
+    def get_session(self):
+        return self
+
+    def get(self, url, **kwargs):
+        assert kwargs["stream"]
+        return self.response
+
+    def report_success(self):
+        pass
+
+    def report_failure(self):
+        pass
+
+
+@pytest.mark.parametrize("status_code", [304, 404])
+def test_streamed_response_is_closed_without_body(monkeypatch, status_code):
+    # 本文を読まずに返す場合も、接続をプールに戻すためレスポンスを閉じる
+    monkeypatch.setattr(config, "PARTIAL_PARSE_ENABLED", True)
+    monkeypatch.setattr(config, "SAVE_DEBUG_HTML", False)
+    response = FakeResponse(status_code)
+    monkeypatch.setattr(
+        core, "get_session_manager", lambda: FakeSessionManager(response)
+    )
+    monkeypatch.setattr(core.get_host_rate_limiter(), "acquire", lambda url: None)
+
+    info = core.scrape_suumo_property_info(URL, revalidate=True)
+
+    assert response.closed
+    assert bool(info.get("not_modified")) == (status_code == 304)
@@ -0,0 +1,142 @@
+"""
+Sheets APIのレート制限（sheets/rate_limiter.py）のテスト
+"""
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+from src.suumo_scraper.sheets import rate_limiter
+from src.suumo_scraper.sheets.rate_limiter import (
+    SheetsRateLimiter,
+    get_retry_after,
+    get_status_code,
+)
+from src.suumo_scraper.utils.rate_limit import TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, status="UNAVAILABLE"):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+        self.error = {"code": status_code, "message": "error", "status": status}
+
+    def json(self):
+        return {"error": self.error}
+
+
+def FakeAPIError(status_code, headers=None, status="UNAVAILABLE"):
+    return APIError(FakeResponse(status_code, headers, status))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """待機せずに待機時間を記録する"""
+    recorded = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", recorded.append)
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda a, b: 0)
+    return recorded
+
+
+def failing(errors, value="ok"):
+    """指定した例外を順に送出し、その後は値を返す関数を作成する"""
+    calls = []
+
+    def func():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return value
+
+    return func, calls
+
+
+def test_get_status_code_and_retry_after():
+    assert get_status_code(FakeAPIError(503)) == 503
+    assert get_status_code(FakeAPIError(403, status="RESOURCE_EXHAUSTED")) == 429
+    # ステータスコードを持たない例外は、メッセージに429を含んでいてもクォータ超過としない
+    assert get_status_code(Exception("Quota exceeded: A429:Z429")) is None
+    assert get_retry_after(FakeAPIError(429, {"Retry-After": "7"})) == 7.0
+    assert get_retry_after(FakeAPIError(429)) is None
+
+
+def test_retryable_error_is_retried_with_backoff(sleeps):
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=3)
+    func, calls = failing([FakeAPIError(503), FakeAPIError(500)])
+
+    assert limiter.write(func) == "ok"
+    assert len(calls) == 3
+    assert sleeps == [2, 4]
+
+
+def test_non_retryable_error_is_not_retried(sleeps):
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=3)
+    func, calls = failing([FakeAPIError(400)])
+
+    assert limiter.write(func) is None
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(sleeps):
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=2)
+    func, calls = failing([FakeAPIError(503)] * 5)
+
+    assert limiter.read(func) is None
+    assert len(calls) == 3
+
+
+def test_quota_error_pauses_all_calls_for_retry_after(monkeypatch, sleeps):
+    now = [100.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=3)
+    func, calls = failing([FakeAPIError(429, {"Retry-After": "30"})])
+
+    assert limiter.write(func) == "ok"
+    assert limiter.paused_until == 130.0
+    # 再試行は一時停止が明けるまで待ってから行う
+    assert sleeps == [30.0]
+    assert len(calls) == 2
+
+
+def test_token_bucket_limits_burst():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+
+def test_read_and_write_quotas_are_separate():
+    limiter = SheetsRateLimiter(60, 60, 1, max_retries=0)
+
+    assert limiter.buckets["write"].try_acquire() == 0
+    assert limiter.buckets["write"].try_acquire() > 0
+    assert limiter.buckets["read"].try_acquire() == 0
+
+
+def test_connection_error_is_retried(sleeps):
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=3)
+    func, calls = failing([requests.exceptions.ConnectionError("reset")])
+
+    assert limiter.write(func) == "ok"
+    assert len(calls) == 2
+    assert limiter.paused_until == 0.0
+
+
+def test_programming_error_is_raised_without_retry(sleeps):
+    limiter = SheetsRateLimiter(6000, 6000, 100, max_retries=3)
+    func, calls = failing([KeyError("A429")])
+
+    with pytest.raises(KeyError):
+        limiter.write(func)
+    assert len(calls) == 1
+    assert sleeps == []
+    assert limiter.paused_until == 0.0
@@ -0,0 +1,110 @@
+"""
+採点処理（scoring/engine.py）のテスト
+"""
+
+from gspread.utils import a1_range_to_grid_range
+
+from src.suumo_scraper import config
+from src.suumo_scraper.scoring import engine
+from src.suumo_scraper.scoring.engine import run_scoring
+
+
+class FakeSpreadsheet:
+    """values_batch_get・values_batch_updateだけを持つ偽のスプレッドシート"""
+
+    def __init__(self, sheets):
+        self.sheets = sheets
+
+    def values_batch_get(self, ranges, params=None):
+        return {
+            "valueRanges": [{"values": self.sheets[name.strip("'")]} for name in ranges]
+        }
+
+    def values_batch_update(self, body):
+        for entry in body["data"]:
+            name, cells = entry["range"].rsplit("!", 1)
+            values = self.sheets[name.strip("'")]
+            grid_range = a1_range_to_grid_range(cells)
+            row = grid_range["startRowIndex"]
+            while len(values) <= row:
+                values.append([])
+            for j, value in enumerate(entry["values"][0]):
+                col = grid_range["startColumnIndex"] + j
+                values[row].extend([""] * (col + 1 - len(values[row])))
+                values[row][col] = value
+        return {}
+
+
+class FakeConnectionCache:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def get_spreadsheet(self, spreadsheet_id):
+        return self.spreadsheet
+
+
+def master_rows(score):
+    return [["出力項目", "対象項目", "演算子", "比較値", "スコア", "人物"]] + [
+        ["家賃評価", "家賃", "<=", 60000, score, person]
+        for person in config.SCORE_SHEET_NAMES
+    ]
+
+
+def score_sheet():
+    return [["", "総合点", "家賃評価"], ["", "", 1]]
+
+
+def make_spreadsheet(monkeypatch):
+    spreadsheet = FakeSpreadsheet(
+        {
+            config.PROPERTY_SHEET_NAME: [["#", "家賃"], [1, 50000], [2, 55000]],
+            config.SCORING_MASTER_SHEET_NAME: master_rows(5),
+            **{name: score_sheet() for name in config.SCORE_SHEET_NAMES.values()},
+        }
+    )
+    monkeypatch.setattr(
+        engine, "get_sheet_connection_cache", lambda: FakeConnectionCache(spreadsheet)
+    )
+    return spreadsheet
+
+
+def scores(spreadsheet, person="wife"):
+    values = spreadsheet.sheets[config.SCORE_SHEET_NAMES[person]]
+    return [float(row[2]) for row in values[2:]]
+
+
+def test_changed_cells_rescore_only_changed_rows(monkeypatch):
+    spreadsheet = make_spreadsheet(monkeypatch)
+    assert run_scoring()["target_properties"] == 2
+    assert scores(spreadsheet) == [5, 5]
+
+    result = run_scoring(changed_cells={"2": [2]})
+
+    assert result["target_properties"] == 1
+
+
+def test_master_change_rescores_all_rows(monkeypatch):
+    spreadsheet = make_spreadsheet(monkeypatch)
+    run_scoring()
+    spreadsheet.sheets[config.SCORING_MASTER_SHEET_NAME] = master_rows(3)
+
+    # 変更されたのは1行だけでも、評価基準マスタが変わったため全物件を採点し直す
+    result = run_scoring(changed_cells={"2": [2]})
+
+    assert result["target_properties"] == 2
+    assert scores(spreadsheet) == [3, 3]
+    assert scores(spreadsheet, "husband") == [3, 3]
+    assert run_scoring(changed_cells={"2": [2]})["target_properties"] == 1
+
+
+def test_weight_change_rescores_all_rows(monkeypatch):
+    spreadsheet = make_spreadsheet(monkeypatch)
+    run_scoring()
+    spreadsheet.sheets[config.SCORE_SHEET_NAMES["wife"]][1][2] = 2
+
+    result = run_scoring(changed_cells={"2": [2]})
+
+    assert result["target_properties"] == 2
+    assert [
+        row[1] for row in spreadsheet.sheets[config.SCORE_SHEET_NAMES["wife"]][2:]
+    ] == [10, 10]
@@ -0,0 +1,168 @@
+"""
+評価基準のルール索引（scoring/rules.py, scoring/matchers.py）のテスト
+ルールを記載順に1つずつ判定する単純な実装と、乱数で作ったルール・値で結果を比較します
+"""
+
+import math
+import random
+
+from src.suumo_scraper.scoring.matchers import (
+    ContainsIndex,
+    RangeIndex,
+    SubstringMatcher,
+    ThresholdIndex,
+)
+from src.suumo_scraper.scoring.rules import (
+    RuleIndex,
+    ValueColumn,
+    normalize_operator,
+    parse_range,
+    split_targets,
+)
+from src.suumo_scraper.scoring.values import to_number, to_string
+
+SEEDS = range(300)
+
+OPERATORS = ["=", "!=", ">", ">=", "<", "<=", "><", "in", "notin"]
+OPERATORS += ["exist", "notexist", "'<=", "unknown"]
+TARGETS = ["a", "b", "ab,c", "1", "2", "10", "0-5", "3-8", "5-", "-2-4", "a,,b", ""]
+TARGETS += ["x", "y,abc", "2.5", "7", "徒歩", "NaN", "5-3", "0x10", True, 0, 3]
+VALUES = ["", "a", "ab", "abc", " b ", "1", "2", "10", "3.5", "-1", "x,y", None]
+VALUES += [0, 1, 2.5, 7, float("nan"), "NaN", "0x10", "Infinity", True, "徒歩5分"]
+NUMBERS = [-math.inf, -3, -1, 0, 0.5, 1, 2, 2.5, 3, 5, 8, 10, math.inf]
+
+
+def rule_matches(rule, column, i):
+    """ルール1つの条件を判定する（索引を使わない実装）"""
+    operator = normalize_operator(rule["operator"])
+    target = rule["target"]
+    if operator in ("=", "!="):
+        return (column.strings[i] == to_string(target)) == (operator == "=")
+    number = column.numbers[i]
+    if operator == ">":
+        return number > to_number(target)
+    if operator == ">=":
+        return number >= to_number(target)
+    if operator == "<":
+        return number < to_number(target)
+    if operator == "<=":
+        return number <= to_number(target)
+    if operator == "><":
+        minimum, maximum = parse_range(target)
+        return minimum <= number <= maximum
+    if operator in ("in", "notin"):
+        included = any(value in column.trimmed[i] for value in split_targets(target))
+        return included == (operator == "in")
+    if operator in ("exist", "notexist"):
+        value = column.values[i]
+        exists = not (isinstance(value, str) and value == "")
+        return exists == (operator == "exist")
+    return False
+
+
+def linear_first_match(rules, column, i):
+    return next(
+        (index for index, rule in enumerate(rules) if rule_matches(rule, column, i)),
+        None,
+    )
+
+
+def test_rule_index_matches_linear_scan():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        rules = [
+            {
+                "operator": rng.choice(OPERATORS),
+                "target": rng.choice(TARGETS),
+                "score": rng.choice([1, 2, "3", -1]),
+            }
+            for _ in range(rng.randint(0, 12))
+        ]
+        column = ValueColumn([rng.choice(VALUES) for _ in range(20)])
+        rule_index = RuleIndex(rules)
+        for i in range(len(column)):
+            assert rule_index.first_match(column, i) == linear_first_match(
+                rules, column, i
+            ), (seed, rules, column.values[i])
+
+
+def test_range_index_matches_linear_scan():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        index = RangeIndex()
+        ranges = []
+        for rule_index in range(rng.randint(0, 10)):
+            minimum, maximum = rng.choice(NUMBERS), rng.choice(NUMBERS)
+            if rng.random() < 0.1:
+                maximum = math.nan
+            index.add(rule_index, minimum, maximum)
+            ranges.append((rule_index, minimum, maximum))
+        for number in NUMBERS + [math.nan, 4, 9]:
+            expected = next(
+                (i for i, low, high in ranges if low <= number <= high), None
+            )
+            assert index.first_match(number) == expected, (seed, ranges, number)
+
+
+def test_threshold_index_matches_linear_scan():
+    compare = {
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+    }
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        index = ThresholdIndex()
+        thresholds = []
+        for rule_index in range(rng.randint(0, 10)):
+            operator = rng.choice(list(compare))
+            number = rng.choice(NUMBERS + [math.nan])
+            index.add(rule_index, operator, number)
+            thresholds.append((rule_index, operator, number))
+        for number in NUMBERS + [math.nan, 4]:
+            expected = next(
+                (i for i, op, value in thresholds if compare[op](number, value)), None
+            )
+            assert index.first_match(number) == expected, (seed, thresholds, number)
+
+
+def random_text(rng, length):
+    return "".join(rng.choice("abc徒") for _ in range(length))
+
+
+def test_substring_matcher_finds_all_patterns():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        patterns = list(
+            {random_text(rng, rng.randint(1, 4)) for _ in range(rng.randint(1, 8))}
+        )
+        matcher = SubstringMatcher(patterns)
+        for _ in range(10):
+            text = random_text(rng, rng.randint(0, 12))
+            expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+            assert matcher.find(text) == expected, (seed, patterns, text)
+
+
+def test_contains_index_matches_linear_scan():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        index = ContainsIndex()
+        rules = []
+        for rule_index in range(rng.randint(0, 8)):
+            operator = rng.choice(["in", "notin"])
+            targets = [random_text(rng, rng.randint(0, 3)) for _ in range(3)]
+            targets = targets[: rng.randint(1, 3)]
+            index.add(rule_index, operator, targets)
+            rules.append((rule_index, operator, targets))
+        for _ in range(10):
+            text = random_text(rng, rng.randint(0, 8))
+            expected = next(
+                (
+                    i
+                    for i, op, targets in rules
+                    if any(t in text for t in targets) == (op == "in")
+                ),
+                None,
+            )
+            assert index.first_match(text) == expected, (seed, rules, text)
@@ -0,0 +1,220 @@
+"""
+物件情報シートへの書き込み処理（sheets/update.py）のテスト
+"""
+
+from src.suumo_scraper import config
+from src.suumo_scraper.sheets.snapshot import SheetSnapshot
+from src.suumo_scraper.sheets.update import (
+    batch_update_properties,
+    chunk_updates,
+    coalesce_row_ranges,
+    column_letter,
+    diff_row_ranges,
+    ensure_typed_headers,
+    estimate_payload_size,
+    values_equal,
+)
+
+MAX_COL = max(config.COLUMNS.values())
+
+
+def make_row(**values):
+    """COLUMNSのキーで指定した値を持つ行（A列から）を作成する"""
+    row = [""] * MAX_COL
+    for key, value in values.items():
+        row[config.COLUMNS[key] - 1] = value
+    return row
+
+
+def new_result():
+    return {
+        "status": "success",
+        "success_count": 0,
+        "error_count": 0,
+        "errors": [],
+    }
+
+
+PROPERTY = {
+    "number": "1",
+    "url": "https://suumo.jp/chintai/jnc_000000000001/",
+    "property_id": "000000000001",
+    "name": "テスト物件",
+    "rent": "55000.0",
+    "update_time": "2026-01-01 00:00:00",
+}
+
+
+def test_content_unchanged_row_is_repaired_from_snapshot(fake_worksheet):
+    # 内容ハッシュが前回と同じでも、シート上で消されたセルは書き戻す
+    header = make_row(number="#", url="URL")
+    stored = make_row(**dict(PROPERTY, rent=""))
+    sheet = fake_worksheet([header, stored])
+    snapshot = SheetSnapshot(sheet.get_all_values())
+
+    result = batch_update_properties(
+        sheet,
+        [{"row": 2, "data": dict(PROPERTY, content_unchanged=True)}],
+        new_result(),
+        snapshot,
+    )
+
+    assert sheet.grid[1][config.COLUMNS["rent"] - 1] == "55000.0"
+    assert result["success_count"] == 1
+    assert result["changed_cells"] == {2: [config.COLUMNS["rent"]]}
+
+
+def test_content_unchanged_row_is_skipped_without_snapshot(fake_worksheet):
+    # シートと比較できない場合は、前回と同じ内容の物件を書き込まない
+    sheet = fake_worksheet([make_row(number="#", url="URL")])
+
+    result = batch_update_properties(
+        sheet,
+        [{"row": 2, "data": dict(PROPERTY, content_unchanged=True)}],
+        new_result(),
+    )
+
+    assert sheet.batch_updates == []
+    assert result["unchanged_count"] == 1
+
+
+def test_values_equal_ignores_number_formatting():
+    assert values_equal("55,000", "55000.0")
+    # スナップショットは数値のセルを数値のまま読み込む
+    assert values_equal(55000, "55000.0")
+    assert values_equal(8.5, 8.5)
+    assert values_equal("", None)
+    assert values_equal("テスト物件", "テスト物件")
+    assert not values_equal("55000", "56000")
+    assert not values_equal("-", "0")
+
+
+def test_diff_row_ranges_skips_excluded_column_only_changes():
+    old = make_row(**PROPERTY)
+    new = make_row(**dict(PROPERTY, number="2", update_time="2026-02-01 00:00:00"))
+
+    assert diff_row_ranges(2, old, new) == []
+
+
+def test_diff_row_ranges_writes_only_changed_cells():
+    old = make_row(**PROPERTY)
+    new = make_row(**dict(PROPERTY, rent="60000.0", update_time="2026-02-01"))
+
+    ranges = diff_row_ranges(2, old, new)
+
+    # 内容の変更があれば、取得日時などの列も一緒に書き込む
+    assert [entry["range"] for entry in ranges] == sorted(
+        f"{column_letter(config.COLUMNS[key])}2" for key in ("rent", "update_time")
+    )
+    assert all(len(entry["values"][0]) == 1 for entry in ranges)
+
+
+def test_coalesce_row_ranges_merges_adjacent_columns():
+    row_data = ["a", "b", "c", "d", "e", "f"]
+    changed = [True, True, False, True, True, True]
+
+    ranges = coalesce_row_ranges(5, changed, row_data)
+
+    assert ranges == [
+        {"range": "A5:B5", "values": [["a", "b"]]},
+        {"range": "D5:F5", "values": [["d", "e", "f"]]},
+    ]
+    assert coalesce_row_ranges(5, [False, True], ["a", "b"]) == [
+        {"range": "B5", "values": [["b"]]}
+    ]
+
+
+def make_update(row, values):
+    ranges = coalesce_row_ranges(row, [True] * len(values), values)
+    return ({"row": row}, row, values, ranges)
+
+
+def test_chunk_updates_respects_cell_limit(monkeypatch):
+    monkeypatch.setattr(config, "SHEETS_MAX_CELLS_PER_REQUEST", 10)
+    updates = [make_update(row, ["x"] * 4) for row in range(2, 9)]
+
+    chunks = chunk_updates(updates)
+
+    assert [update for chunk in chunks for update in chunk] == updates
+    for chunk in chunks:
+        assert sum(len(update[2]) for update in chunk) <= 10
+    assert len(chunks) == 4
+
+
+def test_chunk_updates_respects_byte_limit(monkeypatch):
+    monkeypatch.setattr(config, "SHEETS_MAX_PAYLOAD_BYTES", 1000)
+    updates = [make_update(row, ["物件" * 50]) for row in range(2, 12)]
+
+    chunks = chunk_updates(updates)
+
+    assert [update for chunk in chunks for update in chunk] == updates
+    for chunk in chunks:
+        size = sum(
+            estimate_payload_size(entry) for update in chunk for entry in update[3]
+        )
+        assert size <= 1000
+    assert len(chunks) > 1
+
+
+def test_chunk_updates_keeps_oversized_update_in_its_own_chunk(monkeypatch):
+    monkeypatch.setattr(config, "SHEETS_MAX_CELLS_PER_REQUEST", 3)
+    updates = [make_update(2, ["x"]), make_update(3, ["x"] * 5), make_update(4, ["x"])]
+
+    assert chunk_updates(updates) == [[updates[0]], [updates[1]], [updates[2]]]
+
+
+def test_batch_update_skips_rows_with_only_excluded_changes(fake_worksheet):
+    header = make_row(number="#", url="URL")
+    sheet = fake_worksheet([header, make_row(**PROPERTY)])
+    snapshot = SheetSnapshot(sheet.get_all_values())
+
+    result = batch_update_properties(
+        sheet,
+        [{"row": 2, "data": dict(PROPERTY, update_time="2026-02-01 00:00:00")}],
+        new_result(),
+        snapshot,
+    )
+
+    assert sheet.batch_updates == []
+    assert result["unchanged_count"] == 1
+
+
+def test_on_committed_failure_does_not_count_as_write_error(fake_worksheet):
+    # 書き込み後のコールバック（チェックポイントの記録）の失敗は書き込みエラーにしない
+    sheet = fake_worksheet([make_row(number="#", url="URL")])
+
+    def on_committed(properties):
+        raise OSError("disk full")
+
+    result = batch_update_properties(
+        sheet,
+        [{"row": 2, "data": dict(PROPERTY)}],
+        new_result(),
+        on_committed=on_committed,
+    )
+
+    assert sheet.grid[1][config.COLUMNS["rent"] - 1] == "55000.0"
+    assert result["success_count"] == 1
+    assert result["error_count"] == 0
+    assert result["status"] == "success"
+
+
+def test_missing_typed_headers_are_written(fake_worksheet):
+    header = make_row(number="#", url="URL", rent_yen="家賃（円）", walk_minutes="徒歩")
+    sheet = fake_worksheet([header])
+    snapshot = SheetSnapshot(sheet.get_all_values())
+
+    ensure_typed_headers(sheet, snapshot)
+
+    written = sheet.get_all_values()[0]
+    for key, name in config.TYPED_COLUMN_HEADERS.items():
+        # 別の名前が入力されている列は上書きしない
+        expected = "徒歩" if key == "walk_minutes" else name
+        assert written[config.COLUMNS[key] - 1] == expected
+    assert snapshot.values[0] == written
+    assert snapshot.row_for_url("URL") is None
+
+    # すべて揃っていれば書き込まない
+    sheet.batch_updates.clear()
+    ensure_typed_headers(sheet, snapshot)
+    assert sheet.batch_updates == []
@@ -0,0 +1,100 @@
+"""
+数値の項目を求めるテキスト処理関数（utils/text_processor.py）のテスト
+"""
+
+import pytest
+
+from src.suumo_scraper.utils.text_processor import (
+    parse_area,
+    parse_built_year,
+    parse_floor,
+    parse_walk_minutes,
+    parse_walk_minutes_by_line,
+    parse_yen,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("8.5万円", 85000),
+        ("8万5000円", 85000),
+        ("8万 5,000円", 85000),
+        ("12万円", 120000),
+        ("８．５万円", 85000),
+        ("5000円", 5000),
+        ("10,000円", 10000),
+        ("-", 0),
+        ("－", 0),
+        ("なし", 0),
+        ("1ヶ月", None),
+        ("2か月", None),
+        ("", None),
+        (None, None),
+        ("応相談", None),
+    ],
+)
+def test_parse_yen(text, expected):
+    assert parse_yen(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [("25.5m2", 25.5), ("３０．２ｍ２", 30.2), ("40m²", 40.0), ("", None), ("-", None)],
+)
+def test_parse_area(text, expected):
+    assert parse_area(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("ＪＲ山手線/新宿駅 歩3分", 3),
+        ("JR山手線/新宿駅 歩12分 / 東京メトロ丸ノ内線/西新宿駅 歩7分", 7),
+        ("都営バス/停留所 バス10分", None),
+        ("", None),
+    ],
+)
+def test_parse_walk_minutes(text, expected):
+    assert parse_walk_minutes(text) == expected
+
+
+def test_parse_walk_minutes_by_line_keeps_each_station():
+    lines = [
+        "JR山手線/新宿駅 歩12分",
+        "都営バス/停留所 バス10分",
+        "東京メトロ丸ノ内線/西新宿駅 歩７分",
+    ]
+
+    assert parse_walk_minutes_by_line(lines) == [12, None, 7]
+    assert parse_walk_minutes_by_line([]) == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("3階/10階建", (3, 10)),
+        ("2-3階/5階建", (2, 5)),
+        ("B1階/地下1地上5階建", (-1, 5)),
+        ("地下2階/10階建", (-2, 10)),
+        ("10階建", (None, 10)),
+        ("", (None, None)),
+    ],
+)
+def test_parse_floor(text, expected):
+    assert parse_floor(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("築10年", 2016),
+        ("築３５年", 1991),
+        ("新築", 2026),
+        ("2010年3月", 2010),
+        ("", None),
+        ("不明", None),
+    ],
+)
+def test_parse_built_year(text, expected):
+    assert parse_built_year(text, current_year=2026) == expected